@@ -22,6 +22,8 @@ module_names = (
     "props",
     "preferences", 
     "utils",
+    "leak_tracker",
+    "texture_index",
     "export_tools",
     "retex_tools",
     "obj_export_tools",
@@ -72,6 +74,10 @@ def register():
     # 确保导出插件已启用
     ensure_exporters_enabled()
     
+    # 包装所有操作符的execute（泄漏追踪，需在首选项中启用）
+    if 'leak_tracker' in modules:
+        modules['leak_tracker'].instrument_modules(modules.values())
+    
     # 注册所有模块
     for module_name in module_names:
         if module_name in modules:
@@ -0,0 +1,493 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Batch Export
+无界面批量导出：协调进程维护N个常驻的Blender后台进程，逐个分发.blend导出任务
+
+协调进程（任意Python 3.11+，不需要bpy）:
+    python batch_export.py --blender /path/to/blender --workers 4 \\
+        --settings export_settings.json --report report.json props/ extra.blend
+
+导出设置快照（在当前文件的导出设置基础上生成JSON）:
+    blender -b scene.blend --python batch_export.py -- --dump-settings export_settings.json
+
+工作进程由协调进程启动，不需要手动运行:
+    blender -b --factory-startup --python batch_export.py -- --worker
+
+通信协议：协调进程通过stdin发送一行一个JSON，工作进程在stdout上回复带PROTOCOL_MARKER
+前缀的JSON行（Blender自身的输出会被忽略）。每个工作进程处理max_jobs个任务后被回收重启，
+以限制内存增长。
+"""
+
+import argparse
+import importlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+PROTOCOL_MARKER = "@@POPTOOLS@@"
+
+# 默认导出的对象类型（与MultiExport的过滤一致）
+EXPORT_OBJECT_TYPES = {'MESH', 'EMPTY', 'ARMATURE', 'CURVE', 'FONT'}
+
+
+# ==================== 工作进程 / Worker ====================
+
+def load_addon():
+    """在工作进程中导入并注册PopTools包（脚本所在目录即包目录）"""
+    import bpy
+
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir, package_name = os.path.split(package_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    package = importlib.import_module(package_name)
+    # 插件已在用户配置中启用时不重复注册
+    if not hasattr(bpy.types.Scene, "poptools_props"):
+        package.register()
+    return package
+
+
+def send_message(message):
+    """向协调进程发送一条协议消息"""
+    sys.__stdout__.write(PROTOCOL_MARKER + json.dumps(message) + "\n")
+    sys.__stdout__.flush()
+
+
+def select_export_objects(job):
+    """选择任务指定的对象，未指定时选择视图层中所有可导出对象"""
+    import bpy
+
+    view_layer = bpy.context.view_layer
+    names = job.get("objects")
+    if names:
+        objects = [bpy.data.objects[name] for name in names if name in bpy.data.objects]
+    else:
+        objects = [obj for obj in view_layer.objects
+                   if obj.type in EXPORT_OBJECT_TYPES and obj.visible_get() and not obj.hide_select]
+
+    for obj in view_layer.objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+
+    active_name = job.get("active")
+    if active_name and active_name in bpy.data.objects:
+        view_layer.objects.active = bpy.data.objects[active_name]
+    elif objects:
+        view_layer.objects.active = next((obj for obj in objects if obj.type == 'MESH'), objects[0])
+
+    return objects
+
+
+def run_export_job(job, package, timings):
+    """打开.blend文件，应用导出设置快照并运行MultiExport"""
+    import bpy
+
+    start = time.perf_counter()
+    bpy.ops.wm.open_mainfile(filepath=job["blend"], load_ui=False)
+    timings["open"] = time.perf_counter() - start
+
+    act = bpy.context.scene.poptools_props.export_tools_settings
+    skipped = package.utils.dict_to_property_group(act, job.get("settings", {}))
+
+    objects = select_export_objects(job)
+    if not objects:
+        raise RuntimeError("No exportable objects in file")
+
+    start = time.perf_counter()
+    result = bpy.ops.object.multi_export()
+    timings["export"] = time.perf_counter() - start
+
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"Export operator returned {sorted(result)}")
+
+    return {
+        "export_dir": act.export_dir,
+        "objects": len(objects),
+        "skipped_settings": skipped,
+    }
+
+
+def run_export_objects_job(job, package, timings):
+    """从导出快照中逐个导出对象（MultiExport并行INDIVIDUAL模式的分片）
+
+    快照中的对象已由主进程完成导出前处理（修改器、变换），这里只负责调用导出器。
+    job["units"]为[对象名, 导出文件名]列表。
+    """
+    import bpy
+
+    start = time.perf_counter()
+    bpy.ops.wm.open_mainfile(filepath=job["snapshot"], load_ui=False)
+    timings["open"] = time.perf_counter() - start
+
+    scene = bpy.context.scene
+    view_layer = bpy.context.view_layer
+    act = scene.poptools_props.export_tools_settings
+    package.utils.dict_to_property_group(act, job.get("settings", {}))
+    # 快照中没有场景，单位、帧范围和帧率由主进程传入（与串行导出的场景一致）
+    package.utils.apply_scene_settings(scene, job.get("scene", {}))
+
+    # 快照中的对象不属于任何场景，链接到场景集合后才能被选择
+    for obj_name, export_name in job["units"]:
+        obj = bpy.data.objects.get(obj_name)
+        if obj is not None and not obj.users_scene:
+            scene.collection.objects.link(obj)
+
+    export_tools = importlib.import_module(package.__name__ + ".export_tools")
+    exported = []
+    errors = []
+    start = time.perf_counter()
+    for obj_name, export_name in job["units"]:
+        obj = bpy.data.objects.get(obj_name)
+        if obj is None:
+            errors.append(f"{obj_name}: not found in snapshot")
+            continue
+        try:
+            for other in view_layer.objects:
+                other.select_set(False)
+            obj.select_set(True)
+            view_layer.objects.active = obj
+
+            # Apply Location - Center of file is origin of object (locked axes are kept, like the serial export)
+            if act.apply_loc:
+                export_tools.clear_location(obj)
+
+            package.utils.export_model(job["path"], export_name)
+            exported.append(export_name)
+        except Exception as e:
+            errors.append(f"{obj_name}: {type(e).__name__}: {e}")
+    timings["export"] = time.perf_counter() - start
+
+    return {"exported": exported, "errors": errors}
+
+
+def run_resize_image_job(job, package, timings):
+    """从磁盘读取纹理，缩放后写入目标路径（RT_OT_ResizeTextures的并行任务）"""
+    texture_resize = importlib.import_module(package.__name__ + ".texture_resize")
+
+    start = time.perf_counter()
+    result = texture_resize.resize_image_file(
+        job["source"], job["target"], job["width"], job["height"], job.get("filter", "AREA"))
+    timings["resize"] = time.perf_counter() - start
+    return result
+
+
+def run_resize_pyramid_job(job, package, timings):
+    """源纹理解码一次，输出多级分辨率"""
+    texture_resize = importlib.import_module(package.__name__ + ".texture_resize")
+
+    start = time.perf_counter()
+    result = texture_resize.resize_image_pyramid(
+        job["source"], [tuple(target) for target in job["targets"]], job.get("filter", "AREA"))
+    timings["resize"] = time.perf_counter() - start
+    return result
+
+
+# 任务类型 -> 处理函数
+JOB_HANDLERS = {
+    "export": run_export_job,
+    "export_objects": run_export_objects_job,
+    "resize_image": run_resize_image_job,
+    "resize_pyramid": run_resize_pyramid_job,
+}
+
+
+def worker_main():
+    """工作进程主循环：逐行读取任务直到收到quit或stdin关闭"""
+    package = load_addon()
+    send_message({"type": "ready", "pid": os.getpid()})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        message = json.loads(line)
+        if message.get("type") == "quit":
+            break
+
+        job = message.get("job", {})
+        handler = JOB_HANDLERS.get(job.get("type", "export"))
+        timings = {}
+        start = time.perf_counter()
+        reply = {"type": "result", "id": message.get("id"), "ok": False}
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job type: {job.get('type')}")
+            reply["result"] = handler(job, package, timings)
+            reply["ok"] = True
+        except Exception as e:
+            reply["error"] = f"{type(e).__name__}: {e}"
+        timings["total"] = time.perf_counter() - start
+        reply["timings"] = timings
+        send_message(reply)
+
+
+def dump_settings(path):
+    """把当前场景的导出设置保存为JSON快照"""
+    import bpy
+
+    package = load_addon()
+    act = bpy.context.scene.poptools_props.export_tools_settings
+    data = package.utils.property_group_to_dict(act)
+    # 导出目录由每次导出重新计算
+    data.pop("export_dir", None)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"PopTools: Export settings saved to {path}")
+
+
+# ==================== 协调进程 / Coordinator ====================
+
+class WorkerProcess:
+    """一个常驻的Blender后台进程"""
+
+    def __init__(self, blender, verbose=False):
+        self.blender = blender
+        self.verbose = verbose
+        self.process = None
+        self.messages = queue.Queue()
+        self.jobs_done = 0
+        self.startup_time = 0.0
+
+    def start(self, timeout):
+        start = time.perf_counter()
+        self.process = subprocess.Popen(
+            [self.blender, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--", "--worker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, encoding="utf-8", errors="replace", bufsize=1)
+        self.messages = queue.Queue()
+        self.jobs_done = 0
+        threading.Thread(target=self._read_stdout, args=(self.process, self.messages), daemon=True).start()
+
+        message = self.receive(timeout)
+        if message is None or message.get("type") != "ready":
+            self.kill()
+            raise RuntimeError("Blender worker failed to start")
+        self.startup_time = time.perf_counter() - start
+        return self.startup_time
+
+    def _read_stdout(self, process, messages):
+        for line in process.stdout:
+            index = line.find(PROTOCOL_MARKER)
+            if index >= 0:
+                messages.put(json.loads(line[index + len(PROTOCOL_MARKER):]))
+            elif self.verbose:
+                sys.stderr.write(line)
+        # 进程退出
+        messages.put(None)
+
+    def send(self, message):
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+
+    def receive(self, timeout=None):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.send({"type": "quit"})
+            self.process.wait(timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+        self.process = None
+
+    def kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+
+def run_batch(jobs, blender, workers=2, max_jobs=20, timeout=600, verbose=False):
+    """用worker个常驻进程执行所有任务，返回(results, stats)
+
+    timeout是进程启动和每个任务的超时秒数，任务中的"timeout"可以单独指定该任务的超时
+    """
+    pending = queue.Queue()
+    for index, job in enumerate(jobs):
+        pending.put((index, job))
+
+    results = [None] * len(jobs)
+    stats = {"worker_starts": 0, "startup_time": 0.0}
+    stats_lock = threading.Lock()
+
+    def slot_loop(slot):
+        worker = WorkerProcess(blender, verbose)
+        while True:
+            try:
+                index, job = pending.get_nowait()
+            except queue.Empty:
+                break
+
+            # 首次启动、进程崩溃或达到回收次数时重启
+            if worker.process is None:
+                try:
+                    startup = worker.start(timeout)
+                except (OSError, RuntimeError) as e:
+                    results[index] = dict(job, ok=False, error=f"Worker start failed: {e}", timings={})
+                    continue
+                with stats_lock:
+                    stats["worker_starts"] += 1
+                    stats["startup_time"] += startup
+
+            start = time.perf_counter()
+            try:
+                worker.send({"type": "job", "id": index, "job": job})
+                reply = worker.receive(job.get("timeout", timeout))
+            except OSError:
+                reply = None
+            wall = time.perf_counter() - start
+
+            if reply is None:
+                worker.kill()
+                results[index] = dict(job, ok=False, error="Worker crashed or timed out", timings={"wall": wall})
+            else:
+                reply["timings"]["wall"] = wall
+                results[index] = dict(job, ok=reply["ok"], error=reply.get("error"),
+                                      result=reply.get("result"), timings=reply["timings"], worker=slot)
+                worker.jobs_done += 1
+                if worker.jobs_done >= max_jobs:
+                    worker.stop()
+
+            status = "OK" if results[index]["ok"] else f"FAILED ({results[index]['error']})"
+            label = job.get("blend") or job.get("label") or f"{job.get('type')} #{index}"
+            print(f"PopTools: [{slot}] {label} {wall:.2f}s {status}")
+
+        worker.stop()
+
+    threads = [threading.Thread(target=slot_loop, args=(slot,)) for slot in range(max(1, workers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results, stats
+
+
+def run_jobs_inline(jobs, package):
+    """在当前进程中执行任务（任务较少、不值得启动后台进程时），结果格式与run_batch相同"""
+    results = []
+    for job in jobs:
+        handler = JOB_HANDLERS.get(job.get("type", "export"))
+        timings = {}
+        start = time.perf_counter()
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job type: {job.get('type')}")
+            result = handler(job, package, timings)
+            results.append(dict(job, ok=True, error=None, result=result, timings=timings))
+        except Exception as e:
+            results.append(dict(job, ok=False, error=f"{type(e).__name__}: {e}", result=None, timings=timings))
+        timings["total"] = time.perf_counter() - start
+    return results
+
+
+def run_jobs(jobs, package, blender, workers=2, min_parallel=1, **kwargs):
+    """任务数达到min_parallel时用后台进程执行（run_batch），否则在当前进程中执行
+
+    两种方式返回相同格式的结果，与jobs顺序一致：
+    [{"job": 任务, "ok", "error", "result", "timings"}]
+    """
+    if not jobs:
+        return []
+    if len(jobs) >= min_parallel:
+        results, stats = run_batch(jobs, blender, workers=workers, **kwargs)
+    else:
+        results = run_jobs_inline(jobs, package)
+    return [dict(job=job, ok=result["ok"], error=result.get("error"), result=result.get("result"),
+                 timings=result.get("timings", {}))
+            for job, result in zip(jobs, results)]
+
+
+def collect_blend_files(inputs, recursive=False):
+    """展开输入的文件和目录为.blend文件列表"""
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(".blend"))
+                if not recursive:
+                    break
+        elif path.endswith(".blend"):
+            files.append(path)
+    return [os.path.abspath(path) for path in files]
+
+
+def coordinator_main(argv):
+    parser = argparse.ArgumentParser(description="PopTools batch export with persistent Blender workers")
+    parser.add_argument("inputs", nargs="+", help=".blend files or directories")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--max-jobs", type=int, default=20, help="Recycle a worker after this many jobs")
+    parser.add_argument("--settings", help="Export settings JSON (see --dump-settings)")
+    parser.add_argument("--export-path", help="Override export directory for all files")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds per job before the worker is killed")
+    parser.add_argument("--report", help="Write per-job results and timings to this JSON file")
+    parser.add_argument("--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("--verbose", action="store_true", help="Forward Blender output")
+    args = parser.parse_args(argv)
+
+    settings = {}
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as f:
+            settings = json.load(f)
+    if args.export_path:
+        settings["custom_export_path"] = True
+        settings["export_path"] = os.path.abspath(args.export_path)
+
+    blend_files = collect_blend_files(args.inputs, args.recursive)
+    if not blend_files:
+        print("PopTools: No .blend files found")
+        return 1
+
+    jobs = [{"type": "export", "blend": path, "settings": settings} for path in blend_files]
+
+    start = time.perf_counter()
+    results, stats = run_batch(jobs, args.blender, args.workers, args.max_jobs, args.timeout, args.verbose)
+    wall = time.perf_counter() - start
+
+    failed = [r for r in results if not r["ok"]]
+    summary = {
+        "files": len(results),
+        "failed": len(failed),
+        "wall_time": wall,
+        "job_time": sum(r["timings"].get("total", 0.0) for r in results),
+        "worker_starts": stats["worker_starts"],
+        "worker_startup_time": stats["startup_time"],
+    }
+    print(f"PopTools: Exported {len(results) - len(failed)}/{len(results)} files in {wall:.2f}s "
+          f"({stats['worker_starts']} worker starts, {stats['startup_time']:.2f}s startup)")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "jobs": results}, f, indent=2, ensure_ascii=False)
+
+    return 1 if failed else 0
+
+
+def main():
+    if "--" in sys.argv:
+        # 在Blender中运行: blender ... --python batch_export.py -- <args>
+        argv = sys.argv[sys.argv.index("--") + 1:]
+        if "--worker" in argv:
+            worker_main()
+            return
+        if "--dump-settings" in argv:
+            dump_settings(argv[argv.index("--dump-settings") + 1])
+            return
+        sys.exit(coordinator_main(argv))
+    sys.exit(coordinator_main(sys.argv[1:]))
+
+
+if __name__ == "__main__":
+    main()
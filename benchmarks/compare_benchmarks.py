@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools 基准测试结果对比 / Benchmark Comparison
+
+对比历史文件中的两次运行（默认最后两次），超过阈值的变慢项会被标记，
+存在变慢时以退出码1结束，便于在构建脚本中使用。
+
+用法:
+    python benchmarks/compare_benchmarks.py benchmarks/history.json
+    python benchmarks/compare_benchmarks.py history.json --baseline 0 --current -1 --threshold 15
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare_runs(baseline, current, threshold, metric="median"):
+    """返回[(键, 基线耗时, 当前耗时, 变化百分比, 状态)]"""
+    rows = []
+    for key in sorted(set(baseline["results"]) | set(current["results"])):
+        old = baseline["results"].get(key)
+        new = current["results"].get(key)
+        if old is None or new is None:
+            rows.append((key, None, None, None, "MISSING"))
+            continue
+        if "error" in old or "error" in new:
+            rows.append((key, old.get(metric), new.get(metric), None, "ERROR"))
+            continue
+
+        change = 100.0 * (new[metric] - old[metric]) / max(old[metric], 1e-9)
+        if change > threshold:
+            status = "SLOWER"
+        elif change < -threshold:
+            status = "FASTER"
+        else:
+            status = "OK"
+        rows.append((key, old[metric], new[metric], change, status))
+    return rows
+
+
+def describe(run):
+    label = f" [{run['label']}]" if run.get("label") else ""
+    return f"{run['timestamp']} {run.get('revision') or '?'}{label}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare PopTools export benchmark runs")
+    parser.add_argument("history", help="History JSON written by export_benchmark.py")
+    parser.add_argument("--baseline", type=int, default=-2, help="Index of the baseline run")
+    parser.add_argument("--current", type=int, default=-1, help="Index of the run to check")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Slowdown threshold in percent")
+    parser.add_argument("--metric", choices=("min", "median"), default="median")
+    args = parser.parse_args(argv)
+
+    with open(args.history, encoding="utf-8") as f:
+        history = json.load(f)
+    if len(history) < 2:
+        print("Need at least two runs in the history file")
+        return 0
+
+    baseline = history[args.baseline]
+    current = history[args.current]
+    if baseline["params"] != current["params"]:
+        print(f"Warning: runs use different parameters: {baseline['params']} vs {current['params']}")
+
+    print(f"Baseline: {describe(baseline)}")
+    print(f"Current:  {describe(current)}")
+    print()
+
+    rows = compare_runs(baseline, current, args.threshold, args.metric)
+    width = max(len(row[0]) for row in rows)
+    for key, old, new, change, status in rows:
+        if change is None:
+            print(f"{key:<{width}}  {status}")
+        else:
+            print(f"{key:<{width}}  {old:8.3f}s -> {new:8.3f}s  {change:+7.1f}%  {status}")
+
+    slower = [row for row in rows if row[4] == "SLOWER"]
+    if slower:
+        print(f"\n{len(slower)} benchmark(s) slower than {args.threshold:.0f}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
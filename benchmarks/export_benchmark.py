@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools 导出性能基准测试 / Export Benchmark
+
+生成参数化的合成场景，对每种 导出引擎 × fbx_export_mode × export_format 组合
+以及 obj.batch_export 计时，结果追加到JSON历史文件中。
+
+用法:
+    blender -b --factory-startup --python benchmarks/export_benchmark.py -- \\
+        --objects 50 --verts 2000 --repeat 3 --history benchmarks/history.json --label my-change
+
+对比最近两次结果:
+    python benchmarks/compare_benchmarks.py benchmarks/history.json
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import bpy
+
+EXPORT_MODES = ('ALL', 'INDIVIDUAL', 'PARENT', 'COLLECTION')
+EXPORT_FORMATS = ('FBX', 'OBJ', 'GLTF')
+EXPORT_ENGINES = ('DUPLICATE', 'DEPSGRAPH')
+
+
+def load_addon():
+    """导入并注册PopTools包（benchmarks目录的上一级即包目录）"""
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parent_dir, package_name = os.path.split(package_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    package = importlib.import_module(package_name)
+    if not hasattr(bpy.types.Scene, "poptools_props"):
+        package.register()
+    return package, package_dir
+
+
+def git_revision(directory):
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=directory,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ==================== 场景生成 / Scene Generation ====================
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for collection in list(bpy.data.collections):
+        bpy.data.collections.remove(collection)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+
+
+def create_grid_mesh(name, vert_count):
+    """创建约vert_count个顶点的起伏网格"""
+    side = max(2, int(math.ceil(math.sqrt(vert_count))))
+    verts = []
+    for y in range(side):
+        for x in range(side):
+            verts.append((x / side, y / side, 0.05 * math.sin(x * 0.7) * math.cos(y * 0.5)))
+    faces = []
+    for y in range(side - 1):
+        for x in range(side - 1):
+            i = y * side + x
+            faces.append((i, i + 1, i + side + 1, i + side))
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    mesh.uv_layers.new(name="UVMap")
+    mesh.update()
+    return mesh
+
+
+def build_scene(object_count, vert_count, collections, children_per_root, use_modifiers):
+    """生成合成场景：多个集合，每个集合中有空物体父级和网格子级
+
+    同一个场景覆盖所有导出模式：PARENT按空物体父级导出，COLLECTION按集合导出。
+    """
+    clear_scene()
+    scene = bpy.context.scene
+    material = bpy.data.materials.get("bench_mat") or bpy.data.materials.new("bench_mat")
+    objects = []
+
+    for c in range(collections):
+        collection = bpy.data.collections.new(f"bench_col_{c}")
+        scene.collection.children.link(collection)
+
+    for i in range(object_count):
+        collection = bpy.data.collections[f"bench_col_{i % collections}"]
+        root_index = i // children_per_root
+        root_name = f"bench_root_{root_index}"
+        root = bpy.data.objects.get(root_name)
+        if root is None:
+            root = bpy.data.objects.new(root_name, None)
+            root.location = (root_index * 2.0, 0.0, 0.0)
+            collection.objects.link(root)
+            objects.append(root)
+
+        mesh = create_grid_mesh(f"bench_mesh_{i}", vert_count)
+        mesh.materials.append(material)
+        obj = bpy.data.objects.new(f"bench_obj_{i}", mesh)
+        obj.location = (0.0, (i % children_per_root) * 1.5, 0.0)
+        obj.rotation_euler = (0.0, 0.0, 0.1 * i)
+        obj.parent = root
+        root.users_collection[0].objects.link(obj)
+        objects.append(obj)
+
+        if use_modifiers:
+            mirror = obj.modifiers.new("Mirror", 'MIRROR')
+            mirror.use_axis = (True, False, False)
+            subsurf = obj.modifiers.new("Subdivision", 'SUBSURF')
+            subsurf.levels = 1
+
+    bpy.context.view_layer.update()
+    return objects
+
+
+def select_objects(objects, active=None):
+    for obj in bpy.context.view_layer.objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = active or objects[0]
+
+
+# ==================== 计时 / Timing ====================
+
+def time_call(func, repeat, output_dir):
+    """执行func repeat次，每次前清空输出目录，返回计时统计"""
+    timings = []
+    files = 0
+    for _ in range(repeat):
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.makedirs(output_dir)
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        files = len([name for name in os.listdir(output_dir) if not name.startswith('.')])
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "runs": timings,
+        "files": files,
+    }
+
+
+def bench_multi_export(objects, output_dir, repeat, engine, mode, export_format):
+    act = bpy.context.scene.poptools_props.export_tools_settings
+    act.custom_export_path = True
+    act.export_path = output_dir + os.sep
+    act.export_force = True
+    act.export_profiling = False
+    act.export_engine = engine
+    act.fbx_export_mode = mode
+    act.export_format = export_format
+
+    mesh_active = next(obj for obj in objects if obj.type == 'MESH')
+
+    def run():
+        select_objects(objects, mesh_active)
+        result = bpy.ops.object.multi_export()
+        if 'FINISHED' not in result:
+            raise RuntimeError(f"multi_export returned {sorted(result)}")
+
+    return time_call(run, repeat, output_dir)
+
+
+def bench_obj_batch_export(objects, output_dir, repeat):
+    props = bpy.context.scene.poptools_props.obj_export_settings
+    props.obj_export_path = output_dir + os.sep
+    props.obj_export_force = True
+    meshes = [obj for obj in objects if obj.type == 'MESH']
+
+    def run():
+        select_objects(meshes)
+        result = bpy.ops.obj.batch_export()
+        if 'FINISHED' not in result:
+            raise RuntimeError(f"obj.batch_export returned {sorted(result)}")
+
+    return time_call(run, repeat, output_dir)
+
+
+def run_benchmarks(args):
+    package, package_dir = load_addon()
+    output_dir = tempfile.mkdtemp(prefix="poptools_bench_")
+    results = {}
+
+    try:
+        for use_modifiers in (False, True):
+            scenario = "modifiers" if use_modifiers else "plain"
+            objects = build_scene(args.objects, args.verts, args.collections, args.children, use_modifiers)
+
+            for engine in args.engines:
+                for export_format in args.formats:
+                    for mode in args.modes:
+                        key = f"{scenario}/{engine}/{export_format}/{mode}"
+                        try:
+                            results[key] = bench_multi_export(objects, output_dir, args.repeat,
+                                                              engine, mode, export_format)
+                        except Exception as e:
+                            results[key] = {"error": f"{type(e).__name__}: {e}"}
+                        print(f"PopTools Benchmark: {key}: {format_result(results[key])}")
+
+            key = f"{scenario}/obj.batch_export"
+            try:
+                results[key] = bench_obj_batch_export(objects, output_dir, args.repeat)
+            except Exception as e:
+                results[key] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"PopTools Benchmark: {key}: {format_result(results[key])}")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "revision": git_revision(package_dir),
+        "blender": bpy.app.version_string,
+        "params": {
+            "objects": args.objects,
+            "verts": args.verts,
+            "collections": args.collections,
+            "children": args.children,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def format_result(result):
+    if "error" in result:
+        return f"ERROR {result['error']}"
+    return f"min {result['min']:.3f}s, median {result['median']:.3f}s, {result['files']} files"
+
+
+def append_history(path, run):
+    history = []
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            history = json.load(f)
+    history.append(run)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="PopTools export benchmark")
+    parser.add_argument("--objects", type=int, default=40, help="Number of mesh objects")
+    parser.add_argument("--verts", type=int, default=2000, help="Vertices per mesh")
+    parser.add_argument("--collections", type=int, default=4, help="Collections for COLLECTION mode")
+    parser.add_argument("--children", type=int, default=5, help="Meshes per parent empty for PARENT mode")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=list(EXPORT_MODES), choices=EXPORT_MODES)
+    parser.add_argument("--formats", nargs="+", default=list(EXPORT_FORMATS), choices=EXPORT_FORMATS)
+    parser.add_argument("--engines", nargs="+", default=list(EXPORT_ENGINES), choices=EXPORT_ENGINES)
+    parser.add_argument("--history", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                          "history.json"))
+    parser.add_argument("--label", default="", help="Free text label stored with the run")
+    args = parser.parse_args(argv)
+
+    run = run_benchmarks(args)
+    append_history(args.history, run)
+    print(f"PopTools Benchmark: results appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -39,7 +39,7 @@ def create_zip_package():
     
     exclude_patterns = {
         '__pycache__', '.mypy_cache', '.gitignore', 'packages', 
-        'generate_json.py', 'create_package.py', '.git','docs',
+        'generate_json.py', 'create_package.py', '.git','docs', 'benchmarks',
     }
     
     # 确保packages目录存在
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Export Cache
+增量导出缓存：为每个导出单元（一个输出文件）计算内容指纹，
+指纹和输出文件都未变化时跳过导出
+"""
+
+import bpy
+import os
+import hashlib
+import numpy as np
+from .export_manifest import MANIFEST_NAME, MANIFEST_VERSION, ExportCache
+
+# 属性类型 -> (foreach_get键, numpy类型, 分量数)
+ATTRIBUTE_LAYOUTS = {
+    'FLOAT': ('value', np.float32, 1),
+    'INT': ('value', np.int32, 1),
+    'INT8': ('value', np.int32, 1),
+    'BOOLEAN': ('value', bool, 1),
+    'FLOAT2': ('vector', np.float32, 2),
+    'INT32_2D': ('value', np.int32, 2),
+    'FLOAT_VECTOR': ('vector', np.float32, 3),
+    'FLOAT_COLOR': ('color', np.float32, 4),
+    'BYTE_COLOR': ('color', np.float32, 4),
+    'QUATERNION': ('value', np.float32, 4),
+    'FLOAT4X4': ('value', np.float32, 16),
+}
+
+
+# ==================== 指纹 / Fingerprint ====================
+
+def hash_buffer(hasher, collection, key, count, dtype, components=1):
+    """用foreach_get把集合属性读入缓冲区，并直接对缓冲区内存做哈希"""
+    buffer = np.empty(count * components, dtype=dtype)
+    if count:
+        collection.foreach_get(key, buffer)
+    hasher.update(memoryview(buffer))
+
+
+def hash_value(hasher, value):
+    hasher.update(repr(value).encode('utf-8'))
+    hasher.update(b'\0')
+
+
+def hash_rna(hasher, struct, visited):
+    """哈希RNA结构的所有简单属性（跳过集合）
+
+    指向数据块的指针（布尔切割体、镜像对象、几何节点树、骨架、曲线目标...）
+    递归哈希被引用数据块的内容，其他指针只记录名称。
+    """
+    for prop in struct.bl_rna.properties:
+        if prop.identifier == 'rna_type' or prop.type == 'COLLECTION':
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if prop.type == 'POINTER':
+            if isinstance(value, bpy.types.ID):
+                hash_value(hasher, prop.identifier)
+                hash_id(hasher, value, visited)
+                continue
+            value = getattr(value, 'name', None)
+        elif getattr(prop, 'is_array', False):
+            value = tuple(value) if prop.array_dimensions[1] == 0 else tuple(tuple(v) for v in value)
+        hash_value(hasher, (prop.identifier, value))
+
+    # 几何节点修改器等的输入存储在ID属性中
+    if hasattr(struct, 'keys'):
+        for key in sorted(struct.keys()):
+            value = struct[key]
+            if isinstance(value, bpy.types.ID):
+                hash_value(hasher, key)
+                hash_id(hasher, value, visited)
+            else:
+                hash_value(hasher, (key, str(value)))
+
+
+def hash_socket_value(hasher, socket, visited):
+    value = getattr(socket, 'default_value', None)
+    if isinstance(value, bpy.types.ID):
+        hash_value(hasher, socket.identifier)
+        hash_id(hasher, value, visited)
+        return
+    if hasattr(value, '__len__') and not isinstance(value, str):
+        value = tuple(value)
+    hash_value(hasher, (socket.identifier, value))
+
+
+def hash_node_tree(hasher, node_tree, visited):
+    """节点、输入端口的默认值和链接（嵌套的节点组通过node_tree指针递归）"""
+    for node in sorted(node_tree.nodes, key=lambda n: n.name):
+        hash_value(hasher, (node.name, node.bl_idname))
+        hash_rna(hasher, node, visited)
+        for socket in node.inputs:
+            hash_socket_value(hasher, socket, visited)
+    hash_value(hasher, sorted((link.from_node.name, link.from_socket.identifier,
+                               link.to_node.name, link.to_socket.identifier) for link in node_tree.links))
+
+
+def hash_id(hasher, id_data, visited):
+    """被引用的数据块：修改它们会改变引用者的评估结果（每个指纹中每个数据块只哈希一次内容）"""
+    hash_value(hasher, (type(id_data).__name__, id_data.name))
+    if id_data.session_uid in visited:
+        return
+    visited.add(id_data.session_uid)
+
+    if isinstance(id_data, bpy.types.Object):
+        hasher.update(memoryview(np.array(id_data.matrix_world, dtype=np.float32)))
+        hash_object_data(hasher, id_data, visited)
+        for modifier in id_data.modifiers:
+            hash_rna(hasher, modifier, visited)
+    elif isinstance(id_data, bpy.types.NodeTree):
+        hash_node_tree(hasher, id_data, visited)
+    elif isinstance(id_data, bpy.types.Collection):
+        for obj in sorted(id_data.all_objects, key=lambda o: o.name):
+            hash_id(hasher, obj, visited)
+    elif isinstance(id_data, bpy.types.Image):
+        hash_value(hasher, (id_data.filepath, image_file_state(id_data)))
+    elif isinstance(id_data, bpy.types.Mesh):
+        hash_mesh(hasher, id_data)
+    elif isinstance(id_data, bpy.types.Curve):
+        hash_curve(hasher, id_data, visited)
+    elif isinstance(id_data, bpy.types.Texture):
+        hash_rna(hasher, id_data, visited)
+
+
+def hash_mesh(hasher, mesh):
+    """哈希网格几何：拓扑、全部属性层和形态键"""
+    hash_buffer(hasher, mesh.vertices, 'co', len(mesh.vertices), np.float32, 3)
+    hash_buffer(hasher, mesh.edges, 'vertices', len(mesh.edges), np.int32, 2)
+    hash_buffer(hasher, mesh.loops, 'vertex_index', len(mesh.loops), np.int32)
+    hash_buffer(hasher, mesh.polygons, 'loop_start', len(mesh.polygons), np.int32)
+
+    domain_sizes = {
+        'POINT': len(mesh.vertices),
+        'EDGE': len(mesh.edges),
+        'FACE': len(mesh.polygons),
+        'CORNER': len(mesh.loops),
+    }
+    for attribute in sorted(mesh.attributes, key=lambda a: a.name):
+        layout = ATTRIBUTE_LAYOUTS.get(attribute.data_type)
+        hash_value(hasher, (attribute.name, attribute.domain, attribute.data_type))
+        if layout is None:
+            continue
+        key, dtype, components = layout
+        try:
+            hash_buffer(hasher, attribute.data, key, domain_sizes.get(attribute.domain, len(attribute.data)),
+                        dtype, components)
+        except (RuntimeError, TypeError):
+            # 无法批量读取的属性只记录名称
+            continue
+
+    if mesh.shape_keys:
+        for key_block in mesh.shape_keys.key_blocks:
+            hash_value(hasher, (key_block.name, key_block.value, key_block.mute, key_block.relative_key.name))
+            hash_buffer(hasher, key_block.data, 'co', len(key_block.data), np.float32, 3)
+
+    hash_value(hasher, [mat.name if mat else None for mat in mesh.materials])
+
+
+def hash_curve(hasher, curve, visited):
+    """曲线设置（倒角、挤出、倒角对象...）和控制点，文字的内容在设置中"""
+    hash_rna(hasher, curve, visited)
+    for spline in curve.splines:
+        hash_value(hasher, (spline.type, spline.use_cyclic_u, spline.resolution_u, spline.order_u))
+        hash_buffer(hasher, spline.points, 'co', len(spline.points), np.float32, 4)
+        bezier_points = spline.bezier_points
+        for key in ('co', 'handle_left', 'handle_right'):
+            hash_buffer(hasher, bezier_points, key, len(bezier_points), np.float32, 3)
+
+
+def hash_pose(hasher, obj):
+    """骨架对象的当前姿态（骨架修改器按姿态变形网格）"""
+    if obj.pose is None:
+        return
+    bones = obj.pose.bones
+    hash_buffer(hasher, bones, 'matrix', len(bones), np.float32, 16)
+
+
+def hash_armature(hasher, armature):
+    bones = armature.bones
+    hash_value(hasher, [(bone.name, bone.parent.name if bone.parent else None, bone.use_deform) for bone in bones])
+    hash_buffer(hasher, bones, 'head_local', len(bones), np.float32, 3)
+    hash_buffer(hasher, bones, 'tail_local', len(bones), np.float32, 3)
+    hash_buffer(hasher, bones, 'matrix_local', len(bones), np.float32, 16)
+
+
+def image_file_state(image):
+    """图像内容的变化标记：磁盘文件的修改时间和大小，打包图像的数据大小"""
+    if image.packed_file is not None:
+        return ('PACKED', image.packed_file.size)
+    if image.source not in {'FILE', 'SEQUENCE', 'TILED'}:
+        return None
+    try:
+        stat = os.stat(bpy.path.abspath(image.filepath, library=image.library))
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def hash_material(hasher, material):
+    hash_value(hasher, (material.name, tuple(material.diffuse_color), material.blend_method))
+    if material.use_nodes and material.node_tree:
+        for node in material.node_tree.nodes:
+            image = getattr(node, 'image', None)
+            if image is not None:
+                # 贴图文件在外部被修改时（文件路径不变）也要重新导出
+                hash_value(hasher, (node.name, image.name, image.filepath, image_file_state(image)))
+
+
+def hash_animation(hasher, obj):
+    anim = obj.animation_data
+    if anim is None or anim.action is None:
+        return
+    hash_value(hasher, anim.action.name)
+    for fcurve in anim.action.fcurves:
+        hash_value(hasher, (fcurve.data_path, fcurve.array_index))
+        points = fcurve.keyframe_points
+        hash_buffer(hasher, points, 'co', len(points), np.float32, 2)
+
+
+def hash_object_data(hasher, obj, visited):
+    if obj.type == 'MESH':
+        hash_mesh(hasher, obj.data)
+    elif obj.type == 'ARMATURE':
+        hash_armature(hasher, obj.data)
+        hash_pose(hasher, obj)
+    elif obj.type == 'EMPTY':
+        hash_value(hasher, (obj.empty_display_type, obj.empty_display_size))
+    elif obj.type in {'CURVE', 'FONT'}:
+        hash_curve(hasher, obj.data, visited)
+    elif obj.data is not None:
+        hash_rna(hasher, obj.data, visited)
+
+
+def hash_object(hasher, obj, visited):
+    """哈希单个对象：名称、层级、变换、数据、修改器（含引用的数据块）、材质、动画和自定义属性"""
+    hash_value(hasher, (obj.name, obj.type, obj.parent.name if obj.parent else None))
+    hasher.update(memoryview(np.array(obj.matrix_world, dtype=np.float32)))
+    hasher.update(memoryview(np.array(obj.matrix_local, dtype=np.float32)))
+
+    hash_object_data(hasher, obj, visited)
+
+    for modifier in obj.modifiers:
+        hash_rna(hasher, modifier, visited)
+
+    for slot in obj.material_slots:
+        hash_value(hasher, slot.link)
+        if slot.material:
+            hash_material(hasher, slot.material)
+
+    hash_animation(hasher, obj)
+
+    for key in sorted(obj.keys()):
+        hash_value(hasher, (key, str(obj[key])))
+
+
+def fingerprint_objects(objects, op_name, export_args, extra=None):
+    """计算导出单元指纹：对象内容 + 解析后的导出操作符参数"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hash_value(hasher, (MANIFEST_VERSION, bpy.app.version_string, op_name))
+    hash_value(hasher, sorted(export_args.items()))
+    if extra is not None:
+        hash_value(hasher, extra)
+    visited = set()
+    for obj in sorted(objects, key=lambda o: o.name):
+        hash_object(hasher, obj, visited)
+    return hasher.hexdigest()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Export Journal
+批量导出断点续传日志：每完成一个对象就向导出目录中的日志追加一行
+（对象名、输出文件、大小、哈希），Blender崩溃或被终止后可以从断点继续导出
+"""
+
+import os
+import json
+import hashlib
+
+JOURNAL_NAME = ".poptools_obj_journal.jsonl"
+
+# 临时文件后缀，重命名前的半成品不会被当作完成的输出
+TEMP_SUFFIX = ".partial"
+
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def hash_file(filepath):
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def replace_atomic(temp_path, filepath):
+    """把已写完的临时文件重命名为最终文件（同一目录内的rename是原子操作）"""
+    os.replace(temp_path, filepath)
+
+
+class ExportJournal:
+    """导出目录中的完成日志（JSON Lines，逐行追加并立即落盘）"""
+
+    def __init__(self, directory, resume=False):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.entries = {}
+        self.resumed = []
+        if resume:
+            self.load()
+        else:
+            self.reset()
+
+    def load(self):
+        """读取日志，崩溃时写了一半的最后一行会被忽略并从文件中截掉，
+        否则续传后追加的记录会接在这半行后面而无法读取"""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.entries = {}
+            return
+
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].splitlines():
+            try:
+                entry = json.loads(line.decode('utf-8'))
+            except ValueError:
+                continue
+            self.entries[entry['object']] = entry
+
+        if complete < len(data):
+            try:
+                os.truncate(self.journal_path, complete)
+            except OSError:
+                pass
+
+    def reset(self):
+        self.entries = {}
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
+
+    def is_complete(self, name, filepath):
+        """对象已记录为完成，且输出文件的大小和哈希都没有变化"""
+        entry = self.entries.get(name)
+        if entry is None or entry.get('file') != os.path.basename(filepath):
+            return False
+        try:
+            if os.path.getsize(filepath) != entry.get('size'):
+                return False
+            return hash_file(filepath) == entry.get('hash')
+        except OSError:
+            return False
+
+    def check(self, name, filepath):
+        if self.is_complete(name, filepath):
+            self.resumed.append(name)
+            return True
+        return False
+
+    def record(self, name, filepath):
+        """记录已完成的对象（输出文件已通过重命名落盘）"""
+        try:
+            entry = {
+                'object': name,
+                'file': os.path.basename(filepath),
+                'size': os.path.getsize(filepath),
+                'hash': hash_file(filepath),
+            }
+        except OSError:
+            return
+        self.entries[name] = entry
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self):
+        """整个批次完成后删除日志"""
+        self.reset()
+
+    def summary(self):
+        return f"断点续传: 跳过 {len(self.resumed)} 个已完成对象 / Resume: {len(self.resumed)} already completed"
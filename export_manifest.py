@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Export Manifest
+增量导出清单：导出目录中按文件名记录指纹、大小和修改时间（不依赖Blender，
+指纹由export_cache计算）
+"""
+
+import os
+import json
+
+MANIFEST_NAME = ".poptools_export_manifest.json"
+
+# 清单格式版本，指纹算法变化时递增使旧清单失效
+MANIFEST_VERSION = 3
+
+
+class ExportCache:
+    """导出目录中的指纹清单"""
+
+    def __init__(self, directory, force=False):
+        self.directory = directory
+        self.force = force
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.entries = {}
+        self.hits = []
+        self.misses = []
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_unchanged(self, filepath, fingerprint):
+        """指纹相同且输出文件未被外部修改时返回True"""
+        if self.force:
+            return False
+        entry = self.entries.get(os.path.basename(filepath))
+        if entry is None or entry.get('fingerprint') != fingerprint:
+            return False
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return False
+        return stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns')
+
+    def check(self, filepath, fingerprint):
+        """检查并统计命中/未命中，命中时可以跳过导出"""
+        if self.is_unchanged(filepath, fingerprint):
+            self.hits.append(os.path.basename(filepath))
+            return True
+        self.misses.append(os.path.basename(filepath))
+        return False
+
+    def record(self, filepath, fingerprint):
+        """导出完成后记录指纹"""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return
+        self.entries[os.path.basename(filepath)] = {
+            'fingerprint': fingerprint,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.entries}, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+        self.dirty = False
+
+    def summary(self):
+        return f"增量导出: 跳过 {len(self.hits)} 个未变化文件, 导出 {len(self.misses)} 个 / " \
+               f"Incremental export: {len(self.hits)} skipped, {len(self.misses)} exported"
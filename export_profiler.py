@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Export Profiler
+导出流程分阶段计时：记录每个阶段（及对象）的耗时，生成JSON/CSV报告
+"""
+
+import os
+import csv
+import json
+import time
+import contextlib
+from datetime import datetime
+
+# 以点开头：Unity不导入隐藏文件，报告和导出文件放在同一目录也不会被当作资源
+REPORT_PREFIX = ".poptools_export_profile"
+
+
+class ExportProfiler:
+    """低开销的分阶段计时器，未启用时stage()不做任何计时"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = []
+        self.start_time = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name, obj_name=None):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append((name, obj_name, time.perf_counter() - start))
+
+    def totals(self):
+        """按阶段汇总，返回[(阶段, 总耗时, 次数)]，按出现顺序排列"""
+        totals = {}
+        for name, obj_name, seconds in self.records:
+            total, count = totals.get(name, (0.0, 0))
+            totals[name] = (total + seconds, count + 1)
+        return [(name, total, count) for name, (total, count) in totals.items()]
+
+    def per_object(self):
+        """按对象汇总，返回{对象: {阶段: 耗时}}"""
+        objects = {}
+        for name, obj_name, seconds in self.records:
+            if obj_name is None:
+                continue
+            stages = objects.setdefault(obj_name, {})
+            stages[name] = stages.get(name, 0.0) + seconds
+        return objects
+
+    def summary_lines(self, limit=None):
+        """面板显示用的摘要（耗时从高到低）"""
+        wall = time.perf_counter() - self.start_time
+        totals = sorted(self.totals(), key=lambda item: item[1], reverse=True)
+        if limit is not None:
+            totals = totals[:limit]
+        lines = [f"总计 / Total: {wall:.3f}s"]
+        for name, total, count in totals:
+            lines.append(f"{name}: {total:.3f}s ({count}x, {100.0 * total / max(wall, 1e-9):.0f}%)")
+        return lines
+
+    def write_report(self, directory):
+        """写入JSON和CSV报告，返回(json路径, csv路径)"""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        json_path = os.path.join(directory, f"{REPORT_PREFIX}_{stamp}.json")
+        csv_path = os.path.join(directory, f"{REPORT_PREFIX}_{stamp}.csv")
+
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "wall_time": time.perf_counter() - self.start_time,
+            "stages": [{"stage": name, "seconds": total, "count": count}
+                       for name, total, count in self.totals()],
+            "objects": self.per_object(),
+        }
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "object", "seconds"])
+            for name, obj_name, seconds in self.records:
+                writer.writerow([name, obj_name or "", f"{seconds:.6f}"])
+
+        return json_path, csv_path
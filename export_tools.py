@@ -1,114 +1,384 @@
 import bpy
+import abc
 import os
+import contextlib
 import sys
 import subprocess
 import math
+import time
+import shutil
+import tempfile
+import mathutils
 from . import utils
+from . import export_cache
+from . import export_profiler
+from . import batch_export
 from datetime import datetime
 
-
-# FBX/OBJ/GLTF export
-class MultiExport(bpy.types.Operator):
-	"""Export FBXs/OBJs/GLTFs to Unity/UE/Godot"""
-	bl_idname = "object.multi_export"
-	bl_label = "Export FBXs/OBJs/GLTFs"
-	bl_options = {'REGISTER', 'UNDO'}
-
-	def execute(self, context):
-		start_time = datetime.now()
-		act = bpy.context.scene.poptools_props.export_tools_settings
-		act.export_dir = ""
-		incorrect_names = []
-
-		# Check custom name
+# Seconds a parallel export shard may run before its worker is killed:
+# a fixed part (open the snapshot) plus a part per exported object
+PARALLEL_SHARD_TIMEOUT = 300
+PARALLEL_OBJECT_TIMEOUT = 120
+
+# Scratch scene of the isolated export and the data-block types created in it
+ISOLATED_SCENE_NAME = "PopTools Isolated Export"
+ISOLATED_ID_COLLECTIONS = ('objects', 'meshes', 'curves', 'armatures', 'scenes')
+
+# Settings that don't change the exported files (left out of the cache fingerprint)
+CACHE_IGNORED_SETTINGS = {'export_dir', 'export_force', 'export_parallel', 'export_parallel_workers',
+						  'export_profiling', 'export_profile_summary'}
+
+
+# Export session. Shared state of one MultiExport run
+class HierarchyIndex:
+	"""Parent/children and collection lookups for the exported objects.
+
+	Built once per export so PARENT, COLLECTION and the rotation fix don't
+	have to change the selection (select_grouped) or scan lists repeatedly.
+	Only objects passed to the index are returned as children.
+	"""
+
+	def __init__(self, objects):
+		self.objects = list(objects)
+		self.object_set = set(self.objects)
+		self.roots = []
+		self.children = {}
+		self.collection_of = {}
+		self.collection_objects = {}
+		self.descendants = {}
+
+		for obj in self.objects:
+			parent = obj.parent
+			if parent is None:
+				self.roots.append(obj)
+			elif parent in self.object_set:
+				self.children.setdefault(parent, []).append(obj)
+
+			# Collections are kept in order of first use
+			collection_name = obj.users_collection[0].name
+			self.collection_of[obj] = collection_name
+			self.collection_objects.setdefault(collection_name, []).append(obj)
+
+	def children_recursive(self, obj):
+		"""All indexed descendants of obj"""
+		result = self.descendants.get(obj)
+		if result is None:
+			result = []
+			stack = list(reversed(self.children.get(obj, ())))
+			while stack:
+				child = stack.pop()
+				result.append(child)
+				stack.extend(reversed(self.children.get(child, ())))
+			self.descendants[obj] = result
+		return result
+
+	def select_hierarchy(self, obj, state=True):
+		obj.select_set(state)
+		for child in self.children_recursive(obj):
+			child.select_set(state)
+
+
+def clear_location(obj):
+	"""Move obj to the world origin like object.location_clear (locked axes are kept).
+
+	Plain property math, no view3d cursor operators, so it also works in
+	background mode. Returns the location to restore after the export.
+	"""
+	saved_location = obj.location.copy()
+	for axis in range(3):
+		if not obj.lock_location[axis]:
+			obj.location[axis] = 0.0
+	return saved_location
+
+
+@contextlib.contextmanager
+def use_scene(context, scene):
+	"""Make scene the context scene for the block.
+
+	With a window the window shows the scene (screen context members such as
+	selected_objects follow the window); without one (background mode) scene
+	and view layer are overridden. The previous scene and view layer are restored.
+	"""
+	window = context.window
+	if window is None:
+		with context.temp_override(scene=scene, view_layer=scene.view_layers[0]):
+			yield
+		return
+
+	previous_scene = window.scene
+	previous_view_layer = window.view_layer
+	window.scene = scene
+	try:
+		yield
+	finally:
+		window.scene = previous_scene
+		window.view_layer = previous_view_layer
+
+
+def remap_object_pointers(struct, mapping):
+	"""Point the Object properties of a modifier/constraint at the copies in mapping"""
+	for prop in struct.bl_rna.properties:
+		if prop.type != 'POINTER' or prop.is_readonly or prop.fixed_type.identifier != 'Object':
+			continue
+		target = getattr(struct, prop.identifier)
+		if target in mapping:
+			setattr(struct, prop.identifier, mapping[target])
+
+
+def deselect_objects():
+	"""Deselect only the selected objects (cheaper than select_all on big scenes)"""
+	for obj in bpy.context.selected_objects:
+		obj.select_set(False)
+
+
+class ExportSession(abc.ABC):
+	"""Runtime state of one FBX/OBJ/GLTF export run.
+
+	A run is split into phases: begin() saves the user state, plan_export()
+	checks the incremental cache, prepare() builds the objects that will be
+	exported, build_units() returns the export units (one file each, as
+	(label, callable) pairs) and finish() cleans up and restores the user state.
+	"""
+
+	def __init__(self, context, act, path):
+		self.context = context
+		self.act = act
+		self.path = path
+		self.incorrect_names = []
+		self.exp_objects = []
+		self.start_selected_obj = []
+		self.current_selected_obj = []
+		self.start_active_obj = None
+		self.cache = None
+		self.fingerprints = {}
+		self.unchanged_files = set()
+		self.index = None
+		self.profiler = export_profiler.ExportProfiler(enabled=False)
+
+	def begin(self):
+		# Save selected objects and active object
+		self.start_selected_obj = bpy.context.selected_objects
+		self.start_active_obj = bpy.context.active_object
+		current_selected_obj = bpy.context.selected_objects
+
+		# Check "Pivot Point Align" option, save start state and disable it
+		self.current_pivot_point_align = bpy.context.scene.tool_settings.use_transform_pivot_point_align
+		if self.current_pivot_point_align:
+			bpy.context.scene.tool_settings.use_transform_pivot_point_align = False
+
+		# Save cursor location and pivot point mode
+		self.saved_cursor_loc = bpy.context.scene.cursor.location.copy()
+		self.current_pivot_point = bpy.context.scene.tool_settings.transform_pivot_point
+
+		# Name for FBX is active object name (by default)
+		self.name = bpy.context.active_object.name
+
+		# Filtering selected objects. Exclude all not meshes, empties, armatures, curves and text
+		bpy.ops.object.select_all(action='DESELECT')
+		for x in current_selected_obj:
+			if x.type == 'MESH' or x.type == 'EMPTY' or x.type == 'ARMATURE' or x.type == 'CURVE' or x.type == 'FONT':
+				x.select_set(True)
+		self.current_selected_obj = bpy.context.selected_objects
+
+	def plan_units(self, index):
+		"""(export name, original objects) of every unit build_units() will export"""
+		act = self.act
 		if act.fbx_export_mode == 'ALL':
-			if act.set_custom_fbx_name:
-				if len(act.custom_fbx_name) == 0:
-					utils.show_message_box('Custom Name can\'t be empty',
-										   'Saving Error',
-										   'ERROR')
-					return {'CANCELLED'}
-
-		# Check saved blend file
-		if len(bpy.data.filepath) == 0 and not act.custom_export_path:
-			utils.show_message_box('Blend file is not saved. Try use Custom Export Path',
-								   'Saving Error',
-								   'ERROR')
-			return {'CANCELLED'}
-
-		if len(bpy.data.filepath) > 0 or act.custom_export_path:
-			path = ""
-
-			# Check export path
-			if len(bpy.data.filepath) > 0:
-				if act.export_format == 'FBX':
-					path = bpy.path.abspath('//FBXs/')
-				if act.export_format == 'OBJ':
-					path = bpy.path.abspath('//OBJs/')
-				if act.export_format == 'GLTF':
-					path = bpy.path.abspath('//GLTFs/')
-
-			if act.custom_export_path:
-				if len(act.export_path) == 0:
-					utils.show_message_box('Export Path can\'t be empty',
-										   'Saving Error',
-										   'ERROR')
-					return {'CANCELLED'}
+			name = act.custom_fbx_name if act.set_custom_fbx_name else self.name
+			return [(name, index.objects)]
+		if act.fbx_export_mode == 'INDIVIDUAL':
+			return [(x.name, [x]) for x in index.objects]
+		if act.fbx_export_mode == 'PARENT':
+			return [(x.name, [x] + index.children_recursive(x)) for x in index.roots]
+		if act.fbx_export_mode == 'COLLECTION':
+			return list(index.collection_objects.items())
+		return []
+
+	def plan_export(self):
+		"""Check the incremental cache on the original objects, before prepare().
+
+		Units are fingerprinted from their source objects and the export settings,
+		so unchanged units cost no duplicating or modifier evaluation. Only the
+		hierarchies (COLLECTION mode: the collections) of changed units stay
+		selected for prepare(). Returns False when nothing has to be exported.
+		"""
+		if self.cache is None:
+			return True
+
+		index = HierarchyIndex(self.current_selected_obj)
+		settings = {key: value for key, value in utils.property_group_to_dict(self.act).items()
+					if key not in CACHE_IGNORED_SETTINGS}
+		changed = set()
+		for prefilter_name, objects in self.plan_units(index):
+			name = utils.prefilter_export_name(prefilter_name)
+			op_name, export_args = utils.get_export_model_args(self.path, name)
+			if op_name is None:
+				continue
+			filepath = export_args['filepath']
+			with self.profiler.stage('cache_check', name):
+				fingerprint = export_cache.fingerprint_objects(objects, op_name, export_args, settings)
+				unchanged = self.cache.check(filepath, fingerprint)
+			if unchanged:
+				self.unchanged_files.add(filepath)
+			else:
+				self.fingerprints[filepath] = fingerprint
+				changed.update(objects)
+
+		if not changed:
+			return False
+
+		# Transforms (rotation fix) depend on the whole hierarchy, combined collections on the whole collection.
+		# Unchanged units pulled in here are prepared but not exported again
+		keep = set()
+		pending = list(changed)
+		while pending:
+			obj = pending.pop()
+			if obj in keep:
+				continue
+			keep.add(obj)
+			root = obj
+			while root.parent in index.object_set:
+				root = root.parent
+			pending.append(root)
+			pending.extend(index.children_recursive(root))
+			if self.act.fbx_export_mode == 'COLLECTION':
+				pending.extend(index.collection_objects[index.collection_of[obj]])
+
+		for obj in self.current_selected_obj:
+			if obj not in keep:
+				obj.select_set(False)
+		self.current_selected_obj = [obj for obj in self.current_selected_obj if obj in keep]
+		return True
+
+	def scene_context(self, context):
+		"""Context manager for prepare() and the export units (the user's scene by default)"""
+		return contextlib.nullcontext()
+
+	def prepare(self):
+		for step in self.prepare_steps():
+			pass
+
+	@abc.abstractmethod
+	def prepare_steps(self):
+		"""prepare() split into steps: yields after each chunk of work (mostly one
+		object), so the modal export can spread it over several timer ticks"""
+
+	@abc.abstractmethod
+	def build_units(self):
+		"""[(label, callable)], one export unit per output file"""
+
+	@abc.abstractmethod
+	def finish(self):
+		"""Remove temporary data and restore the user state (also after errors/cancel)"""
+
+	def restore_user_state(self):
+		# Select again original objects and set active object
+		bpy.ops.object.select_all(action='DESELECT')
+
+		for i in self.start_selected_obj:
+			i.select_set(True)
+
+		bpy.context.view_layer.objects.active = self.start_active_obj
+
+		# Restore "Pivot point align" option
+		bpy.context.scene.tool_settings.use_transform_pivot_point_align = self.current_pivot_point_align
+
+		# Restore cursor location and pivot point mode
+		bpy.context.scene.cursor.location = self.saved_cursor_loc
+		bpy.context.scene.tool_settings.transform_pivot_point = self.current_pivot_point
+
+	def export_named(self, prefilter_name):
+		"""Export the current selection to a file named after prefilter_name"""
+		# Replace invalid chars
+		name = utils.prefilter_export_name(prefilter_name)
+
+		if name != prefilter_name:
+			self.incorrect_names.append(prefilter_name)
+
+		op_name, export_args = utils.get_export_model_args(self.path, name)
+		if op_name is None:
+			return
 
-				if not os.path.exists(os.path.realpath(bpy.path.abspath(act.export_path))):
-					utils.show_message_box('Directory for export not exist',
-										   'Saving Error',
-										   'ERROR')
-					return {'CANCELLED'}
-				else:
-					path = os.path.realpath(bpy.path.abspath(act.export_path)) + '/'
+		# Skip unchanged files (found by plan_export, incremental export)
+		filepath = export_args['filepath']
+		if filepath in self.unchanged_files:
+			return
 
-			# Create export folder (if this need)
-			if not os.path.exists(path):
-				os.makedirs(path)
+		# Export FBX/OBJ/GLTF
+		with self.profiler.stage('export', name):
+			utils.run_export_operator(op_name, export_args)
+
+		fingerprint = self.fingerprints.get(filepath)
+		if self.cache is not None and fingerprint is not None:
+			self.cache.record(filepath, fingerprint)
+
+
+# Export engine: duplicate selected objects and prepare the copies with operators
+class DuplicateExportSession(ExportSession):
+
+	def __init__(self, context, act, path):
+		super().__init__(context, act, path)
+		# session_uid of meshes created for the export (removed in finish)
+		self.duplicated_data = set()
+		self.original_data = set()
+		self.combined_meshes = []
+		self.renamed = False
+
+	def rename_originals(self):
+		# Added suffix _ex to all selected objects. Also add _ex to mesh data and armature name
+		for obj in self.current_selected_obj:
+			obj.name += "_ex"
+			if obj.type == 'MESH' or obj.type == 'ARMATURE':
+				obj.data.name += "_ex"
+		self.renamed = True
+
+	def restore_original_names(self):
+		# Restore names of objects (remove "_ex" from name)
+		if self.renamed:
+			for j in self.current_selected_obj:
+				if j.name.endswith("_ex"):
+					j.name = j.name[:-3]
+				if (j.type == 'MESH' or j.type == 'ARMATURE') and j.data.name.endswith("_ex"):
+					j.data.name = j.data.name[:-3]
+			self.renamed = False
 
-			# Save selected objects and active object
-			start_selected_obj = bpy.context.selected_objects
-			start_active_obj = bpy.context.active_object
-			current_selected_obj = bpy.context.selected_objects
+	def duplicate_objects(self):
+		"""Copy the selected objects, returns the copies (selected)"""
+		self.rename_originals()
+		with self.profiler.stage('duplicate'):
+			bpy.ops.object.duplicate()
+		return bpy.context.selected_objects
 
-			# Check "Pivot Point Align" option, save start state and disable it
-			current_pivot_point_align = bpy.context.scene.tool_settings.use_transform_pivot_point_align
-			if current_pivot_point_align:
-				bpy.context.scene.tool_settings.use_transform_pivot_point_align = False
+	def track_duplicated_data(self, objects):
+		"""Remember the copied meshes right away, so a cancelled prepare still removes them"""
+		for obj in objects:
+			if obj.type == 'MESH' and obj.data.session_uid not in self.original_data:
+				self.duplicated_data.add(obj.data.session_uid)
 
-			# Save cursor location and pivot point mode
-			saved_cursor_loc = bpy.context.scene.cursor.location.copy()
-			current_pivot_point = bpy.context.scene.tool_settings.transform_pivot_point
+	def prepare_steps(self):
+		act = self.act
 
-			# Name for FBX is active object name (by default)
-			name = bpy.context.active_object.name
+		# Data of the originals is never removed, even if the copies share it
+		self.original_data = {obj.data.session_uid for obj in self.current_selected_obj if obj.data is not None}
 
-			# Filtering selected objects. Exclude all not meshes, empties, armatures, curves and text
-			bpy.ops.object.select_all(action='DESELECT')
-			for x in current_selected_obj:
-				if x.type == 'MESH' or x.type == 'EMPTY' or x.type == 'ARMATURE' or x.type == 'CURVE' or x.type == 'FONT':
-					x.select_set(True)
-			current_selected_obj = bpy.context.selected_objects
-
-			# Added suffix _ex to all selected objects. Also add _ex to mesh data and armature name
-			for obj in current_selected_obj:
-				obj.name += "_ex"
-				if obj.type == 'MESH' or obj.type == 'ARMATURE':
-					obj.data.name += "_ex"
-
-			# Make copies. These copies will be exported
-			bpy.ops.object.duplicate()
-			exp_objects = bpy.context.selected_objects
+		# Make copies (named <name>_ex.001). These copies will be exported
+		exp_objects = self.duplicate_objects()
+		self.exp_objects = exp_objects
+		self.track_duplicated_data(exp_objects)
+		yield
 
+		with self.profiler.stage('make_single_user'):
 			if act.export_target_engine == 'UNITY2023' and act.export_format == 'FBX':
 				if act.export_combine_meshes:
 					bpy.ops.object.make_single_user(type='SELECTED_OBJECTS', object=True, obdata=True)
 			else:
 				bpy.ops.object.make_single_user(type='SELECTED_OBJECTS', object=True, obdata=True)
+		self.track_duplicated_data(exp_objects)
+		yield
 
-			# Convert all non-mesh objects to mesh (except empties)
-			for obj in exp_objects:
+		# Convert all non-mesh objects to mesh (except empties)
+		for obj in exp_objects:
+			with self.profiler.stage('modifier_apply', obj.name[:-7]):
 				bpy.ops.object.select_all(action='DESELECT')
 				obj.select_set(True)
 				bpy.context.view_layer.objects.active = obj
@@ -142,417 +412,1086 @@ class MultiExport(bpy.types.Operator):
 									bpy.ops.object.modifier_remove(modifier=modifier.name)
 					elif obj.type != 'EMPTY':
 						bpy.ops.object.convert(target='MESH')
-			# Delete _ex.001 suffix from object names.
-			# Mesh name and armature name is object name
-			for obj in exp_objects:
-				obj.name = obj.name[:-7]
-				if obj.type == 'MESH' or obj.type == 'ARMATURE':
-					obj.data.name = obj.name
-
-			# Delete all materials (Optional)
-			if act.delete_mats_before_export:
-				for o in exp_objects:
-					if o.type == 'MESH' and len(o.data.materials) > 0:
-						for q in reversed(range(len(o.data.materials))):
-							bpy.context.object.active_material_index = q
-							o.data.materials.pop(index=q)
-
-			# Triangulate meshes (Optional)
-			if act.triangulate_before_export:
-				for o in exp_objects:
-					if o.type == 'MESH':
-						bpy.ops.object.select_all(action='DESELECT')
-						o.select_set(True)
-						bpy.context.view_layer.objects.active = o
-						bpy.ops.object.mode_set(mode='EDIT')
-						bpy.ops.mesh.reveal()
-						bpy.ops.mesh.select_all(action='SELECT')
-						bpy.ops.mesh.quads_convert_to_tris(quad_method='BEAUTY', ngon_method='BEAUTY')
-						bpy.ops.mesh.select_all(action='DESELECT')
-						bpy.ops.object.mode_set(mode='OBJECT')
-
-			# Select all exported objects
-			for obj in exp_objects:
-				obj.select_set(True)
-
-			# Apply Scale and Rotation for UNITY2023 Export or GLTF
-			# Processing only objects without linked data
-			if (act.export_target_engine == 'UNITY2023' and act.export_format == 'FBX') or act.export_format == 'GLTF':
+			# Converted curves/text get a new mesh
+			self.track_duplicated_data([obj])
+			yield
+
+		# Delete _ex.001 suffix from object names.
+		# Mesh name and armature name is object name
+		for obj in exp_objects:
+			obj.name = obj.name[:-7]
+			if obj.type == 'MESH' or obj.type == 'ARMATURE':
+				obj.data.name = obj.name
+
+		# Delete all materials (Optional)
+		if act.delete_mats_before_export:
+			for o in exp_objects:
+				if o.type == 'MESH' and len(o.data.materials) > 0:
+					for q in reversed(range(len(o.data.materials))):
+						bpy.context.object.active_material_index = q
+						o.data.materials.pop(index=q)
+
+		# Triangulate meshes (Optional)
+		if act.triangulate_before_export:
+			for o in exp_objects:
+				if o.type == 'MESH':
+					with self.profiler.stage('triangulate', o.name):
+						utils.triangulate_mesh_data(o.data)
+					yield
+
+		# Select all exported objects
+		for obj in exp_objects:
+			obj.select_set(True)
+
+		# Children of the duplicates are always duplicates too
+		self.index = HierarchyIndex(exp_objects)
+		apply_export_transforms(act, exp_objects, self.index, profiler=self.profiler)
+
+		bpy.ops.object.select_all(action='DESELECT')
+
+		# Select exported objects
+		for x in exp_objects:
+			if x.type == 'MESH' or x.type == 'EMPTY' or x.type == 'ARMATURE':
+				x.select_set(True)
+
+	def build_units(self):
+		act = self.act
+
+		# Export all as one fbx
+		if act.fbx_export_mode == 'ALL':
+			return [('ALL', self.export_all)]
+
+		# Individual Export
+		if act.fbx_export_mode == 'INDIVIDUAL':
+			return [(x.name, lambda x=x: self.export_individual(x)) for x in self.exp_objects]
+
+		# Export by parents (only top level parents)
+		if act.fbx_export_mode == 'PARENT':
+			return [(x.name, lambda x=x: self.export_parent(x)) for x in self.index.roots]
+
+		# Export by collection
+		if act.fbx_export_mode == 'COLLECTION':
+			bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
+			# Object lists are copied, combining meshes removes objects
+			self.collection_objects = {c: list(objects) for c, objects in self.index.collection_objects.items()}
+			return [(c, lambda c=c: self.export_collection(c)) for c in self.collection_objects]
+
+		return []
+
+	def export_all(self):
+		act = self.act
+
+		# Combine All Meshes (Optional)
+		if act.export_combine_meshes:
+			# If parent object is mesh
+			# combine all children to parent object
+			if self.start_active_obj.type == 'MESH':
+				bpy.context.view_layer.objects.active = self.start_active_obj
+				with self.profiler.stage('join'):
+					bpy.ops.object.join()
+			# If  parent is empty
+			else:
 				current_active = bpy.context.view_layer.objects.active
-				bpy.ops.object.select_all(action='DESELECT')
-				for x in exp_objects:
-					if (x.type == 'MESH' and x.data.users < 2) or x.type != 'MESH':
-						bpy.context.view_layer.objects.active = x
-						x.select_set(True)
-				bpy.ops.object.transform_apply(location=False, rotation=act.apply_rot, scale=act.apply_scale)
+				# Combine all child meshes to first in list
+				for obj in self.exp_objects:
+					if obj.type == 'MESH':
+						bpy.context.view_layer.objects.active = obj
+				with self.profiler.stage('join'):
+					bpy.ops.object.join()
 				bpy.context.view_layer.objects.active = current_active
-			else:
-				# Apply scale
-				bpy.ops.object.transform_apply(location=False, rotation=False, scale=act.apply_scale)
-				# Rotation Fix. Rotate X -90, Apply, Rotate X 90
-				if act.apply_rot:
-					bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
-
-					# Operate only with higher level parents
-					for x in exp_objects:
-						bpy.ops.object.select_all(action='DESELECT')
-
-						if x.parent is None:
-							x.select_set(True)
-							bpy.context.view_layer.objects.active = x
-
-							# Check object has any rotation
-							# for option "Apply for Rotated Objects"
-							child_rotated = False
-							bpy.ops.object.select_grouped(extend=True, type='CHILDREN_RECURSIVE')
-							for y in bpy.context.selected_objects:
-								if abs(y.rotation_euler.x) + abs(y.rotation_euler.y) + abs(y.rotation_euler.z) > 0.017:
-									child_rotated = True
-
-							bpy.ops.object.select_all(action='DESELECT')
-							x.select_set(True)
-
-							# X-rotation fix
-							if act.export_format == 'FBX' and (act.apply_rot_rotated
-															   or (not act.apply_rot_rotated and not child_rotated)
-															   or not act.fbx_export_mode == 'PARENT'):
-								bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
-								bpy.ops.transform.rotate(
-									value=(math.pi * -90 / 180), orient_axis='X',
-									orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-									orient_type='GLOBAL', constraint_axis=(True, False, False),
-									orient_matrix_type='GLOBAL', mirror=False,
-									use_proportional_edit=False, proportional_edit_falloff='SMOOTH',
-									proportional_size=1)
-								bpy.ops.object.select_grouped(extend=True, type='CHILDREN_RECURSIVE')
-								bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
-								bpy.ops.object.select_all(action='DESELECT')
-								x.select_set(True)
-								bpy.ops.transform.rotate(
-									value=(math.pi * 90 / 180), orient_axis='X',
-									orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-									orient_type='GLOBAL', constraint_axis=(True, False, False),
-									orient_matrix_type='GLOBAL', mirror=False,
-									use_proportional_edit=False, proportional_edit_falloff='SMOOTH',
-									proportional_size=1)
 
-			bpy.ops.object.select_all(action='DESELECT')
+			self.exp_objects = bpy.context.selected_objects
 
-			# Select exported objects
-			for x in exp_objects:
-				if x.type == 'MESH' or x.type == 'EMPTY' or x.type == 'ARMATURE':
-					x.select_set(True)
+		# Set custom fbx/obj name (Optional)
+		if act.set_custom_fbx_name:
+			prefilter_name = act.custom_fbx_name
+		else:
+			prefilter_name = self.name
 
-			# Store duplicated data for cleanUp
-			duplicated_data = []
-			for obj in exp_objects:
-				if obj.type == 'MESH':
-					duplicated_data.append(obj.data.name)
+		self.export_named(prefilter_name)
 
-			# Export all as one fbx
-			if act.fbx_export_mode == 'ALL':
-				# Combine All Meshes (Optional)
-				if act.export_combine_meshes:
-					# If parent object is mesh
-					# combine all children to parent object
-					if start_active_obj.type == 'MESH':
-						bpy.context.view_layer.objects.active = start_active_obj
-						bpy.ops.object.join()
-					# If  parent is empty
-					else:
-						current_active = bpy.context.view_layer.objects.active
-						# Combine all child meshes to first in list
-						for obj in exp_objects:
-							if obj.type == 'MESH':
-								bpy.context.view_layer.objects.active = obj
-						bpy.ops.object.join()
-						bpy.context.view_layer.objects.active = current_active
+	def export_individual(self, x):
+		act = self.act
 
-					exp_objects = bpy.context.selected_objects
+		object_loc = None
+		bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
+		# Select only current object
+		deselect_objects()
+		x.select_set(True)
+		bpy.context.view_layer.objects.active = x
 
-				# Set custom fbx/obj name (Optional)
-				if act.set_custom_fbx_name:
-					prefilter_name = act.custom_fbx_name
-				else:
-					prefilter_name = name
+		# Apply Location - Center of fbx is origin of object (Optional)
+		if act.apply_loc:
+			# Move object to center of world
+			object_loc = clear_location(x)
+		# Center of fbx is center of the world
+		else:
+			bpy.context.scene.cursor.location = (0.0, 0.0, 0.0)
+			bpy.context.scene.tool_settings.transform_pivot_point = 'CURSOR'
+
+		self.export_named(x.name)
+
+		# Restore object location
+		if object_loc is not None:
+			x.location = object_loc
+
+	def export_parent(self, x):
+		act = self.act
+
+		deselect_objects()
+		bpy.context.view_layer.objects.active = x
+		x.select_set(True)
+		# Combine All Meshes (Optional)
+		if act.export_combine_meshes:
+			# If parent object is mesh
+			# combine all children to parent object
+			if x.type == 'MESH':
+				bpy.ops.object.select_grouped(extend=True, type='CHILDREN_RECURSIVE')
+				with self.profiler.stage('join'):
+					bpy.ops.object.join()
+
+				# CleanUp Empties without Children
+				selected_objects_for_cleanup = bpy.context.selected_objects
+				for obj in selected_objects_for_cleanup:
+					if obj.type == "EMPTY" and len(obj.children) == 0:
+						bpy.data.objects.remove(obj, do_unlink=True)
+
+			# If  parent is not Mesh
+			else:
+				current_active = bpy.context.view_layer.objects.active
+				parent_loc = current_active.location.copy()
+				parent_name = current_active.name
 
-				# Replace invalid chars
-				name = utils.prefilter_export_name(prefilter_name)
+				# Select all children
+				bpy.ops.object.select_grouped(extend=False, type='CHILDREN_RECURSIVE')
+				group_selected_objects = bpy.context.selected_objects
 
-				if name != prefilter_name:
-					incorrect_names.append(prefilter_name)
+				# Combine all child meshes to first in list
+				for obj in group_selected_objects:
+					if obj.type == 'MESH':
+						bpy.context.view_layer.objects.active = obj
+				with self.profiler.stage('join'):
+					bpy.ops.object.join()
 
-				# Export FBX/OBJ/GLTF
-				utils.export_model(path, name)
+				bpy.context.view_layer.objects.active.name = parent_name + '_Mesh'
 
-			# Individual Export
-			if act.fbx_export_mode == 'INDIVIDUAL':
-				for x in exp_objects:
-					object_loc = (0.0, 0.0, 0.0)
-					bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
-					# Select only current object
-					bpy.ops.object.select_all(action='DESELECT')
-					x.select_set(True)
-					bpy.context.view_layer.objects.active = x
-
-					# Apply Location - Center of fbx is origin of object (Optional)
-					if act.apply_loc:
-						# Copy object location
-						bpy.ops.view3d.snap_cursor_to_selected()
-						object_loc = bpy.context.scene.cursor.location.copy()
-						# Move object to center of world
-						bpy.ops.object.location_clear(clear_delta=False)
-					# Center of fbx is center of the world
-					else:
-						bpy.ops.view3d.snap_cursor_to_center()
-						bpy.context.scene.tool_settings.transform_pivot_point = 'CURSOR'
-					prefilter_name = x.name
+				# Parent Combined mesh back
+				current_active.select_set(True)
+				bpy.context.view_layer.objects.active = current_active
+				bpy.ops.object.parent_set(type='OBJECT', keep_transform=True)
 
-					# Replace invalid chars
-					name = utils.prefilter_export_name(prefilter_name)
+				selected_objects_for_cleanup = bpy.context.selected_objects
 
-					if name != prefilter_name:
-						incorrect_names.append(prefilter_name)
+				# Move Origin to Parent
+				bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
+				bpy.context.scene.cursor.location = parent_loc
+				bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
 
-					# Export FBX/OBJ/GLTF
-					utils.export_model(path, name)
+				# CleanUp Empties without Children
+				for obj in selected_objects_for_cleanup:
+					if obj.type == "EMPTY" and len(obj.children) == 0:
+						bpy.data.objects.remove(obj, do_unlink=True)
 
-					# Restore object location
-					if act.apply_loc:
-						bpy.context.scene.cursor.location = object_loc
-						bpy.ops.view3d.snap_selected_to_cursor(use_offset=True)
+				bpy.context.view_layer.objects.active = current_active
 
-			combined_meshes = []
+		current_parent = bpy.context.view_layer.objects.active
 
-			# Export by parents
-			if act.fbx_export_mode == 'PARENT':
-				bpy.ops.object.select_all(action='DESELECT')
+		object_loc = None
+		bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
+		# Select only current object
+		deselect_objects()
 
-				# Select only top level parents
-				for x in exp_objects:
-					if x.parent is None:
-						x.select_set(True)
-
-				parent_objs = bpy.context.selected_objects
-
-				for x in parent_objs:
-					bpy.ops.object.select_all(action='DESELECT')
-					bpy.context.view_layer.objects.active = x
-					x.select_set(True)
-					# Combine All Meshes (Optional)
-					if act.export_combine_meshes:
-						# If parent object is mesh
-						# combine all children to parent object
-						if x.type == 'MESH':
-							bpy.ops.object.select_grouped(extend=True, type='CHILDREN_RECURSIVE')
-							bpy.ops.object.join()
-
-							# CleanUp Empties without Children
-							selected_objects_for_cleanup = bpy.context.selected_objects
-							for obj in selected_objects_for_cleanup:
-								if obj.type == "EMPTY" and len(obj.children) == 0:
-									bpy.data.objects.remove(obj, do_unlink=True)
-
-						# If  parent is not Mesh
-						else:
-							current_active = bpy.context.view_layer.objects.active
-							parent_loc = current_active.location.copy()
-							parent_name = current_active.name
+		current_parent.select_set(True)
+		bpy.context.view_layer.objects.active = current_parent
 
-							# Select all children
-							bpy.ops.object.select_grouped(extend=False, type='CHILDREN_RECURSIVE')
-							group_selected_objects = bpy.context.selected_objects
+		if act.apply_loc:
+			# Move object to center
+			object_loc = clear_location(current_parent)
+		else:
+			bpy.context.scene.cursor.location = (0.0, 0.0, 0.0)
+			bpy.context.scene.tool_settings.transform_pivot_point = 'CURSOR'
+
+		# Name is name of parent
+		prefilter_name = current_parent.name
+		# Select Parent and his children.
+		# Joining changes the hierarchy, so combined parents still use the operator
+		if act.export_combine_meshes:
+			bpy.ops.object.select_grouped(extend=True, type='CHILDREN_RECURSIVE')
+		else:
+			self.index.select_hierarchy(current_parent)
 
-							# Combine all child meshes to first in list
-							for obj in group_selected_objects:
-								if obj.type == 'MESH':
-									bpy.context.view_layer.objects.active = obj
-							bpy.ops.object.join()
+		# Store objects after combine for future cleanup
+		if act.export_combine_meshes:
+			for obj in bpy.context.selected_objects:
+				self.combined_meshes.append(obj)
 
-							bpy.context.view_layer.objects.active.name = parent_name + '_Mesh'
+		self.export_named(prefilter_name)
+		deselect_objects()
+		current_parent.select_set(True)
 
-							# Parent Combined mesh back
-							current_active.select_set(True)
-							bpy.context.view_layer.objects.active = current_active
-							bpy.ops.object.parent_set(type='OBJECT', keep_transform=True)
+		# Restore object location
+		if object_loc is not None:
+			current_parent.location = object_loc
 
-							selected_objects_for_cleanup = bpy.context.selected_objects
+	def export_collection(self, c):
+		act = self.act
+		origin_loc = (0.0, 0.0, 0.0)
 
-							# Move Origin to Parent
-							bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
-							bpy.context.scene.cursor.location = parent_loc
-							bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
+		deselect_objects()
 
-							# CleanUp Empties without Children
-							for obj in selected_objects_for_cleanup:
-								if obj.type == "EMPTY" and len(obj.children) == 0:
-									bpy.data.objects.remove(obj, do_unlink=True)
+		# Select Objects in Collection
+		set_active_mesh = False
+		for obj in self.collection_objects[c]:
+			obj.select_set(True)
+			if obj.type == 'MESH' and not set_active_mesh:
+				bpy.context.view_layer.objects.active = obj
+				if act.export_combine_meshes:
+					obj.name = c
+				set_active_mesh = True
 
-							bpy.context.view_layer.objects.active = current_active
+		if act.export_combine_meshes and set_active_mesh:
+			with self.profiler.stage('join'):
+				bpy.ops.object.join()
 
-					current_parent = bpy.context.view_layer.objects.active
+			# Move Origin to Parent
+			bpy.context.scene.cursor.location = origin_loc
+			bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
 
-					object_loc = (0.0, 0.0, 0.0)
-					bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
-					# Select only current object
-					bpy.ops.object.select_all(action='DESELECT')
+			# CleanUp Empties without Children
+			selected_objects_for_cleanup = bpy.context.selected_objects
+			for obj in selected_objects_for_cleanup:
+				if obj.type == "EMPTY" and len(obj.children) == 0:
+					bpy.data.objects.remove(obj, do_unlink=True)
 
-					current_parent.select_set(True)
-					bpy.context.view_layer.objects.active = current_parent
+		# Store objects after combine for future cleanup
+		if act.export_combine_meshes:
+			for obj in bpy.context.selected_objects:
+				self.combined_meshes.append(obj)
 
-					if act.apply_loc:
-						# Copy object location
-						bpy.ops.view3d.snap_cursor_to_selected()
-						object_loc = bpy.context.scene.cursor.location.copy()
-						# Move object to center
-						bpy.ops.object.location_clear(clear_delta=False)
-					else:
-						bpy.ops.view3d.snap_cursor_to_center()
-						bpy.context.scene.tool_settings.transform_pivot_point = 'CURSOR'
-
-					# Name is name of parent
-					prefilter_name = current_parent.name
-					# Select Parent and his children
-					bpy.ops.object.select_grouped(extend=True, type='CHILDREN_RECURSIVE')
-
-					# Replace invalid chars
-					name = utils.prefilter_export_name(prefilter_name)
-
-					if name != prefilter_name:
-						incorrect_names.append(prefilter_name)
-
-					# Store objects after combine for future cleanup
-					if act.export_combine_meshes:
-						for obj in bpy.context.selected_objects:
-							combined_meshes.append(obj)
-
-					# Export FBX/OBJ/GLTF
-					utils.export_model(path, name)
-					bpy.ops.object.select_all(action='DESELECT')
-					current_parent.select_set(True)
-
-					# Restore object location
-					if act.apply_loc:
-						bpy.context.scene.cursor.location = object_loc
-						bpy.ops.view3d.snap_selected_to_cursor(use_offset=True)
-
-			# Export by collection
-			if act.fbx_export_mode == 'COLLECTION':
-				used_collections = []
-				origin_loc = (0.0, 0.0, 0.0)
-				bpy.context.scene.tool_settings.transform_pivot_point = 'MEDIAN_POINT'
-				obj_col_dict = {}
-				# Collect used collections for selected objects
-				for x in exp_objects:
-					collection_in_list = False
-
-					for c in used_collections:
-						if x.users_collection[0].name == c:
-							collection_in_list = True
-
-					if collection_in_list is False:
-						used_collections.append(x.users_collection[0].name)
-
-					obj_col_dict[x] = x.users_collection[0].name
-
-				# Select objects by collection and export
-				for c in used_collections:
-					bpy.ops.object.select_all(action='DESELECT')
-
-					# Select Objects in Collection
-					set_active_mesh = False
-					for obj, col_name in obj_col_dict.items():
-						if col_name == c:
-							obj.select_set(True)
-							if obj.type == 'MESH' and not set_active_mesh:
-								bpy.context.view_layer.objects.active = obj
-								if act.export_combine_meshes:
-									obj.name = c
-								set_active_mesh = True
-
-					if act.export_combine_meshes and set_active_mesh:
-						bpy.ops.object.join()
-
-						# Move Origin to Parent
-						bpy.context.scene.cursor.location = origin_loc
-						bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
-
-						# CleanUp Empties without Children
-						selected_objects_for_cleanup = bpy.context.selected_objects
-						for obj in selected_objects_for_cleanup:
-							if obj.type == "EMPTY" and len(obj.children) == 0:
-								bpy.data.objects.remove(obj, do_unlink=True)
-
-					# Replace invalid chars
-					name = utils.prefilter_export_name(c)
-
-					if name != c:
-						incorrect_names.append(c)
-
-					# Store objects after combine for future cleanup
-					if act.export_combine_meshes:
-						for obj in bpy.context.selected_objects:
-							combined_meshes.append(obj)
-
-					# Export FBX/OBJ/GLTF
-					utils.export_model(path, name)
+		self.export_named(c)
 
-				bpy.ops.object.select_all(action='DESELECT')
+	def finish(self):
+		act = self.act
 
+		with self.profiler.stage('cleanup'):
 			if act.export_combine_meshes and (act.fbx_export_mode == 'PARENT' or act.fbx_export_mode == 'COLLECTION'):
-				exp_objects = combined_meshes
+				self.exp_objects = self.combined_meshes
 
 			bpy.ops.object.select_all(action='DESELECT')
 
-			for obj in exp_objects:
+			for obj in self.exp_objects:
 				obj.select_set(True)
 
 			# Delete duplicates and cleanup
 			bpy.ops.object.delete()
 
-			for data_name in duplicated_data:
-				try:
-					bpy.data.meshes.remove(bpy.data.meshes[data_name])
-				except:
-					continue
+			# Meshes of deleted copies (also the ones joined away) have no users left
+			bpy.data.batch_remove([mesh for mesh in bpy.data.meshes
+								   if mesh.session_uid in self.duplicated_data and mesh.users == 0])
+
+			self.restore_original_names()
+
+		self.restore_user_state()
+
+
+# Export engine of the isolated export: the copies are made with the data API in
+# a scratch scene, prepared and exported there, and the scene is removed as a whole.
+# The originals are only renamed for the run (exported objects keep their names)
+class IsolatedExportSession(DuplicateExportSession):
+
+	def __init__(self, context, act, path):
+		super().__init__(context, act, path)
+		self.scene = None
+		self.copies = {}
+		# session_uid of the copied objects and data
+		self.temp_ids = set()
+
+	def begin(self):
+		super().begin()
+		# Exporters read units, frame range and PopTools settings from the context scene
+		source = bpy.context.scene
+		self.scene = bpy.data.scenes.new(ISOLATED_SCENE_NAME)
+		utils.apply_scene_settings(self.scene, utils.scene_settings_to_dict(source))
+		utils.dict_to_property_group(self.scene.poptools_props.export_tools_settings,
+									 utils.property_group_to_dict(self.act))
+
+	def scene_context(self, context):
+		return use_scene(context, self.scene)
+
+	def duplicate_objects(self):
+		"""Copy the selected objects into the scratch scene (shared data stays shared,
+		parents and modifier targets point at the copies, like object.duplicate)"""
+		self.rename_originals()
+		data_copies = {}
+		with self.profiler.stage('duplicate'):
+			for obj in self.current_selected_obj:
+				copy = obj.copy()
+				if obj.data is not None:
+					key = obj.data.session_uid
+					if key not in data_copies:
+						data_copies[key] = obj.data.copy()
+						self.temp_ids.add(data_copies[key].session_uid)
+					copy.data = data_copies[key]
+				self.scene.collection.objects.link(copy)
+				self.temp_ids.add(copy.session_uid)
+				self.copies[obj] = copy
+
+			for obj, copy in self.copies.items():
+				if obj.parent in self.copies:
+					matrix_parent_inverse = copy.matrix_parent_inverse.copy()
+					copy.parent = self.copies[obj.parent]
+					copy.matrix_parent_inverse = matrix_parent_inverse
+				for struct in list(copy.modifiers) + list(copy.constraints):
+					remap_object_pointers(struct, self.copies)
+
+		deselect_objects()
+		for copy in self.copies.values():
+			copy.select_set(True)
+		active = self.copies.get(self.start_active_obj)
+		if active is not None:
+			bpy.context.view_layer.objects.active = active
+		return list(self.copies.values())
+
+	def export_all(self):
+		# The original active object is not in the scratch scene, its copy is
+		start_active_obj = self.start_active_obj
+		self.start_active_obj = self.copies.get(start_active_obj, start_active_obj)
+		try:
+			super().export_all()
+		finally:
+			self.start_active_obj = start_active_obj
+
+	def finish(self):
+		with self.profiler.stage('cleanup'):
+			if self.scene is not None:
+				# Copies, data made by convert/join and the scene itself go together
+				temp_ids = self.temp_ids | self.duplicated_data | {self.scene.session_uid}
+				for obj in self.scene.objects:
+					temp_ids.add(obj.session_uid)
+					if obj.data is not None and obj.data.session_uid not in self.original_data:
+						temp_ids.add(obj.data.session_uid)
+				bpy.data.batch_remove([id_data for collection in ISOLATED_ID_COLLECTIONS
+									   for id_data in getattr(bpy.data, collection)
+									   if id_data.session_uid in temp_ids])
+				self.scene = None
+
+			self.restore_original_names()
+
+		self.restore_user_state()
+
+
+# Export engine: export the original objects with evaluated temporary data.
+# No objects are duplicated and no object is renamed
+class DepsgraphExportSession(ExportSession):
+
+	def __init__(self, context, act, path):
+		super().__init__(context, act, path)
+		self.saved_data = []
+		self.saved_modifiers = []
+		self.saved_matrices = {}
+		self.saved_empty_sizes = {}
+		self.temp_data = []
+		self.renamed_data = []
+
+	@staticmethod
+	def is_supported(act, objects):
+		"""Combine meshes and curve/text conversion need real duplicates"""
+		if act.export_combine_meshes:
+			return False
+		return not any(obj.type in {'CURVE', 'FONT'} for obj in objects)
+
+	def prepare_steps(self):
+		act = self.act
+		self.exp_objects = list(self.current_selected_obj)
+		self.index = HierarchyIndex(self.exp_objects)
+
+		# Save transforms of exported objects and their children.
+		# Applying transforms to a parent compensates its children
+		for obj in self.exp_objects:
+			for x in [obj] + list(obj.children_recursive):
+				if x not in self.saved_matrices:
+					self.saved_matrices[x] = (x.matrix_basis.copy(), x.matrix_parent_inverse.copy())
+				if x.type == 'EMPTY' and x not in self.saved_empty_sizes:
+					# Applying scale changes empty display size
+					self.saved_empty_sizes[x] = x.empty_display_size
+
+		# Linked data is left as is for Unity 2023 (same as duplicate engine)
+		keep_linked = act.export_target_engine == 'UNITY2023' and act.export_format == 'FBX'
+		meshes = [obj for obj in self.exp_objects if obj.type == 'MESH'
+				  and not (keep_linked and obj.data.users > 1)]
+
+		# Disabled modifiers are not exported, Armature modifiers stay live.
+		# Everything else is baked into the evaluated mesh
+		for obj in meshes:
+			for modifier in obj.modifiers:
+				self.saved_modifiers.append((modifier, modifier.show_viewport, modifier.show_render))
+				if modifier.type == 'ARMATURE' or not (modifier.show_viewport and modifier.show_render):
+					modifier.show_viewport = False
+
+		depsgraph = bpy.context.evaluated_depsgraph_get()
+		depsgraph.update()
+
+		# Add suffix _ex to the original mesh/armature data (as the duplicate engine does),
+		# so the temporary data can take the object name without a ".001" suffix
+		for obj in meshes + [obj for obj in self.exp_objects if obj.type == 'ARMATURE']:
+			self.rename_original_data(obj.data)
+
+		for obj in meshes:
+			with self.profiler.stage('evaluate', obj.name):
+				if obj.data.shape_keys:
+					# Modifiers can't be applied to meshes with shape keys, they are dropped
+					data = obj.data.copy()
+				else:
+					data = bpy.data.meshes.new_from_object(
+						obj.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+				data.name = obj.name
+				self.swap_data(obj, data)
+			yield
+
+		for obj in self.exp_objects:
+			if obj.type == 'ARMATURE':
+				data = obj.data.copy()
+				data.name = obj.name
+				self.swap_data(obj, data)
+
+		# Only Armature modifiers remain active on the exported objects
+		for modifier, show_viewport, show_render in self.saved_modifiers:
+			if modifier.type == 'ARMATURE':
+				modifier.show_viewport = show_viewport
+			else:
+				modifier.show_viewport = False
+				modifier.show_render = False
+
+		# Delete all materials (Optional)
+		if act.delete_mats_before_export:
+			for o in meshes:
+				o.data.materials.clear()
+
+		# Triangulate meshes (Optional)
+		if act.triangulate_before_export:
+			for o in meshes:
+				with self.profiler.stage('triangulate', o.name):
+					utils.triangulate_mesh_data(o.data)
+				yield
+
+		bpy.ops.object.select_all(action='DESELECT')
+		for obj in self.exp_objects:
+			if obj.type != 'MESH' or obj.data.users < 2:
+				obj.select_set(True)
 
-			# Select again original objects and set active object
-			bpy.ops.object.select_all(action='DESELECT')
+		apply_export_transforms(act, self.exp_objects, self.index, profiler=self.profiler)
 
-			# Restore names of objects (remove "_ex" from name)
-			for j in current_selected_obj:
-				j.name = j.name[:-3]
-				if j.type == 'MESH' or j.type == 'ARMATURE':
-					j.data.name = j.data.name[:-3]
+		bpy.ops.object.select_all(action='DESELECT')
+
+	def rename_original_data(self, data):
+		if any(renamed.session_uid == data.session_uid for renamed, name in self.renamed_data):
+			return
+		self.renamed_data.append((data, data.name))
+		data.name += "_ex"
+
+	def swap_data(self, obj, data):
+		self.saved_data.append((obj, obj.data))
+		self.temp_data.append(data)
+		obj.data = data
+
+	def build_units(self):
+		act = self.act
+
+		if act.fbx_export_mode == 'ALL':
+			return [('ALL', self.export_all)]
+
+		if act.fbx_export_mode == 'INDIVIDUAL':
+			return [(x.name, lambda x=x: self.export_individual(x)) for x in self.exp_objects]
+
+		if act.fbx_export_mode == 'PARENT':
+			return [(x.name, lambda x=x: self.export_parent(x)) for x in self.index.roots]
+
+		if act.fbx_export_mode == 'COLLECTION':
+			return [(c, lambda c=c: self.export_collection(c)) for c in self.index.collection_objects]
+
+		return []
+
+	def select_exportable(self, objects):
+		deselect_objects()
+		for x in objects:
+			if x.type == 'MESH' or x.type == 'EMPTY' or x.type == 'ARMATURE':
+				x.select_set(True)
+
+	def export_all(self):
+		act = self.act
+		self.select_exportable(self.exp_objects)
+
+		if act.set_custom_fbx_name:
+			prefilter_name = act.custom_fbx_name
+		else:
+			prefilter_name = self.name
+
+		self.export_named(prefilter_name)
+
+	def export_individual(self, x):
+		deselect_objects()
+		x.select_set(True)
+		bpy.context.view_layer.objects.active = x
+
+		object_loc = None
+		# Apply Location - Center of file is origin of object
+		if self.act.apply_loc:
+			object_loc = clear_location(x)
 
-			for i in start_selected_obj:
-				i.select_set(True)
+		self.export_named(x.name)
 
-			bpy.context.view_layer.objects.active = start_active_obj
+		# Restore object location
+		if object_loc is not None:
+			x.location = object_loc
 
-			# Restore "Pivot point align" option
-			bpy.context.scene.tool_settings.use_transform_pivot_point_align = current_pivot_point_align
+	def export_parent(self, x):
+		deselect_objects()
+		bpy.context.view_layer.objects.active = x
 
-			# Restore cursor location and pivot point mode
-			bpy.context.scene.cursor.location = saved_cursor_loc
-			bpy.context.scene.tool_settings.transform_pivot_point = current_pivot_point
+		object_loc = None
+		if self.act.apply_loc:
+			object_loc = clear_location(x)
 
-			# Save export dir path for option "Open export dir"
-			act.export_dir = path
+		# Root and its exported children (not the unselected ones)
+		self.index.select_hierarchy(x)
+		self.export_named(x.name)
+
+		if object_loc is not None:
+			x.location = object_loc
+
+	def export_collection(self, c):
+		self.select_exportable(self.index.collection_objects[c])
+		self.export_named(c)
+
+	def finish(self):
+		with self.profiler.stage('cleanup'):
+			# Restore original data, modifiers and transforms
+			for obj, data in reversed(self.saved_data):
+				obj.data = data
+
+			for modifier, show_viewport, show_render in self.saved_modifiers:
+				modifier.show_viewport = show_viewport
+				modifier.show_render = show_render
+
+			for obj, (matrix_basis, matrix_parent_inverse) in self.saved_matrices.items():
+				obj.matrix_parent_inverse = matrix_parent_inverse
+				obj.matrix_basis = matrix_basis
+
+			for obj, size in self.saved_empty_sizes.items():
+				obj.empty_display_size = size
+
+			for data in self.temp_data:
+				if isinstance(data, bpy.types.Mesh):
+					bpy.data.meshes.remove(data)
+				else:
+					bpy.data.armatures.remove(data)
+
+			# Restore names of original data (temporary data is removed, names are free)
+			for data, name in self.renamed_data:
+				data.name = name
+
+		self.restore_user_state()
+
+
+def apply_export_transforms(act, exp_objects, index=None, profiler=None):
+	"""Apply scale/rotation to the selected export objects.
+
+	The rotation fix only touches the hierarchies in index (the exported
+	objects), so unselected children of original objects are never touched.
+	"""
+	if profiler is None:
+		profiler = export_profiler.ExportProfiler(enabled=False)
+	if index is None:
+		index = HierarchyIndex(exp_objects)
+
+	# Apply Scale and Rotation for UNITY2023 Export or GLTF
+	# Processing only objects without linked data
+	if (act.export_target_engine == 'UNITY2023' and act.export_format == 'FBX') or act.export_format == 'GLTF':
+		current_active = bpy.context.view_layer.objects.active
+		bpy.ops.object.select_all(action='DESELECT')
+		for x in exp_objects:
+			if (x.type == 'MESH' and x.data.users < 2) or x.type != 'MESH':
+				bpy.context.view_layer.objects.active = x
+				x.select_set(True)
+		with profiler.stage('transform_apply'):
+			bpy.ops.object.transform_apply(location=False, rotation=act.apply_rot, scale=act.apply_scale)
+		bpy.context.view_layer.objects.active = current_active
+	else:
+		# Apply scale
+		with profiler.stage('transform_apply'):
+			bpy.ops.object.transform_apply(location=False, rotation=False, scale=act.apply_scale)
+		# Rotation Fix. Rotate X -90, Apply, Rotate X 90 (baked with matrices)
+		if act.apply_rot:
+			# Operate only with higher level parents
+			fix_roots = []
+			for x in index.roots:
+				# Check object has any rotation
+				# for option "Apply for Rotated Objects"
+				child_rotated = False
+				for y in [x] + index.children_recursive(x):
+					if abs(y.rotation_euler.x) + abs(y.rotation_euler.y) + abs(y.rotation_euler.z) > 0.017:
+						child_rotated = True
+
+				# X-rotation fix
+				if act.export_format == 'FBX' and (act.apply_rot_rotated
+												   or (not act.apply_rot_rotated and not child_rotated)
+												   or not act.fbx_export_mode == 'PARENT'):
+					fix_roots.append(x)
+
+			with profiler.stage('rotation_fix'):
+				apply_rotation_fix(index, fix_roots)
+
+
+def apply_rotation_fix(index, roots):
+	"""Bake the Unity X-rotation fix into object data with matrix math.
+
+	Same result as rotating each root -90 on X, applying rotation to the root
+	and its children and rotating the root back +90, without operators:
+	every object keeps its world-space geometry, its rotation is baked into
+	the mesh/armature data and the root ends with a +90 X rotation.
+	All matrices are read before anything is changed.
+	"""
+	rotation_x = mathutils.Matrix.Rotation(math.pi / 2, 4, 'X')
+	changes = []
+
+	for root in roots:
+		# Rotation pivot is the root origin (median point of the single selected root)
+		pivot = mathutils.Matrix.Translation(root.matrix_world.translation)
+		rotate_back = pivot @ rotation_x @ pivot.inverted()
+		rotate_back_inv = rotate_back.inverted()
+
+		# World matrices after "rotate -90" and "apply rotation" (rotation removed)
+		applied = {}
+		for obj in [root] + index.children_recursive(root):
+			location, rotation, scale = (rotate_back_inv @ obj.matrix_world).decompose()
+			scale_matrix = mathutils.Matrix.Diagonal(scale)
+			applied[obj] = mathutils.Matrix.Translation(location) @ scale_matrix.to_4x4()
+
+			# Rotation in the object scale space (same as transform_apply(rotation=True))
+			data_matrix = None
+			if all(abs(value) > 1e-12 for value in scale):
+				data_matrix = (scale_matrix.inverted() @ rotation.to_matrix() @ scale_matrix).to_4x4()
+			changes.append((obj, data_matrix))
+
+		root.matrix_basis = rotate_back @ applied[root]
+		for obj in index.children_recursive(root):
+			# Children keep their applied world matrix relative to the parent
+			obj.matrix_parent_inverse = applied[obj.parent].inverted_safe()
+			obj.matrix_basis = applied[obj]
+
+	for obj, data_matrix in changes:
+		if data_matrix is None:
+			continue
+		if obj.type == 'MESH':
+			obj.data.transform(data_matrix, shape_keys=True)
+		elif obj.type == 'ARMATURE':
+			obj.data.transform(data_matrix)
+
+
+# Shared parts of the blocking and the modal FBX/OBJ/GLTF export
+class MultiExportBase:
+
+	def export_blocking(self, context):
+		"""The whole export in one call. Operators call this instead of each
+		other's (leak tracked) execute, so a run is only tracked once"""
+		start_time = datetime.now()
+		act = bpy.context.scene.poptools_props.export_tools_settings
+		act.export_dir = ""
+
+		path = self.get_export_path(act)
+		if path is None:
+			return {'CANCELLED'}
+
+		session = self.start_session(context, act, path)
+		session.begin()
+		errors = []
+		try:
+			if session.plan_export():
+				with session.scene_context(context):
+					session.prepare()
+					if act.fbx_export_mode == 'INDIVIDUAL' and act.export_parallel:
+						errors = export_individual_parallel(session, get_parallel_worker_count(act))
+					else:
+						for label, export_unit in session.build_units():
+							export_unit()
+		finally:
+			session.finish()
+			session.cache.save()
+
+		self.report_results(act, path, session, start_time)
+		if errors:
+			for error in errors:
+				print(f"PopTools: Parallel export error: {error}")
+			self.report({'WARNING'}, f"{len(errors)} 个对象导出失败，详见控制台 / {len(errors)} object(s) failed, see console")
+		return {'FINISHED'}
+
+	def start_session(self, context, act, path):
+		session = self.create_session(context, act, path)
+		session.cache = export_cache.ExportCache(path, force=act.export_force)
+		session.profiler = export_profiler.ExportProfiler(enabled=act.export_profiling)
+		return session
+
+	def report_results(self, act, path, session, start_time):
+		# Save export dir path for option "Open export dir"
+		act.export_dir = path
 
 		# Show message about incorrect names
-		if len(incorrect_names) > 0:
+		if len(session.incorrect_names) > 0:
 			utils.show_message_box(
 				"Object(s) has invalid characters in name. Some chars in export name have been replaced",
 				"Incorrect Export Names")
 
 		utils.print_execution_time("FBX/OBJ Export", start_time)
-		
+
+		# Stage profiling report (Optional)
+		if act.export_profiling:
+			summary_lines = session.profiler.summary_lines()
+			act.export_profile_summary = "\n".join(summary_lines)
+			try:
+				json_path, csv_path = session.profiler.write_report(path)
+				print(f"PopTools: Export profile saved to {json_path}")
+			except OSError as e:
+				print(f"PopTools: Could not write export profile: {e}")
+		print(f"PopTools: {session.cache.summary()}")
+
 		# 显示导出成功通知 / Show export success notification
-		self.report({'INFO'}, "导出完成！文件已保存到指定目录。 / Export completed! Files have been saved to the specified directory.")
-		
+		if session.cache.hits:
+			self.report({'INFO'}, session.cache.summary())
+		else:
+			self.report({'INFO'}, "导出完成！文件已保存到指定目录。 / Export completed! Files have been saved to the specified directory.")
+
+	def create_session(self, context, act, path):
+		if act.export_engine == 'DEPSGRAPH':
+			if DepsgraphExportSession.is_supported(act, context.selected_objects):
+				return DepsgraphExportSession(context, act, path)
+			self.report({'INFO'}, "合并网格/曲线转换需要复制对象，已使用复制导出引擎 / Combine meshes or curve conversion needs the duplicate engine")
+		return DuplicateExportSession(context, act, path)
+
+	def get_export_path(self, act):
+		"""Validate settings and return the export path (None if export is not possible)"""
+		# Check custom name
+		if act.fbx_export_mode == 'ALL':
+			if act.set_custom_fbx_name:
+				if len(act.custom_fbx_name) == 0:
+					utils.show_message_box('Custom Name can\'t be empty',
+										   'Saving Error',
+										   'ERROR')
+					return None
+
+		# Check saved blend file
+		if len(bpy.data.filepath) == 0 and not act.custom_export_path:
+			utils.show_message_box('Blend file is not saved. Try use Custom Export Path',
+								   'Saving Error',
+								   'ERROR')
+			return None
+
+		path = ""
+
+		# Check export path
+		if len(bpy.data.filepath) > 0:
+			if act.export_format == 'FBX':
+				path = bpy.path.abspath('//FBXs/')
+			if act.export_format == 'OBJ':
+				path = bpy.path.abspath('//OBJs/')
+			if act.export_format == 'GLTF':
+				path = bpy.path.abspath('//GLTFs/')
+
+		if act.custom_export_path:
+			if len(act.export_path) == 0:
+				utils.show_message_box('Export Path can\'t be empty',
+									   'Saving Error',
+									   'ERROR')
+				return None
+
+			if not os.path.exists(os.path.realpath(bpy.path.abspath(act.export_path))):
+				utils.show_message_box('Directory for export not exist',
+									   'Saving Error',
+									   'ERROR')
+				return None
+			else:
+				path = os.path.realpath(bpy.path.abspath(act.export_path)) + '/'
+
+		# Create export folder (if this need)
+		if not os.path.exists(path):
+			os.makedirs(path)
+
+		return path
+
+
+def get_parallel_worker_count(act):
+	"""Number of worker processes for parallel export (0 = physical cores)"""
+	if act.export_parallel_workers > 0:
+		return act.export_parallel_workers
+	return utils.get_physical_core_count()
+
+
+def export_individual_parallel(session, workers):
+	"""Export prepared objects (INDIVIDUAL mode) with background Blender workers.
+
+	The prepared objects are written to a temporary .blend snapshot, split into
+	disjoint shards and exported by batch_export workers. Returns error list.
+	"""
+	act = session.act
+	profiler = session.profiler
+
+	# Resolve names, exporter args and incremental cache on the main process
+	units = []
+	for x in session.exp_objects:
+		name = utils.prefilter_export_name(x.name)
+		if name != x.name:
+			session.incorrect_names.append(x.name)
+
+		op_name, export_args = utils.get_export_model_args(session.path, name)
+		if op_name is None:
+			continue
+		# Unchanged objects were found by plan_export() (same fingerprints as the serial export)
+		filepath = export_args['filepath']
+		if filepath in session.unchanged_files:
+			continue
+		units.append((x, name, filepath, session.fingerprints.get(filepath)))
+
+	if not units:
+		return []
+
+	workers = max(1, min(workers, len(units)))
+	temp_dir = tempfile.mkdtemp(prefix="poptools_parallel_")
+	errors = []
+	try:
+		snapshot = os.path.join(temp_dir, "export_snapshot.blend")
+		with profiler.stage('snapshot'):
+			# Absolute paths: textures must resolve from the temp directory
+			bpy.data.libraries.write(snapshot, {x for x, name, filepath, fingerprint in units},
+									path_remap='ABSOLUTE')
+
+		settings = utils.property_group_to_dict(act)
+		# The snapshot has no scene: units, frame range and frame rate are passed with the job
+		scene_settings = utils.scene_settings_to_dict(bpy.context.scene)
+		jobs = []
+		for shard in range(workers):
+			shard_units = [(x.name, name) for x, name, filepath, fingerprint in units[shard::workers]]
+			jobs.append({
+				"type": "export_objects",
+				"snapshot": snapshot,
+				"path": session.path,
+				"settings": settings,
+				"scene": scene_settings,
+				"units": shard_units,
+				"timeout": PARALLEL_SHARD_TIMEOUT + PARALLEL_OBJECT_TIMEOUT * len(shard_units),
+			})
+
+		with profiler.stage('parallel_export'):
+			results, stats = batch_export.run_batch(jobs, bpy.app.binary_path, workers=workers, max_jobs=1)
+
+		for result in results:
+			if not result["ok"]:
+				errors.append(result["error"])
+			else:
+				errors.extend(result["result"]["errors"])
+	finally:
+		shutil.rmtree(temp_dir, ignore_errors=True)
+
+	if session.cache is not None:
+		for x, name, filepath, fingerprint in units:
+			if fingerprint is not None and os.path.exists(filepath):
+				session.cache.record(filepath, fingerprint)
+
+	return errors
+
+
+# FBX/OBJ/GLTF export
+class MultiExport(MultiExportBase, bpy.types.Operator):
+	"""Export FBXs/OBJs/GLTFs to Unity/UE/Godot"""
+	bl_idname = "object.multi_export"
+	bl_label = "Export FBXs/OBJs/GLTFs"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		return self.export_blocking(context)
+
+
+class DataBlockScope:
+	"""Leak check for an export run.
+
+	Remembers every data-block that exists on enter. On exit, data-blocks
+	created during the run that are still alive without any user are
+	reported as leaks. Nothing is removed: data with users was made on purpose.
+	"""
+
+	def __init__(self):
+		self.existing = set()
+		self.leaks = {}
+
+	@staticmethod
+	def id_collections():
+		for attr in dir(bpy.data):
+			collection = getattr(bpy.data, attr, None)
+			if isinstance(collection, bpy.types.bpy_prop_collection) and attr != 'window_managers' \
+					and len(collection) and isinstance(collection[0], bpy.types.ID):
+				yield attr, collection
+
+	def __enter__(self):
+		self.existing = {id_data.session_uid for attr, collection in self.id_collections() for id_data in collection}
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		for attr, collection in self.id_collections():
+			for id_data in collection:
+				if id_data.session_uid not in self.existing and id_data.users == 0 and not id_data.use_fake_user:
+					self.leaks.setdefault(attr, []).append(id_data.name)
+		return False
+
+	def leak_count(self):
+		return sum(len(names) for names in self.leaks.values())
+
+	def leak_lines(self):
+		return [f"{attr}: {len(names)} ({', '.join(names[:5])}{', ...' if len(names) > 5 else ''})"
+				for attr, names in sorted(self.leaks.items())]
+
+
+# FBX/OBJ/GLTF export from copies in a scratch scene, which is removed as a whole
+class MultiExportIsolated(MultiExportBase, bpy.types.Operator):
+	"""Export FBXs/OBJs/GLTFs from copies in a temporary scene, without undo steps. Leftover data-blocks are reported"""
+	bl_idname = "object.multi_export_isolated"
+	bl_label = "Export FBXs/OBJs/GLTFs (Isolated)"
+	# No 'UNDO': the copies never enter the user's scene and the originals are
+	# left unchanged, so the run has nothing to put into the undo history
+	bl_options = {'REGISTER'}
+
+	def create_session(self, context, act, path):
+		return IsolatedExportSession(context, act, path)
+
+	def execute(self, context):
+		with DataBlockScope() as scope:
+			result = self.export_blocking(context)
+
+		if scope.leak_count():
+			for line in scope.leak_lines():
+				print(f"PopTools: Export data-block leak: {line}")
+			self.report({'WARNING'}, f"发现 {scope.leak_count()} 个残留数据块，详见控制台 / "
+									f"{scope.leak_count()} leaked data-block(s), see console")
+		return result
+
+
+# FBX/OBJ/GLTF export in time-sliced chunks. UI stays responsive, Esc cancels
+class MultiExportModal(MultiExportBase, bpy.types.Operator):
+	"""Export FBXs/OBJs/GLTFs in the background. Press Esc to cancel"""
+	bl_idname = "object.multi_export_modal"
+	bl_label = "Export FBXs/OBJs/GLTFs (Background)"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	# Seconds of export work per timer tick
+	time_slice: bpy.props.FloatProperty(default=0.1, min=0.01, options={'HIDDEN'})
+
+	def invoke(self, context, event):
+		if context.window is None:
+			return self.export_blocking(context)
+
+		self.start_time = datetime.now()
+		self.act = bpy.context.scene.poptools_props.export_tools_settings
+		self.act.export_dir = ""
+
+		self.path = self.get_export_path(self.act)
+		if self.path is None:
+			return {'CANCELLED'}
+
+		self.session = self.start_session(context, self.act, self.path)
+		self.session.begin()
+		# The cache check, duplicating and applying modifiers run in the timer ticks too,
+		# export units are built once preparation is finished
+		self.prepare_steps = self.prepare_session()
+		self.prepare_count = 0
+		self.units = []
+		self.done = 0
+
+		wm = context.window_manager
+		wm.progress_begin(0, max(len(self.session.current_selected_obj), 1))
+		self.timer = wm.event_timer_add(0.01, window=context.window)
+		wm.modal_handler_add(self)
+		self.update_status(context)
+		return {'RUNNING_MODAL'}
+
+	def execute(self, context):
+		# Without a window (scripts, background mode) run the blocking export
+		return self.export_blocking(context)
+
+	def modal(self, context, event):
+		if event.type == 'ESC':
+			self.stop(context)
+			self.report({'WARNING'}, f"导出已取消 ({self.done}/{len(self.units)}) / Export cancelled")
+			return {'CANCELLED'}
+
+		if event.type != 'TIMER' or event.timer != self.timer:
+			if event.type in utils.MODAL_PASS_THROUGH_EVENTS:
+				return {'PASS_THROUGH'}
+			return {'RUNNING_MODAL'}
+
+		slice_end = time.perf_counter() + self.time_slice
+		try:
+			while self.prepare_steps is not None and time.perf_counter() < slice_end:
+				if next(self.prepare_steps, StopIteration) is StopIteration:
+					self.prepare_steps = None
+					context.window_manager.progress_end()
+					context.window_manager.progress_begin(0, max(len(self.units), 1))
+				else:
+					self.prepare_count += 1
+
+			while self.prepare_steps is None and self.done < len(self.units) and time.perf_counter() < slice_end:
+				label, export_unit = self.units[self.done]
+				export_unit()
+				self.done += 1
+		except Exception as e:
+			self.stop(context)
+			self.report({'ERROR'}, f"导出失败 / Export failed: {e}")
+			return {'CANCELLED'}
+
+		if self.prepare_steps is not None:
+			context.window_manager.progress_update(self.prepare_count)
+			self.update_status(context)
+			return {'RUNNING_MODAL'}
+
+		if self.done < len(self.units):
+			context.window_manager.progress_update(self.done)
+			self.update_status(context)
+			return {'RUNNING_MODAL'}
+
+		self.stop(context)
+		self.report_results(self.act, self.path, self.session, self.start_time)
 		return {'FINISHED'}
 
+	def prepare_session(self):
+		"""Cache check and preparation as timer steps, ends with the export units"""
+		if self.session.plan_export():
+			yield
+			yield from self.session.prepare_steps()
+			self.units = self.session.build_units()
+
+	def update_status(self, context):
+		if self.prepare_steps is not None:
+			text = f"PopTools 准备中 / Preparing ({self.prepare_count})  (Esc 取消 / cancel)"
+		else:
+			text = f"PopTools 导出中 / Exporting {self.done}/{len(self.units)}  (Esc 取消 / cancel)"
+		if context.area:
+			context.area.header_text_set(text)
+		if context.workspace:
+			context.workspace.status_text_set(text)
+
+	def stop(self, context):
+		"""Remove temporary data and restore names/selection (also on cancel)"""
+		wm = context.window_manager
+		wm.event_timer_remove(self.timer)
+		wm.progress_end()
+		if context.area:
+			context.area.header_text_set(None)
+		if context.workspace:
+			context.workspace.status_text_set(None)
+
+		# Close an unfinished preparation before cleaning up
+		if self.prepare_steps is not None:
+			self.prepare_steps.close()
+			self.prepare_steps = None
+		self.session.finish()
+		self.session.cache.save()
+
 
 # Open Export Directory
 class OpenExportDir(bpy.types.Operator):
@@ -670,6 +1609,11 @@ class VIEW3D_PT_export_tools_panel(bpy.types.Panel):
 				row.label(text="文件格式:")
 				row.prop(act, "export_format", expand=False)
 
+				# Export Engine
+				row = layout.row(align=True)
+				row.label(text="导出引擎:")
+				row.prop(act, "export_engine", expand=False)
+
 				if act.export_format == 'FBX':
 					# Target Engine
 					row = layout.row(align=True)
@@ -715,6 +1659,25 @@ class VIEW3D_PT_export_tools_panel(bpy.types.Panel):
 			row = layout.row()
 			row.prop(act, "triangulate_before_export", text="三角化网格")
 
+			row = layout.row()
+			row.prop(act, "export_force", text="强制全部导出(忽略增量缓存)")
+
+			if act.fbx_export_mode == 'INDIVIDUAL':
+				row = layout.row(align=True)
+				row.prop(act, "export_parallel", text="多进程并行导出")
+				if act.export_parallel:
+					row.prop(act, "export_parallel_workers", text="进程数")
+
+			# Stage profiling
+			row = layout.row()
+			row.prop(act, "export_profiling", text="导出性能分析")
+			if act.export_profiling and act.export_profile_summary:
+				box = layout.box()
+				box.label(text="上次导出耗时:", icon='TIME')
+				col = box.column(align=True)
+				for line in act.export_profile_summary.split('\n')[:10]:
+					col.label(text=line)
+
 			if act.fbx_export_mode == 'ALL':
 				box = layout.box()
 				row = box.row()
@@ -827,6 +1790,8 @@ class VIEW3D_PT_export_tools_panel(bpy.types.Panel):
 					row.operator("object.multi_export", text="导出 OBJ")
 				elif act.export_format == 'GLTF':
 					row.operator("object.multi_export", text="导出 GLTF")
+				row.operator("object.multi_export_modal", text="", icon='SORTTIME')
+				row.operator("object.multi_export_isolated", text="", icon='TRASH')
 
 				if len(act.export_dir) > 0:
 					row = layout.row()
@@ -843,6 +1808,8 @@ class VIEW3D_PT_export_tools_panel(bpy.types.Panel):
 
 classes = (
 	MultiExport,
+	MultiExportModal,
+	MultiExportIsolated,
 	OpenExportDir,
 	VIEW3D_PT_export_tools_panel
 )
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Leak Tracker
+数据块泄漏追踪：在首选项中启用后，记录每个PopTools操作符运行前后的
+数据块数量（可选tracemalloc内存峰值），输出增长并统计泄漏最多的操作符，
+可以一键清除这些操作符创建的孤立数据块。模态操作符从invoke开始到modal
+结束算作一次运行
+"""
+
+import bpy
+import functools
+import tracemalloc
+from bpy.types import Operator
+from bpy.props import StringProperty
+from .utils import get_addon_preferences
+
+# 统计数量的数据块集合
+TRACKED_COLLECTIONS = (
+    'objects', 'meshes', 'materials', 'images', 'textures', 'node_groups',
+    'actions', 'armatures', 'curves', 'collections',
+)
+
+# 操作符bl_idname -> 统计
+# {'runs', 'growth': {集合: 增长数}, 'peak_kb', 'created': {集合: set(session_uid)}, 'orphans': 孤立数据块数量}
+LEAK_STATS = {}
+
+# 正在运行的模态操作符 as_pointer() -> 运行开始时的状态
+MODAL_RUNS = {}
+
+# 模态操作符仍在运行时的返回值
+MODAL_CONTINUE = {'RUNNING_MODAL', 'PASS_THROUGH'}
+
+
+def is_enabled():
+    try:
+        return get_addon_preferences().enable_leak_tracker
+    except (KeyError, AttributeError):
+        return False
+
+
+def snapshot():
+    """{集合: set(session_uid)}"""
+    return {attr: {id_data.session_uid for id_data in getattr(bpy.data, attr)} for attr in TRACKED_COLLECTIONS}
+
+
+def record_run(idname, before, after, peak_kb):
+    stats = LEAK_STATS.setdefault(idname, {'runs': 0, 'growth': {}, 'peak_kb': 0.0, 'created': {}, 'orphans': 0})
+    stats['runs'] += 1
+    stats['peak_kb'] = max(stats['peak_kb'], peak_kb)
+
+    changes = []
+    for attr in TRACKED_COLLECTIONS:
+        growth = len(after[attr]) - len(before[attr])
+        created = after[attr] - before[attr]
+        if created:
+            stats['created'].setdefault(attr, set()).update(created)
+        if growth > 0:
+            stats['growth'][attr] = stats['growth'].get(attr, 0) + growth
+            changes.append(f"{attr} +{growth}")
+
+    if changes:
+        print(f"PopTools Leak Tracker: {idname}: {', '.join(changes)}"
+              + (f" (peak {peak_kb:.0f} KB)" if peak_kb else ""))
+    update_orphan_counts()
+
+
+def begin_run():
+    """开始一次运行：数据块快照和tracemalloc状态"""
+    use_tracemalloc = get_addon_preferences().leak_tracker_tracemalloc
+    started_tracemalloc = False
+    if use_tracemalloc:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracemalloc = True
+        tracemalloc.reset_peak()
+    return snapshot(), use_tracemalloc, started_tracemalloc
+
+
+def end_run(idname, run):
+    before, use_tracemalloc, started_tracemalloc = run
+    peak_kb = 0.0
+    if use_tracemalloc:
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024.0
+        if started_tracemalloc:
+            tracemalloc.stop()
+    record_run(idname, before, snapshot(), peak_kb)
+
+
+def track_call(method, idname, modal=False):
+    """包装操作符execute/invoke/modal：未启用追踪时直接调用
+
+    返回RUNNING_MODAL（modal中还有PASS_THROUGH）时运行还没有结束，
+    由之后的modal调用继续，直到返回FINISHED/CANCELLED或抛出异常。
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        key = self.as_pointer()
+        run = MODAL_RUNS.pop(key, None)
+        if run is None:
+            if not is_enabled():
+                return method(self, *args)
+            run = begin_run()
+
+        result = None
+        try:
+            result = method(self, *args)
+            return result
+        finally:
+            continuing = MODAL_CONTINUE if modal else {'RUNNING_MODAL'}
+            if result is not None and not continuing.isdisjoint(result):
+                MODAL_RUNS[key] = run
+            else:
+                end_run(idname, run)
+
+    wrapper.poptools_tracked = method
+    return wrapper
+
+
+def instrument_modules(modules):
+    """为各模块classes中的所有操作符包装execute，模态操作符还包装invoke和modal（注册前调用）
+
+    操作符内部互相调用时应调用未包装的方法（如export_blocking），避免一次运行被记录两次
+    """
+    for module in modules:
+        for cls in getattr(module, 'classes', ()):
+            if not (isinstance(cls, type) and issubclass(cls, Operator)):
+                continue
+            methods = ['execute']
+            if 'modal' in cls.__dict__:
+                methods += ['invoke', 'modal']
+            for name in methods:
+                method = cls.__dict__.get(name)
+                if method is None or hasattr(method, 'poptools_tracked'):
+                    continue
+                setattr(cls, name, track_call(method, cls.bl_idname, modal=(name == 'modal')))
+
+
+def total_growth(stats):
+    return sum(stats['growth'].values())
+
+
+def top_leakers(limit=5):
+    """[(bl_idname, 统计)]，按数据块增长从多到少"""
+    leakers = [(idname, stats) for idname, stats in LEAK_STATS.items() if total_growth(stats) > 0]
+    leakers.sort(key=lambda item: total_growth(item[1]), reverse=True)
+    return leakers[:limit]
+
+
+def find_orphans(idname=""):
+    """追踪到的操作符创建的、现在没有用户的数据块"""
+    orphans = []
+    for name, stats in LEAK_STATS.items():
+        if idname and name != idname:
+            continue
+        for attr, uids in stats['created'].items():
+            for id_data in getattr(bpy.data, attr):
+                if id_data.session_uid in uids and id_data.users == 0 and not id_data.use_fake_user:
+                    orphans.append(id_data)
+    return orphans
+
+
+def update_orphan_counts():
+    """运行结束或清除后重新统计每个操作符的孤立数据块（面板绘制时只显示）"""
+    for name, stats in LEAK_STATS.items():
+        stats['orphans'] = len(find_orphans(name))
+
+
+class POPTOOLS_OT_purge_tracked_orphans(Operator):
+    """清除追踪到的操作符创建的孤立数据块"""
+    bl_idname = "poptools.purge_tracked_orphans"
+    bl_label = "清除孤立数据块"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    operator: StringProperty(
+        name="操作符",
+        description="只清除该操作符创建的数据块（为空时清除全部）",
+        default=""
+    )
+
+    def execute(self, context):
+        # 删除网格后材质等可能变成孤立数据，重复直到没有新的孤立数据块
+        removed = 0
+        orphans = find_orphans(self.operator)
+        while orphans:
+            removed += len(orphans)
+            bpy.data.batch_remove(orphans)
+            orphans = find_orphans(self.operator)
+        update_orphan_counts()
+
+        self.report({'INFO'}, f"已清除 {removed} 个孤立数据块 / Purged {removed} orphan data-block(s)")
+        return {'FINISHED'}
+
+
+class POPTOOLS_OT_reset_leak_stats(Operator):
+    """清空数据块泄漏统计"""
+    bl_idname = "poptools.reset_leak_stats"
+    bl_label = "清空统计"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        LEAK_STATS.clear()
+        MODAL_RUNS.clear()
+        return {'FINISHED'}
+
+
+def draw_preferences(prefs, layout):
+    """首选项中的泄漏追踪面板"""
+    box = layout.box()
+    box.label(text="数据块泄漏追踪 / Leak Tracker:", icon='ORPHAN_DATA')
+    col = box.column(align=True)
+    col.prop(prefs, "enable_leak_tracker")
+    if not prefs.enable_leak_tracker:
+        return
+    col.prop(prefs, "leak_tracker_tracemalloc")
+
+    leakers = top_leakers()
+    if not leakers:
+        box.label(text="没有记录到数据块增长", icon='CHECKMARK')
+    for idname, stats in leakers:
+        row = box.row(align=True)
+        growth = ", ".join(f"{attr} +{count}" for attr, count in sorted(stats['growth'].items()))
+        text = f"{idname} ({stats['runs']}次): {growth}"
+        if stats['peak_kb']:
+            text += f", 峰值 {stats['peak_kb']:.0f} KB"
+        row.label(text=text)
+        op = row.operator("poptools.purge_tracked_orphans", text=f"清除 {stats['orphans']}", icon='TRASH')
+        op.operator = idname
+
+    row = box.row(align=True)
+    row.operator("poptools.purge_tracked_orphans", text="清除全部孤立数据块", icon='TRASH').operator = ""
+    row.operator("poptools.reset_leak_stats", icon='X')
+
+
+classes = (
+    POPTOOLS_OT_purge_tracked_orphans,
+    POPTOOLS_OT_reset_leak_stats,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
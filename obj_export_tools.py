@@ -9,11 +9,19 @@
 import bpy
 import os
 import time
+import queue
+import threading
 import contextlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from bpy.types import Operator, Panel
 from bpy.props import StringProperty, EnumProperty, FloatProperty, BoolProperty
-from .utils import get_addon_preferences
+from .utils import get_addon_preferences, property_group_to_dict, MODAL_PASS_THROUGH_EVENTS
+from . import utils
+from . import export_cache
+from . import export_journal
+from . import texture_copy
+from . import obj_writer
 
 # --- Setup Logger ---
 logger = logging.getLogger(__name__)
@@ -25,6 +33,14 @@ if not logger.handlers:
     logger.setLevel(logging.INFO)
 
 
+# NumPy写入器流水线：队列容量（限制等待写入的网格数量，控制内存）和写入线程数
+PIPELINE_QUEUE_SIZE = 8
+PIPELINE_WRITE_THREADS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# Blender导出器先导出到该临时目录，完成后再重命名到导出目录
+STAGING_DIR_NAME = ".poptools_staging"
+
+
 # --- Core Functions ---
 
 @contextlib.contextmanager
@@ -90,6 +106,73 @@ def temp_selection_context(context, active_object=None, selected_objects=None):
                 pass
 
 
+class BatchSelection:
+    """
+    批量导出的选择管理：开始时记录一次选择状态并全部取消选择，
+    每次导出只切换当前导出对象的选择，结束时（包括异常）恢复一次
+
+    与每个对象使用temp_selection_context相比，不需要反复遍历场景中的所有对象。
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.original_active = None
+        self.original_selected = []
+        self.current = None
+        self.active = False
+
+    def begin(self):
+        view_layer = self.context.view_layer
+        self.original_active = view_layer.objects.active
+        self.original_selected = list(self.context.selected_objects)
+        for obj in self.original_selected:
+            obj.select_set(False)
+        self.active = True
+
+    def select_only(self, obj):
+        """只选择obj并设为活动对象"""
+        self.release()
+        obj.select_set(True)
+        self.context.view_layer.objects.active = obj
+        self.current = obj
+
+    def release(self):
+        """取消选择当前导出对象（对象已被删除时忽略）"""
+        if self.current is not None:
+            try:
+                self.current.select_set(False)
+            except ReferenceError:
+                pass
+            self.current = None
+
+    def end(self):
+        if not self.active:
+            return
+        self.active = False
+        self.release()
+
+        view_layer = self.context.view_layer
+        for obj in self.original_selected:
+            try:
+                if obj.name in view_layer.objects:
+                    obj.select_set(True)
+            except ReferenceError:
+                pass
+        try:
+            if self.original_active is not None and self.original_active.name in view_layer.objects:
+                view_layer.objects.active = self.original_active
+        except ReferenceError:
+            pass
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end()
+        return False
+
+
 def create_export_copy(original_obj, context):
     """
     创建用于导出的对象副本
@@ -177,21 +260,56 @@ def triangulate_mesh(obj, method='BEAUTY', keep_normals=True):
         method (str): 三角化方法
         keep_normals (bool): 是否保持法线
     """
-    # 进入编辑模式
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode='EDIT')
+    # 直接在网格数据上三角化，不进入编辑模式
+    quad_method, ngon_method = utils.TRIANGULATE_METHODS.get(method, ('BEAUTY', 'BEAUTY'))
+    utils.triangulate_mesh_data(obj.data, quad_method, ngon_method, keep_normals)
+
+
+def get_obj_export_args(export_filepath, scene_props, copy_textures=True):
+    """
+    解析OBJ导出参数（导出和增量缓存指纹共用）
     
-    # 选择所有面
-    bpy.ops.mesh.select_all(action='SELECT')
+    Args:
+        export_filepath (str): 导出文件路径（含.obj扩展名）
+        scene_props: 场景属性
+        copy_textures (bool): 由导出器复制贴图；批量导出使用TextureCopyCache时为False，MTL只写文件名
     
-    # 三角化
-    bpy.ops.mesh.quads_convert_to_tris(quad_method=method, ngon_method=method)
+    Returns:
+        dict: bpy.ops.wm.obj_export的参数
+    """
+    # 坐标轴映射：将用户界面的值转换为API需要的枚举值
+    axis_mapping = {
+        'X': 'X',
+        'Y': 'Y', 
+        'Z': 'Z',
+        '-X': 'NEGATIVE_X',
+        '-Y': 'NEGATIVE_Y',
+        '-Z': 'NEGATIVE_Z'
+    }
     
-    # 返回对象模式
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-
-def export_object(obj, file_path, scene_props):
+    forward_axis_value = getattr(scene_props, 'obj_export_coord_forward', 'Z')
+    up_axis_value = getattr(scene_props, 'obj_export_coord_up', 'Y')
+    
+    # 转换为API需要的枚举值
+    forward_axis_enum = axis_mapping.get(forward_axis_value, 'NEGATIVE_Z')
+    up_axis_enum = axis_mapping.get(up_axis_value, 'Y')
+    
+    return dict(
+        filepath=export_filepath,
+        export_selected_objects=True,
+        global_scale=getattr(scene_props, 'obj_export_scale', 1.0),
+        forward_axis=forward_axis_enum,
+        up_axis=up_axis_enum,
+        export_materials=getattr(scene_props, 'obj_export_materials', True),
+        path_mode="COPY" if copy_textures else "STRIP",
+        export_normals=True,
+        export_smooth_groups=True,
+        apply_modifiers=False,  # 由apply_mesh_modifiers处理
+        export_triangulated_mesh=False,  # 由triangulate_mesh处理
+    )
+
+
+def export_object(obj, file_path, scene_props, selection=None, copy_textures=True):
     """
     导出单个对象为OBJ格式
     
@@ -199,6 +317,8 @@ def export_object(obj, file_path, scene_props):
         obj (bpy.types.Object): 要导出的对象
         file_path (str): 导出文件路径
         scene_props: 场景属性
+        selection (BatchSelection, optional): 批量选择管理器，未提供时使用temp_selection_context
+        copy_textures (bool): 是否由导出器复制贴图
     
     Returns:
         bool: 导出是否成功
@@ -216,40 +336,24 @@ def export_object(obj, file_path, scene_props):
     export_filepath = f"{file_path}.obj"
     
     logger.info(f"导出 {os.path.basename(export_filepath)} (OBJ)...")
+
+    # 先导出到临时目录（OBJ、MTL和复制的贴图），完成后再移动，避免半成品被当作完成的文件
+    export_dir = os.path.dirname(export_filepath)
+    staging_dir = os.path.join(export_dir, STAGING_DIR_NAME)
+    os.makedirs(staging_dir, exist_ok=True)
+    staged_filepath = os.path.join(staging_dir, os.path.basename(export_filepath))
     
-    with temp_selection_context(bpy.context, active_object=obj, selected_objects=[obj]):
+    if selection is not None:
+        selection.select_only(obj)
+        selection_context = contextlib.nullcontext()
+    else:
+        selection_context = temp_selection_context(bpy.context, active_object=obj, selected_objects=[obj])
+
+    with selection_context:
         try:
-            # 坐标轴映射：将用户界面的值转换为API需要的枚举值
-            axis_mapping = {
-                'X': 'X',
-                'Y': 'Y', 
-                'Z': 'Z',
-                '-X': 'NEGATIVE_X',
-                '-Y': 'NEGATIVE_Y',
-                '-Z': 'NEGATIVE_Z'
-            }
-            
-            forward_axis_value = getattr(scene_props, 'obj_export_coord_forward', 'Z')
-            up_axis_value = getattr(scene_props, 'obj_export_coord_up', 'Y')
-            
-            # 转换为API需要的枚举值
-            forward_axis_enum = axis_mapping.get(forward_axis_value, 'NEGATIVE_Z')
-            up_axis_enum = axis_mapping.get(up_axis_value, 'Y')
-            
             # 导出OBJ格式
-            bpy.ops.wm.obj_export(
-                filepath=export_filepath,
-                export_selected_objects=True,
-                global_scale=getattr(scene_props, 'obj_export_scale', 1.0),
-                forward_axis=forward_axis_enum,
-                up_axis=up_axis_enum,
-                export_materials=getattr(scene_props, 'obj_export_materials', True),
-                path_mode="COPY",
-                export_normals=True,
-                export_smooth_groups=True,
-                apply_modifiers=False,  # 由apply_mesh_modifiers处理
-                export_triangulated_mesh=False,  # 由triangulate_mesh处理
-            )
+            bpy.ops.wm.obj_export(**get_obj_export_args(staged_filepath, scene_props, copy_textures))
+            commit_staged_files(staging_dir, export_dir, staged_filepath)
             
             logger.info(f"成功导出 {os.path.basename(export_filepath)}")
             return True
@@ -259,6 +363,19 @@ def export_object(obj, file_path, scene_props):
             return False
 
 
+def commit_staged_files(staging_dir, export_dir, staged_filepath):
+    """把临时目录中的导出结果重命名到导出目录，OBJ最后移动（存在即表示完整）"""
+    for name in os.listdir(staging_dir):
+        path = os.path.join(staging_dir, name)
+        if path != staged_filepath and os.path.isfile(path):
+            export_journal.replace_atomic(path, os.path.join(export_dir, name))
+    export_journal.replace_atomic(staged_filepath, os.path.join(export_dir, os.path.basename(staged_filepath)))
+    try:
+        os.rmdir(staging_dir)
+    except OSError:
+        pass
+
+
 def cleanup_object(obj, obj_name=None):
     """
     清理临时对象
@@ -279,25 +396,257 @@ def cleanup_object(obj, obj_name=None):
             logger.warning(f"清理对象 {name} 时出错: {e}")
 
 
+class ObjWritePipeline:
+    """生产者/消费者流水线：主线程提取网格数据，写入线程格式化并写出文件
+
+    队列有容量上限，写入跟不上时submit()阻塞（背压），内存中最多保留
+    PIPELINE_QUEUE_SIZE + 写入线程数 个网格。完成的结果由主线程通过drain()取回。
+    """
+
+    def __init__(self, queue_size=PIPELINE_QUEUE_SIZE, threads=PIPELINE_WRITE_THREADS):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads = threads
+        self.results = []
+        self.lock = threading.Lock()
+
+        # 指标：生产者等待（队列满）、消费者等待（队列空）、写入耗时、提交时的队列深度
+        self.submit_wait = 0.0
+        self.write_wait = 0.0
+        self.write_time = 0.0
+        self.depth_samples = []
+
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="poptools_obj_writer")
+        self.futures = [self.executor.submit(self.consume) for _ in range(threads)]
+
+    def submit(self, name, export_filepath, fingerprint, data):
+        """提交一个已提取的网格，队列满时阻塞"""
+        self.depth_samples.append(self.queue.qsize())
+        start = time.perf_counter()
+        self.queue.put((name, export_filepath, fingerprint, data))
+        self.submit_wait += time.perf_counter() - start
+
+    def consume(self):
+        """写入线程：不访问bpy，只处理NumPy数据"""
+        while True:
+            start = time.perf_counter()
+            item = self.queue.get()
+            waited = time.perf_counter() - start
+            if item is None:
+                break
+
+            name, export_filepath, fingerprint, data = item
+            start = time.perf_counter()
+            try:
+                obj_writer.write_obj_files(export_filepath, data)
+                error = None
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            with self.lock:
+                self.write_wait += waited
+                self.write_time += elapsed
+                self.results.append((name, export_filepath, fingerprint, error))
+
+    def drain(self):
+        """取回已完成的结果 [(对象名, 文件路径, 指纹, 错误或None)]"""
+        with self.lock:
+            results, self.results = self.results, []
+        return results
+
+    def close(self):
+        """等待队列中的网格全部写完并停止写入线程"""
+        for _ in range(self.threads):
+            self.queue.put(None)
+        for future in self.futures:
+            future.result()
+        self.executor.shutdown()
+
+    def log_metrics(self):
+        depth = self.depth_samples or [0]
+        logger.info(
+            f"写入流水线: {len(self.depth_samples)} 个网格, {self.threads} 个写入线程, "
+            f"队列深度 平均 {sum(depth) / len(depth):.1f} / 最大 {max(depth)} (容量 {self.queue.maxsize}), "
+            f"主线程等待队列 {self.submit_wait:.3f}s, 写入线程等待数据 {self.write_wait:.3f}s, "
+            f"写入耗时 {self.write_time:.3f}s"
+        )
+
+
 # --- Operators ---
 
-class OBJ_OT_batch_export(Operator):
-    """批量导出选中的网格对象为OBJ格式"""
-    bl_idname = "obj.batch_export"
-    bl_label = "批量导出OBJ"
-    bl_options = {"REGISTER", "UNDO"}
+class ObjBatchExportJob:
+    """一次OBJ批量导出的运行状态（阻塞导出和模态导出共用）"""
+
+    def __init__(self, context, objects_to_export, export_base_path, scene_props):
+        self.context = context
+        self.objects_to_export = objects_to_export
+        self.export_base_path = export_base_path
+        self.scene_props = scene_props
+        self.start_time = time.time()
+        self.index = 0
+
+        self.successful_exports = 0
+        self.failed_exports = []
+        self.overall_success = True
+
+        # 增量导出缓存：内容和设置都未变化的对象在创建副本前跳过
+        self.cache = export_cache.ExportCache(export_base_path, force=scene_props.obj_export_force)
+        self.cache_settings = property_group_to_dict(scene_props)
+        self.cache_settings.pop('obj_export_force', None)
+        self.cache_settings.pop('obj_export_resume', None)
+
+        # 断点续传日志：不续传时清空旧日志
+        self.journal = export_journal.ExportJournal(export_base_path, resume=scene_props.obj_export_resume)
+
+        # 贴图在批次级别复制：每张只复制一次，与网格导出并行
+        self.textures = texture_copy.TextureCopyCache(export_base_path)
+
+        self.pipeline = ObjWritePipeline() if scene_props.obj_export_writer == 'NUMPY' else None
+
+        # Blender导出器需要选择状态：整个批次只记录/恢复一次
+        self.selection = None
+        if self.pipeline is None:
+            self.selection = BatchSelection(context)
+            self.selection.begin()
+
+    @property
+    def total(self):
+        return len(self.objects_to_export)
+
+    @property
+    def done(self):
+        return self.index >= len(self.objects_to_export)
+
+    def export_next(self):
+        """导出下一个对象"""
+        context = self.context
+        scene_props = self.scene_props
+        export_base_path = self.export_base_path
+        original_obj = self.objects_to_export[self.index]
+        self.index += 1
+
+        logger.info(f"处理 ({self.index}/{self.total}): {original_obj.name}")
+        object_processed_successfully = True
+
+        export_obj = None
+        export_obj_name = None
+
+        clean_name = original_obj.name.replace(".", "_")
+        export_filepath = os.path.join(export_base_path, clean_name) + ".obj"
+
+        # 跳过的对象也请求贴图：目标目录中已有相同副本时只需一次stat，缺失的贴图会被补上
+        if scene_props.obj_export_materials:
+            self.textures.request_object(original_obj)
+
+        if self.journal.check(original_obj.name, export_filepath):
+            logger.info(f"已完成，跳过: {original_obj.name}")
+            return
+
+        fingerprint = export_cache.fingerprint_objects(
+            [original_obj], 'wm.obj_export',
+            get_obj_export_args(export_filepath, scene_props, copy_textures=False), self.cache_settings)
+        if self.cache.check(export_filepath, fingerprint):
+            logger.info(f"未变化，跳过: {original_obj.name}")
+            return
+
+        if scene_props.obj_export_writer == 'NUMPY':
+            self.export_with_writer(original_obj, export_filepath, fingerprint)
+            return
+        
+        try:
+            logger.info("处理单个导出（无LOD）...")
+            export_obj = create_export_copy(original_obj, context)
+            (export_obj_name, base_name) = setup_export_object(
+                export_obj, original_obj.name, scene_props
+            )
+            apply_mesh_modifiers(export_obj)
+            
+            if scene_props.obj_export_triangulate:
+                triangulate_mesh(
+                    export_obj,
+                    scene_props.obj_export_tri_method,
+                    scene_props.obj_export_keep_normals
+                )
+
+            file_path = os.path.join(export_base_path, base_name.replace('.obj', ''))
+            if export_object(export_obj, file_path, scene_props, self.selection, copy_textures=False):
+                self.successful_exports += 1
+                self.cache.record(export_filepath, fingerprint)
+                self.journal.record(original_obj.name, export_filepath)
+            else:
+                object_processed_successfully = False
+                self.failed_exports.append(original_obj.name)
+
+        except Exception as e:
+            object_processed_successfully = False
+            log_name = export_obj_name if export_obj_name else original_obj.name
+            logger.error(f"处理失败 {log_name}: {e}")
+            self.failed_exports.append(f"{original_obj.name} (处理错误)")
+            
+        finally:
+            if self.selection is not None:
+                self.selection.release()
+            cleanup_object(export_obj, export_obj_name)
+
+        if not object_processed_successfully:
+            self.overall_success = False
+
+    def export_with_writer(self, original_obj, export_filepath, fingerprint):
+        """NumPy写入器：主线程提取网格数据（不创建副本、不切换选择），交给写入线程写出"""
+        try:
+            data = obj_writer.extract_mesh_data(original_obj, self.scene_props,
+                                                self.context.evaluated_depsgraph_get())
+        except Exception as e:
+            logger.error(f"处理失败 {original_obj.name}: {e}")
+            self.failed_exports.append(f"{original_obj.name} (处理错误)")
+            self.overall_success = False
+            return
+
+        self.pipeline.submit(original_obj.name, export_filepath, fingerprint, data)
+        self.collect_written()
+
+    def collect_written(self):
+        """处理写入线程已完成的结果（缓存记录在主线程进行）"""
+        for name, export_filepath, fingerprint, error in self.pipeline.drain():
+            if error is None:
+                logger.info(f"成功导出 {os.path.basename(export_filepath)}")
+                self.successful_exports += 1
+                self.cache.record(export_filepath, fingerprint)
+                self.journal.record(name, export_filepath)
+            else:
+                logger.error(f"导出失败 {os.path.basename(export_filepath)}: {error}")
+                self.failed_exports.append(name)
+                self.overall_success = False
+
+    def finish(self):
+        if self.selection is not None:
+            self.selection.end()
+        if self.pipeline is not None:
+            self.pipeline.close()
+            self.collect_written()
+            self.pipeline.log_metrics()
+        self.textures.finish()
+        for error in self.textures.errors:
+            logger.warning(f"贴图复制失败 {error}")
+        self.cache.save()
+
+        # 全部成功完成后不再需要续传日志；取消或失败时保留
+        if self.done and self.overall_success:
+            self.journal.remove()
+
+
+class ObjBatchExportBase:
+    """OBJ批量导出操作符的公共部分"""
 
     @classmethod
     def poll(cls, context):
         """仅在选择了网格对象时启用"""
         return any(obj.type == "MESH" for obj in context.selected_objects)
 
-    def execute(self, context):
-        """执行批量导出过程"""
+    def create_job(self, context):
+        """验证选择和导出路径，返回ObjBatchExportJob（无法导出时返回None）"""
         scene = context.scene
         scene_props = scene.poptools_props.obj_export_settings
-        wm = context.window_manager
-        start_time = time.time()
 
         objects_to_export = [
             obj for obj in context.selected_objects if obj.type == "MESH"
@@ -307,7 +656,7 @@ class OBJ_OT_batch_export(Operator):
         if not objects_to_export:
             self.report({"WARNING"}, "未选择网格对象")
             logger.warning("导出取消：未选择网格对象")
-            return {"CANCELLED"}
+            return None
 
         # 验证导出路径
         export_base_path = bpy.path.abspath(scene_props.obj_export_path)
@@ -319,79 +668,148 @@ class OBJ_OT_batch_export(Operator):
                 err_msg = f"导出路径无效/无法创建: {export_base_path}. 错误: {e}"
                 self.report({"ERROR"}, err_msg)
                 logger.error(err_msg)
-                return {"CANCELLED"}
-
-        successful_exports = 0
-        failed_exports = []
-        overall_success = True
+                return None
 
         logger.info(f"开始批量导出 {total_objects} 个对象到 {export_base_path}")
-        wm.progress_begin(0, total_objects)
+        return ObjBatchExportJob(context, objects_to_export, export_base_path, scene_props)
+
+    def report_job(self, job):
+        """报告结果"""
+        end_time = time.time()
+        duration = end_time - job.start_time
+        
+        logger.info(job.cache.summary())
+        logger.info(job.textures.summary())
+        if job.journal.resumed:
+            logger.info(job.journal.summary())
+
+        if job.overall_success:
+            msg = f"成功导出 {job.successful_exports} 个对象, 跳过 {len(job.cache.hits)} 个未变化对象"
+            if job.journal.resumed:
+                msg += f", 续传跳过 {len(job.journal.resumed)} 个已完成对象"
+            msg += f" (耗时 {duration:.2f}s)"
+            self.report({"INFO"}, msg)
+            logger.info(msg)
+        else:
+            msg = f"导出完成，但有错误。成功: {job.successful_exports}, 失败: {len(job.failed_exports)}"
+            self.report({"WARNING"}, msg)
+            logger.warning(msg)
+            if job.failed_exports:
+                logger.warning(f"失败的对象: {', '.join(job.failed_exports)}")
+
+    def export_blocking(self, context):
+        """执行批量导出过程（阻塞，后台操作符没有窗口时也使用）"""
+        wm = context.window_manager
+
+        job = self.create_job(context)
+        if job is None:
+            return {"CANCELLED"}
+
+        wm.progress_begin(0, job.total)
         
         try:
             # --- 主导出循环 ---
-            for index, original_obj in enumerate(objects_to_export):
-                wm.progress_update(index + 1)
-                logger.info(f"处理 ({index + 1}/{total_objects}): {original_obj.name}")
-                object_processed_successfully = True
-
-                export_obj = None
-                export_obj_name = None
-                
-                try:
-                    logger.info("处理单个导出（无LOD）...")
-                    export_obj = create_export_copy(original_obj, context)
-                    (export_obj_name, base_name) = setup_export_object(
-                        export_obj, original_obj.name, scene_props
-                    )
-                    apply_mesh_modifiers(export_obj)
-                    
-                    if scene_props.obj_export_triangulate:
-                        triangulate_mesh(
-                            export_obj,
-                            scene_props.obj_export_tri_method,
-                            scene_props.obj_export_keep_normals
-                        )
-
-                    file_path = os.path.join(export_base_path, base_name.replace('.obj', ''))
-                    if export_object(export_obj, file_path, scene_props):
-                        successful_exports += 1
-                    else:
-                        object_processed_successfully = False
-                        failed_exports.append(original_obj.name)
-
-                except Exception as e:
-                    object_processed_successfully = False
-                    log_name = export_obj_name if export_obj_name else original_obj.name
-                    logger.error(f"处理失败 {log_name}: {e}")
-                    failed_exports.append(f"{original_obj.name} (处理错误)")
-                    
-                finally:
-                    cleanup_object(export_obj, export_obj_name)
-
-                if not object_processed_successfully:
-                    overall_success = False
+            while not job.done:
+                wm.progress_update(job.index + 1)
+                job.export_next()
 
         finally:
             wm.progress_end()
+            job.finish()
 
-        # 报告结果
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        if overall_success:
-            msg = f"成功导出 {successful_exports} 个对象 (耗时 {duration:.2f}s)"
-            self.report({"INFO"}, msg)
-            logger.info(msg)
-        else:
-            msg = f"导出完成，但有错误。成功: {successful_exports}, 失败: {len(failed_exports)}"
+        self.report_job(job)
+        return {"FINISHED"}
+
+
+class OBJ_OT_batch_export(ObjBatchExportBase, Operator):
+    """批量导出选中的网格对象为OBJ格式"""
+    bl_idname = "obj.batch_export"
+    bl_label = "批量导出OBJ"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        return self.export_blocking(context)
+
+
+class OBJ_OT_batch_export_modal(ObjBatchExportBase, Operator):
+    """在后台分批导出选中的网格对象为OBJ格式，界面保持响应，按Esc取消"""
+    bl_idname = "obj.batch_export_modal"
+    bl_label = "后台批量导出OBJ"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # 每次计时器触发时的导出时长（秒）
+    time_slice: FloatProperty(default=0.1, min=0.01, options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        if context.window is None:
+            return self.export_blocking(context)
+
+        self.job = self.create_job(context)
+        if self.job is None:
+            return {"CANCELLED"}
+
+        wm = context.window_manager
+        wm.progress_begin(0, self.job.total)
+        self.timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        self.update_status(context)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        return self.export_blocking(context)
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.stop(context)
+            msg = f"导出已取消 ({self.job.index}/{self.job.total})"
             self.report({"WARNING"}, msg)
             logger.warning(msg)
-            if failed_exports:
-                logger.warning(f"失败的对象: {', '.join(failed_exports)}")
+            return {"CANCELLED"}
+
+        if event.type != 'TIMER' or event.timer != self.timer:
+            # 只放行视图导航事件，避免导出过程中编辑场景
+            if event.type in MODAL_PASS_THROUGH_EVENTS:
+                return {"PASS_THROUGH"}
+            return {"RUNNING_MODAL"}
 
+        slice_end = time.perf_counter() + self.time_slice
+        try:
+            while not self.job.done and time.perf_counter() < slice_end:
+                self.job.export_next()
+        except Exception as e:
+            self.stop(context)
+            msg = f"导出失败 ({self.job.index}/{self.job.total}): {e}"
+            self.report({"ERROR"}, msg)
+            logger.error(msg)
+            return {"CANCELLED"}
+
+        if not self.job.done:
+            context.window_manager.progress_update(self.job.index)
+            self.update_status(context)
+            return {"RUNNING_MODAL"}
+
+        self.stop(context)
+        self.report_job(self.job)
         return {"FINISHED"}
 
+    def update_status(self, context):
+        text = f"OBJ导出中 {self.job.index}/{self.job.total}  (Esc 取消)"
+        if context.area:
+            context.area.header_text_set(text)
+        if context.workspace:
+            context.workspace.status_text_set(text)
+
+    def stop(self, context):
+        """移除计时器并恢复界面（每个对象的临时副本在export_next中已清理）"""
+        wm = context.window_manager
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        if context.area:
+            context.area.header_text_set(None)
+        if context.workspace:
+            context.workspace.status_text_set(None)
+        self.job.finish()
+
 
 class OBJ_OT_open_export_directory(Operator):
     """打开导出目录"""
@@ -454,6 +872,11 @@ class OBJ_PT_export_panel(Panel):
         # 材质设置
         layout.prop(props, "obj_export_materials")
 
+        # 写入器和增量导出
+        layout.prop(props, "obj_export_writer")
+        layout.prop(props, "obj_export_force")
+        layout.prop(props, "obj_export_resume")
+
         # 三角化设置
         layout.prop(props, "obj_export_triangulate")
         if props.obj_export_triangulate:
@@ -472,6 +895,7 @@ class OBJ_PT_export_panel(Panel):
         selected_meshes = [obj for obj in context.selected_objects if obj.type == "MESH"]
         if selected_meshes:
             col.operator("obj.batch_export", text=f"导出选中的 {len(selected_meshes)} 个对象", icon="EXPORT")
+            col.operator("obj.batch_export_modal", text="后台导出（可按Esc取消）", icon="SORTTIME")
         else:
             col.operator("obj.batch_export", text="导出选中对象", icon="EXPORT")
             col.label(text="请选择要导出的网格对象", icon="INFO")
@@ -487,6 +911,7 @@ class OBJ_PT_export_panel(Panel):
 
 classes = (
     OBJ_OT_batch_export,
+    OBJ_OT_batch_export_modal,
     OBJ_OT_open_export_directory,
     OBJ_PT_export_panel,
 )
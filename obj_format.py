@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+OBJ/MTL格式化 / OBJ/MTL formatting
+
+obj_writer提取出的ObjMeshData的写入部分：只处理NumPy数组和字符串，
+不访问bpy，可以在写入线程中运行。
+"""
+
+import os
+import numpy as np
+from .export_journal import TEMP_SUFFIX, replace_atomic
+
+# 每次格式化/写入的行数
+WRITE_CHUNK_ROWS = 65536
+
+# 写入缓冲区大小
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+class ObjMeshData:
+    """从Blender网格提取出的导出数据（纯NumPy，不引用bpy对象）"""
+
+    def __init__(self):
+        self.name = ""
+        self.positions = None       # (V, 3) float64
+        self.normals = None         # (N, 3) 去重后的法线
+        self.uvs = None             # (T, 2) 去重后的UV，无UV层时为None
+        self.loop_vertex = None     # (L,) 每个角的顶点索引
+        self.loop_normal = None     # (L,) 每个角的法线索引
+        self.loop_uv = None         # (L,) 每个角的UV索引
+        self.loop_start = None      # (F,)
+        self.loop_total = None      # (F,)
+        self.face_material = None   # (F,)
+        self.face_smooth = None     # (F,) bool
+        self.material_names = []    # 材质槽名称（空槽为None）
+        self.materials = []         # [(名称, 漫反射颜色, 贴图路径)] 供MTL使用
+
+
+def write_rows(f, fmt, rows):
+    """按块格式化固定列数的数组（一次%格式化整个块）"""
+    for start in range(0, len(rows), WRITE_CHUNK_ROWS):
+        block = rows[start:start + WRITE_CHUNK_ROWS]
+        f.write((fmt * len(block)) % tuple(block.ravel().tolist()))
+
+
+def write_faces(f, data, face_indices):
+    """写入一组面，相同角数的面一起格式化"""
+    has_uv = data.loop_uv is not None
+    corner = " %d/%d/%d" if has_uv else " %d//%d"
+    totals = data.loop_total[face_indices]
+
+    for total in np.unique(totals):
+        faces = face_indices[totals == total]
+        loops = data.loop_start[faces][:, None] + np.arange(total)[None, :]
+        columns = [data.loop_vertex[loops] + 1]
+        if has_uv:
+            columns.append(data.loop_uv[loops] + 1)
+        columns.append(data.loop_normal[loops] + 1)
+        # (F, total, 2或3)：每个角的 v/vt/vn
+        rows = np.stack(columns, axis=2).reshape(len(faces), -1)
+        write_rows(f, "f" + corner * int(total) + "\n", rows)
+
+
+def write_obj(filepath, data, mtl_filename=None):
+    """把ObjMeshData流式写入OBJ文件（先写临时文件，完成后重命名）"""
+    temp_path = filepath + TEMP_SUFFIX
+    with open(temp_path, 'w', encoding='utf-8', newline='\n', buffering=WRITE_BUFFER_BYTES) as f:
+        f.write("# PopTools OBJ writer\n")
+        if mtl_filename:
+            f.write(f"mtllib {mtl_filename}\n")
+        f.write(f"o {data.name}\n")
+
+        write_rows(f, "v %.6f %.6f %.6f\n", data.positions)
+        if data.uvs is not None:
+            write_rows(f, "vt %.6f %.6f\n", data.uvs)
+        write_rows(f, "vn %.4f %.4f %.4f\n", data.normals)
+
+        # 按(材质, 平滑)分组写面
+        groups = data.face_material.astype(np.int64) * 2 + data.face_smooth
+        order = np.argsort(groups, kind='stable')
+        sorted_groups = groups[order]
+        boundaries = np.flatnonzero(np.diff(sorted_groups)) + 1
+        current_material = -1
+        for face_indices in np.split(order, boundaries):
+            if len(face_indices) == 0:
+                continue
+            material_index = int(data.face_material[face_indices[0]])
+            smooth = bool(data.face_smooth[face_indices[0]])
+            if material_index != current_material and material_index < len(data.material_names):
+                name = data.material_names[material_index]
+                f.write(f"usemtl {name if name else 'None'}\n")
+                current_material = material_index
+            f.write("s 1\n" if smooth else "s off\n")
+            write_faces(f, data, face_indices)
+    replace_atomic(temp_path, filepath)
+
+
+def write_mtl(filepath, data):
+    """写入MTL文件，贴图只写文件名（由TextureCopyCache复制到导出目录，与path_mode='STRIP'一致）"""
+    temp_path = filepath + TEMP_SUFFIX
+    with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("# PopTools MTL writer\n")
+        for name, color, texture in data.materials:
+            f.write(f"\nnewmtl {name}\n")
+            f.write("Ns 250.000000\nKa 1.000000 1.000000 1.000000\n")
+            f.write("Kd %.6f %.6f %.6f\n" % color)
+            f.write("Ks 0.500000 0.500000 0.500000\nd 1.000000\nillum 2\n")
+            if texture and os.path.exists(texture):
+                f.write(f"map_Kd {os.path.basename(texture)}\n")
+    replace_atomic(temp_path, filepath)
+
+
+def write_obj_files(export_filepath, data):
+    """写入OBJ（以及有材质时的MTL），OBJ最后落盘，存在即表示完整"""
+    mtl_filename = None
+    if data.materials:
+        mtl_path = os.path.splitext(export_filepath)[0] + ".mtl"
+        write_mtl(mtl_path, data)
+        mtl_filename = os.path.basename(mtl_path)
+    write_obj(export_filepath, data, mtl_filename)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+NumPy OBJ/MTL写入器 / NumPy streaming OBJ/MTL writer
+
+配方道具OBJ批量导出的替代写入器：不创建对象副本、不切换选择、不调用
+bpy.ops.wm.obj_export，直接用foreach_get读取评估后的网格数据，
+按块向量化格式化后通过缓冲写入磁盘。
+
+extract_mesh_data()必须在主线程调用（访问bpy），
+写入部分在obj_format中，只处理NumPy数组和字符串，可以在其他线程运行。
+"""
+
+import bpy
+import numpy as np
+from mathutils import Matrix
+from bpy_extras.io_utils import axis_conversion
+from . import utils
+from .obj_format import ObjMeshData, write_obj, write_mtl, write_obj_files
+
+# 去重法线/UV时的精度（小数位数，与写出的精度一致）
+NORMAL_DECIMALS = 4
+UV_DECIMALS = 6
+
+
+# ==================== 提取 / Extraction (main thread) ====================
+
+def get_export_matrix(obj, scene_props):
+    """导出矩阵：与create_export_copy + setup_export_object + obj_export的变换一致"""
+    location, rotation, scale = obj.matrix_basis.decompose()
+    if getattr(scene_props, 'obj_export_zero_location', False):
+        location = location * 0.0
+    export_scale = getattr(scene_props, 'obj_export_scale', 1.0)
+    basis = (Matrix.Translation(location) @ rotation.to_matrix().to_4x4()
+             @ Matrix.Diagonal((export_scale, export_scale, export_scale, 1.0)))
+
+    if obj.parent is not None:
+        matrix_world = obj.parent.matrix_world @ obj.matrix_parent_inverse @ basis
+    else:
+        matrix_world = basis
+
+    forward = getattr(scene_props, 'obj_export_coord_forward', '-Z')
+    up = getattr(scene_props, 'obj_export_coord_up', 'Y')
+    axis = axis_conversion(from_forward='Y', from_up='Z', to_forward=forward, to_up=up).to_4x4()
+    return Matrix.Scale(export_scale, 4) @ axis @ matrix_world
+
+
+def unique_rows(values, decimals):
+    """对行去重，返回(唯一行, 每行的索引)"""
+    rounded = np.round(values, decimals)
+    unique, inverse = np.unique(rounded, axis=0, return_inverse=True)
+    return unique, inverse.reshape(-1)
+
+
+def get_material_texture(material):
+    """返回连接到原理化BSDF基础色的图像文件路径"""
+    if not material.use_nodes or material.node_tree is None:
+        return None
+    for node in material.node_tree.nodes:
+        if node.type != 'BSDF_PRINCIPLED':
+            continue
+        base_color = node.inputs.get('Base Color')
+        if base_color is None or not base_color.is_linked:
+            return None
+        source = base_color.links[0].from_node
+        if source.type == 'TEX_IMAGE' and source.image is not None and source.image.filepath:
+            return bpy.path.abspath(source.image.filepath, library=source.image.library)
+        return None
+    return None
+
+
+def extract_mesh_data(obj, scene_props, depsgraph):
+    """读取对象评估后的网格（含修改器）并转换为ObjMeshData，必须在主线程调用"""
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = bpy.data.meshes.new_from_object(obj_eval, preserve_all_data_layers=True, depsgraph=depsgraph)
+    try:
+        if getattr(scene_props, 'obj_export_triangulate', False):
+            quad_method, ngon_method = utils.TRIANGULATE_METHODS.get(
+                scene_props.obj_export_tri_method, ('BEAUTY', 'BEAUTY'))
+            utils.triangulate_mesh_data(mesh, quad_method, ngon_method, scene_props.obj_export_keep_normals)
+
+        matrix = np.array(get_export_matrix(obj, scene_props), dtype=np.float64)
+        # 法线使用逆转置矩阵；负缩放时需要翻转面的顶点顺序
+        normal_matrix = np.linalg.inv(matrix[:3, :3]).T
+        flip = np.linalg.det(matrix[:3, :3]) < 0
+
+        vert_count = len(mesh.vertices)
+        loop_count = len(mesh.loops)
+        face_count = len(mesh.polygons)
+
+        data = ObjMeshData()
+        data.name = obj.name
+
+        co = np.empty(vert_count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+        co = co.reshape(-1, 3).astype(np.float64)
+        data.positions = co @ matrix[:3, :3].T + matrix[:3, 3]
+
+        data.loop_vertex = np.empty(loop_count, dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', data.loop_vertex)
+
+        normals = utils.get_corner_normals(mesh).astype(np.float64) @ normal_matrix.T
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals /= np.maximum(lengths, 1e-12)
+        data.normals, data.loop_normal = unique_rows(normals, NORMAL_DECIMALS)
+
+        uv_layer = mesh.uv_layers.active
+        if uv_layer is not None and loop_count:
+            uvs = np.empty(loop_count * 2, dtype=np.float32)
+            uv_layer.data.foreach_get('uv', uvs)
+            data.uvs, data.loop_uv = unique_rows(uvs.reshape(-1, 2), UV_DECIMALS)
+
+        data.loop_start = np.empty(face_count, dtype=np.int32)
+        data.loop_total = np.empty(face_count, dtype=np.int32)
+        data.face_material = np.empty(face_count, dtype=np.int32)
+        data.face_smooth = np.empty(face_count, dtype=bool)
+        mesh.polygons.foreach_get('loop_start', data.loop_start)
+        mesh.polygons.foreach_get('loop_total', data.loop_total)
+        mesh.polygons.foreach_get('material_index', data.face_material)
+        mesh.polygons.foreach_get('use_smooth', data.face_smooth)
+
+        if flip:
+            data.loop_vertex, data.loop_normal, data.loop_uv = reverse_face_loops(
+                data, data.loop_vertex, data.loop_normal, data.loop_uv)
+
+        for slot in obj.material_slots:
+            material = slot.material
+            data.material_names.append(material.name if material else None)
+            if material is not None and getattr(scene_props, 'obj_export_materials', True):
+                data.materials.append((material.name, tuple(material.diffuse_color[:3]),
+                                       get_material_texture(material)))
+        return data
+    finally:
+        bpy.data.meshes.remove(mesh)
+
+
+def reverse_face_loops(data, *loop_arrays):
+    """负缩放时反转每个面的角顺序（保持法线朝外）"""
+    loop_count = len(data.loop_vertex)
+    face_of_loop = np.repeat(np.arange(len(data.loop_start)), data.loop_total)
+    offset = np.arange(loop_count) - data.loop_start[face_of_loop]
+    order = data.loop_start[face_of_loop] + data.loop_total[face_of_loop] - 1 - offset
+    return tuple(None if array is None else array[order] for array in loop_arrays)
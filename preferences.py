@@ -293,6 +293,19 @@ class PopToolsPreferences(AddonPreferences):
         default=True
     )
     
+    # 数据块泄漏追踪
+    enable_leak_tracker: BoolProperty(
+        name="启用泄漏追踪",
+        description="记录每个PopTools操作符执行前后的数据块数量，输出增长并统计泄漏最多的操作符（有额外开销）",
+        default=False
+    )
+    
+    leak_tracker_tracemalloc: BoolProperty(
+        name="记录内存峰值",
+        description="同时用tracemalloc记录每次执行的Python内存峰值（开销较大）",
+        default=False
+    )
+    
     # 快捷键设置
     action_naming_hotkey: StringProperty(
         name="动作命名工具快捷键",
@@ -665,6 +678,10 @@ class PopToolsPreferences(AddonPreferences):
         col.prop(self, "enable_translation_tools", icon='FILE_TEXT')
         col.prop(self, "enable_action_naming_tools", icon='ACTION')
         
+        # 数据块泄漏追踪
+        from . import leak_tracker
+        leak_tracker.draw_preferences(self, layout)
+        
         # 快捷键设置
         box = layout.box()
         box.label(text="快捷键设置:", icon='KEYINGSET')
@@ -44,6 +44,17 @@ class ExportToolsSettings(bpy.types.PropertyGroup):
         default='FBX'
     )
     
+    # 导出引擎 / Export Engine
+    export_engine: EnumProperty(
+        name="",
+        description="选择导出引擎 / Select export engine",
+        items=[
+            ('DUPLICATE', "复制对象", "复制选中对象并在副本上应用修改器后导出"),
+            ('DEPSGRAPH', "依赖图(无复制)", "直接导出原对象，修改器结果从依赖图获取，不复制对象。合并网格或曲线/文本对象时自动回退到复制对象")
+        ],
+        default='DUPLICATE'
+    )
+    
     # 目标引擎 / Target Engine
     export_target_engine: EnumProperty(
         name="",
@@ -306,6 +317,41 @@ class ExportToolsSettings(bpy.types.PropertyGroup):
         default=""
     )
     
+    # 增量导出 / Incremental Export
+    export_force: BoolProperty(
+        name="强制全部导出 / Force Export",
+        description="忽略增量导出缓存，重新导出所有文件 / Ignore the incremental export cache and rewrite every file",
+        default=False
+    )
+    
+    # 并行导出 / Parallel Export
+    export_parallel: BoolProperty(
+        name="并行导出 / Parallel Export",
+        description="逐个导出模式下使用多个后台Blender进程并行导出 / Export objects with several background Blender processes in Individual mode",
+        default=False
+    )
+    
+    export_parallel_workers: IntProperty(
+        name="进程数 / Workers",
+        description="并行导出的进程数，0为物理核心数 / Number of worker processes, 0 uses the physical core count",
+        default=0,
+        min=0,
+        max=64
+    )
+    
+    # 导出性能分析 / Export Profiling
+    export_profiling: BoolProperty(
+        name="导出性能分析 / Export Profiling",
+        description="记录导出各阶段耗时，并在导出目录生成JSON/CSV报告 / Time each export stage and write a JSON/CSV report to the export directory",
+        default=False
+    )
+    
+    export_profile_summary: StringProperty(
+        name="性能分析摘要 / Profile Summary",
+        description="上次导出的分阶段耗时 / Stage timings of the last export",
+        default=""
+    )
+    
     # 调试模式 / Debug Mode (兼容性)
     # debug: BoolProperty(
     #     name="调试模式 / Debug Mode", 
@@ -337,6 +383,44 @@ class ReTexSettings(bpy.types.PropertyGroup):
         default='1024'
     )
     
+    # 多级分辨率输出：源纹理只解码一次，每个尺寸保存到各自的Small_<尺寸>文件夹
+    resize_pyramid: BoolProperty(
+        name="多级分辨率",
+        description="一次生成多个分辨率，分别保存到Small_1024、Small_512等文件夹（原纹理保持不变）",
+        default=False
+    )
+    
+    pyramid_sizes: EnumProperty(
+        items=[
+            ('128', '128', ''),
+            ('256', '256', ''),
+            ('512', '512', ''),
+            ('1024', '1024', '')
+        ],
+        name="输出分辨率",
+        description="多级分辨率模式下要生成的尺寸",
+        options={'ENUM_FLAG'},
+        default={'256', '512', '1024'}
+    )
+    
+    # 缩放过滤方式（从磁盘文件缩放时使用）
+    resize_filter: EnumProperty(
+        items=[
+            ('AREA', '区域平均', '按覆盖面积平均像素，缩小时稳定无锯齿'),
+            ('LANCZOS', 'Lanczos', 'Lanczos-3过滤，缩小后更锐利')
+        ],
+        name="缩放过滤",
+        description="从磁盘文件缩放纹理时使用的重采样过滤方式",
+        default='AREA'
+    )
+    
+    # 忽略缩放缓存
+    resize_force: BoolProperty(
+        name="忽略缓存",
+        description="重新缩放所有纹理，即使源文件和输出文件都没有变化",
+        default=False
+    )
+    
     # ItemLand输入框
     item_land: StringProperty(
         name="ItemLand",
@@ -567,6 +651,31 @@ class ObjExportSettings(bpy.types.PropertyGroup):
         description="导出前将对象副本的坐标归零",
         default=True
     )
+    
+    # 写入器
+    obj_export_writer: EnumProperty(
+        name="写入器",
+        description="OBJ文件的写入方式",
+        items=[
+            ('OPERATOR', "Blender导出器", "为每个对象创建副本并调用wm.obj_export"),
+            ('NUMPY', "NumPy写入器", "直接读取评估后的网格数据并批量格式化写入，适合大量小道具"),
+        ],
+        default='OPERATOR'
+    )
+
+    # 增量导出
+    obj_export_force: BoolProperty(
+        name="强制全部导出",
+        description="忽略增量导出缓存，重新导出所有对象（默认跳过内容和设置都未变化的对象）",
+        default=False
+    )
+
+    # 断点续传
+    obj_export_resume: BoolProperty(
+        name="从断点继续",
+        description="跳过上次中断的批量导出中已完成且输出文件未变化的对象（根据导出目录中的日志）",
+        default=False
+    )
 
 # Vertex Baker Properties
 class VertexBakerSettings(bpy.types.PropertyGroup):
@@ -580,10 +689,30 @@ class VertexBakerSettings(bpy.types.PropertyGroup):
         poll=lambda self, obj: obj.type == 'MESH'
     )
     
+    # 烘焙引擎
+    bake_engine: EnumProperty(
+        name="烘焙引擎",
+        description="选择权重烘焙的计算方式",
+        items=[
+            ('NUMPY', "NumPy稀疏", "向量化计算，每个顶点只保留最大的若干个影响"),
+            ('LEGACY', "逐顶点", "为每个顶点写入所有空物体的权重（旧方式）")
+        ],
+        default='NUMPY'
+    )
+    
+    # 每顶点最大影响数
+    max_influences: IntProperty(
+        name="最大影响数",
+        description="每个顶点保留的最大骨骼影响数（游戏引擎通常为4）",
+        default=4,
+        min=1,
+        max=16
+    )
+    
     # 烘焙精度
     bake_precision: FloatProperty(
         name="烘焙精度",
-        description="权重烘焙的精度设置",
+        description="权重截断阈值和量化步长（不能整除1时使用最接近的能整除1的步长），低于该值的影响会被丢弃",
         default=0.01,
         min=0.001,
         max=1.0
@@ -595,6 +724,49 @@ class VertexBakerSettings(bpy.types.PropertyGroup):
         description="烘焙完成后自动清理临时对象",
         default=True
     )
+    
+    # VAT输出路径
+    vat_output_path: StringProperty(
+        name="VAT输出路径",
+        description="顶点动画纹理和元数据的输出目录",
+        default="//VAT/",
+        subtype='DIR_PATH'
+    )
+    
+    # VAT帧范围
+    vat_use_scene_range: BoolProperty(
+        name="使用场景帧范围",
+        description="使用场景的起始帧和结束帧作为烘焙范围",
+        default=True
+    )
+    
+    vat_frame_start: IntProperty(
+        name="起始帧",
+        description="VAT烘焙的起始帧",
+        default=1
+    )
+    
+    vat_frame_end: IntProperty(
+        name="结束帧",
+        description="VAT烘焙的结束帧",
+        default=60
+    )
+    
+    # VAT法线纹理
+    vat_export_normals: BoolProperty(
+        name="导出法线纹理",
+        description="同时烘焙顶点法线纹理",
+        default=True
+    )
+    
+    # VAT分块帧数
+    vat_chunk_frames: IntProperty(
+        name="每块帧数",
+        description="每次写入磁盘的帧数，内存占用与该值成正比而与动画长度无关",
+        default=32,
+        min=1,
+        max=1024
+    )
 
 # Main PopTools Properties
 class PopToolsProperties(bpy.types.PropertyGroup):
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Resize Cache
+纹理缩放缓存：每个输出文件夹（Small、Small_<尺寸>）中保存一份清单，
+按源文件路径、大小、修改时间、目标分辨率和过滤方式记录输出文件，
+源文件和输出文件都未变化时跳过缩放，避免重写文件触发引擎重新导入
+"""
+
+import os
+import re
+import json
+
+MANIFEST_NAME = ".poptools_resize_manifest.json"
+
+# 清单格式版本，缩放算法变化时递增使旧清单失效
+MANIFEST_VERSION = 1
+
+# 缩放输出文件夹：Small（单一尺寸）和Small_<尺寸>（多级分辨率）
+OUTPUT_FOLDER_PATTERN = re.compile(r'^Small(_\d+)?$')
+
+
+def original_texture_path(path):
+    """缩放输出文件（Small/x.png、Small_512/x.png）对应的原始纹理路径，其他路径原样返回
+
+    缩放后图像重新链接到Small中的文件，再次缩放时仍以原始纹理作为缓存的源和输出位置，
+    不会生成Small/Small嵌套目录
+    """
+    path = os.path.normpath(path)
+    directory, name = os.path.split(path)
+    if OUTPUT_FOLDER_PATTERN.match(os.path.basename(directory)):
+        return os.path.join(os.path.dirname(directory), name)
+    return path
+
+
+def output_path(path, folder):
+    """纹理（或它的缩放输出）在输出文件夹folder中的路径"""
+    original = original_texture_path(path)
+    return os.path.join(os.path.dirname(original), folder, os.path.basename(original))
+
+
+def source_key(source, width, height, filter_type):
+    """缩放输入的描述，源文件不存在时返回None"""
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    return {
+        'source': os.path.normpath(source),
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'width': width,
+        'height': height,
+        'filter': filter_type,
+    }
+
+
+class ResizeCache:
+    """按输出文件夹分别保存的缩放清单"""
+
+    def __init__(self, force=False):
+        self.force = force
+        self.manifests = {}
+        self.dirty = set()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def get_entries(self, directory):
+        entries = self.manifests.get(directory)
+        if entries is not None:
+            return entries
+
+        entries = {}
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        self.manifests[directory] = entries
+        return entries
+
+    def is_valid(self, source, target, width, height, filter_type):
+        """清单中的输入与当前源文件一致，且输出文件未被外部修改，返回输出大小；否则返回None"""
+        if self.force:
+            return None
+        key = source_key(source, width, height, filter_type)
+        entry = self.get_entries(os.path.dirname(target)).get(os.path.basename(target))
+        if key is None or entry is None or entry.get('input') != key:
+            return None
+        try:
+            stat = os.stat(target)
+        except OSError:
+            return None
+        if stat.st_size != entry.get('size') or stat.st_mtime_ns != entry.get('mtime_ns'):
+            return None
+        return stat.st_size
+
+    def check(self, source, target, width, height, filter_type):
+        """检查并统计命中/未命中，命中时可以跳过缩放"""
+        size = self.is_valid(source, target, width, height, filter_type)
+        if size is None:
+            self.misses += 1
+            return False
+        self.hits += 1
+        self.bytes_saved += size
+        return True
+
+    def record(self, source, target, width, height, filter_type):
+        """输出文件写入完成后记录"""
+        key = source_key(source, width, height, filter_type)
+        try:
+            stat = os.stat(target)
+        except OSError:
+            return
+        if key is None:
+            return
+        directory = os.path.dirname(target)
+        self.get_entries(directory)[os.path.basename(target)] = {
+            'input': key,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+        self.dirty.add(directory)
+
+    def save(self):
+        for directory in self.dirty:
+            manifest_path = os.path.join(directory, MANIFEST_NAME)
+            temp_path = manifest_path + '.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': MANIFEST_VERSION, 'files': self.manifests[directory]},
+                              f, indent=1, sort_keys=True)
+                os.replace(temp_path, manifest_path)
+            except OSError as e:
+                print(f"PopTools: Failed to save resize manifest {manifest_path}: {e}")
+        self.dirty = set()
+
+    def summary(self):
+        return (f"缓存命中 {self.hits} 个, 未命中 {self.misses} 个, "
+                f"节省写入 {self.bytes_saved / (1024 * 1024):.1f} MB")
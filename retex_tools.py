@@ -10,18 +10,62 @@ Provides texture renaming, resizing and smart object renaming functionality.
 import bpy
 import os
 import re
+import sys
 import math
 from bpy.types import Operator, Panel
 from bpy.props import BoolProperty, EnumProperty, StringProperty
 
 # 导入工具函数
-from .utils import show_message_box, get_addon_preferences
+from .utils import show_message_box, get_addon_preferences, get_physical_core_count
+from . import batch_export
+from .resize_cache import ResizeCache, original_texture_path, output_path
+from . import texture_probe
+from . import texture_index
 from .translation_tools import translate_text_tool, ai_translate_text_tool
 
 # ============================================================================
 # 共享UI绘制函数 / Shared UI Drawing Functions
 # ============================================================================
 
+def format_bytes(size):
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def draw_texture_budget(layout, limit=5):
+    """纹理显存预算：场景总计和占用最多的对象、材质、纹理"""
+    layout.separator()
+    box = layout.box()
+    row = box.row()
+    row.label(text="纹理显存预算：", icon='TEXTURE')
+    row.operator("rt.texture_budget", text="统计", icon='FILE_REFRESH')
+
+    report = texture_probe.LAST_REPORT
+    if not report:
+        return
+
+    box.label(text=f"场景总计：{format_bytes(report['total'])}（{len(report['images'])} 张纹理）")
+    if report['unknown']:
+        box.label(text=f"无法读取文件头：{len(report['unknown'])} 张", icon='ERROR')
+
+    col = box.column(align=True)
+    col.label(text="对象：")
+    for name, size in sorted(report['objects'].items(), key=lambda item: item[1], reverse=True)[:limit]:
+        col.label(text=f"  {name}：{format_bytes(size)}")
+
+    col = box.column(align=True)
+    col.label(text="材质：")
+    for name, size in sorted(report['materials'].items(), key=lambda item: item[1], reverse=True)[:limit]:
+        col.label(text=f"  {name}：{format_bytes(size)}")
+
+    col = box.column(align=True)
+    col.label(text="纹理：")
+    images = [(name, info) for name, info in report['images'].items() if info]
+    images.sort(key=lambda item: item[1]['gpu_bytes'], reverse=True)
+    for name, info in images[:limit]:
+        col.label(text=f"  {name}：{info['width']}x{info['height']} {info['channels']}通道 "
+                       f"{info['bit_depth']}位，{format_bytes(info['gpu_bytes'])}")
+
+
 def draw_texture_manager_ui(layout, context, show_help_section=True, show_extended_features=False):
     """共享的纹理管理UI绘制函数
     
@@ -115,10 +159,21 @@ def draw_texture_manager_ui(layout, context, show_help_section=True, show_extend
         box = layout.box()
         box.label(text="纹理分辨率：")
         row = box.row()
-        row.prop(props, "resolution_preset", text="大小")
+        row.prop(props, "resize_pyramid")
+        row = box.row()
+        if props.resize_pyramid:
+            row.prop(props, "pyramid_sizes", expand=True)
+        else:
+            row.prop(props, "resolution_preset", text="大小")
+        row = box.row()
+        row.prop(props, "resize_filter", text="过滤")
+        row.prop(props, "resize_force")
         row = layout.row()
         row.operator("rt.resize_textures", text="调整纹理大小", icon='IMAGE_DATA')
         
+        # 纹理显存预算（只读取文件头）
+        draw_texture_budget(layout)
+        
         # 添加海岛配方道具智能重命名部分 - 可折叠
         layout.separator()
         island_box = layout.box()
@@ -463,28 +518,82 @@ class RT_OT_RenameTextures(Operator):
         
         renamed_count = 0
         
-        for obj in selected_objects:
-            if obj.type == 'MESH' and obj.data.materials:
-                for material in obj.data.materials:
-                    if material and material.use_nodes:
-                        for node in material.node_tree.nodes:
-                            if node.type == 'TEX_IMAGE' and node.image:
-                                old_name = node.image.name
-                                
-                                if props.replace_prefix:
-                                    # 替换为tex前缀
-                                    new_name = re.sub(r'^[^_]*_', 'tex_', old_name)
-                                else:
-                                    # 保持原有前缀
-                                    new_name = old_name
-                                
-                                if new_name != old_name:
-                                    node.image.name = new_name
-                                    renamed_count += 1
+        # 从纹理索引查询选中网格对象使用的所有图像（含节点组）
+        mesh_objects = [obj for obj in selected_objects if obj.type == 'MESH']
+        for image in texture_index.get_index().images_of_objects(mesh_objects):
+            old_name = image.name
+            
+            if props.replace_prefix:
+                # 替换为tex前缀
+                new_name = re.sub(r'^[^_]*_', 'tex_', old_name)
+            else:
+                # 保持原有前缀
+                new_name = old_name
+            
+            if new_name != old_name:
+                image.name = new_name
+                renamed_count += 1
         
+        texture_index.invalidate()
         show_message_box(f"成功重命名 {renamed_count} 个纹理", "重命名完成", 'INFO')
         return {'FINISHED'}
 
+# 少于该数量的纹理直接在当前进程中缩放（后台进程启动需要时间）
+PARALLEL_RESIZE_MIN_IMAGES = 4
+
+
+def get_source_path(image):
+    """缩放的源文件：已链接到Small中的图像使用原始纹理（原始纹理不存在时使用当前文件）"""
+    path = os.path.normpath(bpy.path.abspath(image.filepath, library=image.library))
+    original_path = original_texture_path(path)
+    if original_path != path and not os.path.isfile(original_path):
+        return path
+    return original_path
+
+
+def get_small_path(image):
+    """纹理在Small文件夹中的保存路径（没有文件路径时返回None）"""
+    original_path = bpy.path.abspath(image.filepath, library=image.library)
+    if not image.filepath or not original_path:
+        return None
+    return output_path(original_path, "Small")
+
+
+def get_tier_path(image, size):
+    """多级分辨率模式下某一级的保存路径：Small_<尺寸>/文件名"""
+    original_path = bpy.path.abspath(image.filepath, library=image.library)
+    if not image.filepath or not original_path:
+        return None
+    return output_path(original_path, f"Small_{size}")
+
+
+def can_resize_from_disk(image):
+    """磁盘上的文件与内存中的图像一致时可以交给后台进程处理"""
+    if image.source != 'FILE' or image.packed_file is not None or image.is_dirty:
+        return False
+    return os.path.isfile(bpy.path.abspath(image.filepath, library=image.library))
+
+
+def is_missing_file(image):
+    """未打包的文件图像在磁盘上不存在（不需要加载像素或reload()就能判断）"""
+    if image.source != 'FILE' or image.packed_file is not None:
+        return False
+    return not os.path.isfile(bpy.path.abspath(image.filepath, library=image.library))
+
+
+def relink_image(image, target):
+    """重新链接到缩放后的文件（与原来保存到Small文件夹后的状态一致）"""
+    image.filepath = target
+    image.reload()
+
+
+def run_resize_jobs(jobs):
+    """纹理较多时交给后台Blender进程并行处理，否则在当前进程中用同样的处理函数执行"""
+    workers = max(1, min(len(jobs), get_physical_core_count()))
+    return batch_export.run_jobs(jobs, sys.modules[__package__], bpy.app.binary_path,
+                                 workers=workers, min_parallel=PARALLEL_RESIZE_MIN_IMAGES)
+
+
 class RT_OT_ResizeTextures(Operator):
     """调整纹理大小 / Resize Textures"""
     bl_idname = "rt.resize_textures"
@@ -492,6 +601,205 @@ class RT_OT_ResizeTextures(Operator):
     bl_description = "将选定的纹理调整为指定的分辨率并自动保存到Small文件夹"
     bl_options = {'REGISTER', 'UNDO'}
 
+    def resize_from_disk(self, images, target_size, filter_type, cache):
+        """从磁盘读取并缩放纹理（缓存仍有效的直接复用），主线程只重新链接路径
+
+        返回(缩放的纹理数, 处理失败、需要用image.scale()缩放的图像列表)
+        """
+        jobs = []
+        job_images = []
+        for image in images:
+            source = get_source_path(image)
+            target = get_small_path(image)
+            if cache.check(source, target, target_size, target_size, filter_type):
+                relink_image(image, target)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            jobs.append({
+                "type": "resize_image",
+                "label": image.name,
+                "source": source,
+                "target": target,
+                "width": target_size,
+                "height": target_size,
+                "filter": filter_type,
+            })
+            job_images.append(image)
+
+        resized = 0
+        failed = []
+        for image, result in zip(job_images, run_resize_jobs(jobs)):
+            job = result["job"]
+            if result["ok"]:
+                cache.record(job["source"], job["target"], target_size, target_size, filter_type)
+                relink_image(image, job["target"])
+                resized += 1
+            else:
+                print(f"PopTools: Texture resize failed: {image.name}: {result['error']}")
+                failed.append(image)
+        return resized, failed
+
+    def pyramid_from_disk(self, images, sizes, filter_type, cache):
+        """每张纹理解码一次，只输出缓存失效的尺寸
+
+        返回(处理的纹理数, 保存的文件数, 处理失败的图像列表)
+        """
+        jobs = []
+        job_images = []
+        for image in images:
+            source = get_source_path(image)
+            targets = []
+            for size in sizes:
+                target = get_tier_path(image, size)
+                if cache.check(source, target, size, size, filter_type):
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                targets.append([size, size, target])
+            if not targets:
+                continue
+            jobs.append({
+                "type": "resize_pyramid",
+                "label": image.name,
+                "source": source,
+                "targets": targets,
+                "filter": filter_type,
+            })
+            job_images.append(image)
+
+        resized = 0
+        saved = 0
+        failed = []
+        for image, result in zip(job_images, run_resize_jobs(jobs)):
+            job = result["job"]
+            if result["ok"]:
+                for width, height, target in job["targets"]:
+                    cache.record(job["source"], target, width, height, filter_type)
+                resized += 1
+                saved += len(result["result"]["written"])
+            else:
+                print(f"PopTools: Texture pyramid failed: {image.name}: {result['error']}")
+                failed.append(image)
+        return resized, saved, failed
+
+    def pyramid_in_blender(self, image, sizes, errors):
+        """在当前进程中用图像副本逐级缩放（每一级以上一级为输入），返回(已缩放, 已保存, 已跳过)"""
+        if is_missing_file(image):
+            return 0, 0, 1
+        if not image.has_data:
+            try:
+                image.reload()
+            except:
+                pass
+            if not image.has_data:
+                return 0, 0, 1
+
+        saved = 0
+        # 在副本上缩放，原纹理保持不变
+        tier_image = image.copy()
+        try:
+            for size in sizes:
+                save_path = get_tier_path(image, size)
+                tier_image.scale(size, size)
+                if not save_path:
+                    continue
+                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                tier_image.filepath_raw = save_path
+                tier_image.save()
+                saved += 1
+        except Exception as e:
+            errors.append(f"处理失败：{image.name}\n错误信息：{str(e)}")
+            return 0, saved, 0
+        finally:
+            bpy.data.images.remove(tier_image)
+        return 1, saved, 0
+
+    def execute_pyramid(self, props, images_to_process):
+        """多级分辨率模式：每张纹理解码一次，输出所有勾选的尺寸"""
+        sizes = sorted((int(size) for size in props.pyramid_sizes), reverse=True)
+        if not sizes:
+            show_message_box("请至少选择一个输出分辨率", "警告", 'WARNING')
+            return {'CANCELLED'}
+
+        total_skipped = 0
+        errors = []
+        cache = ResizeCache(force=props.resize_force)
+
+        # 磁盘上的纹理从文件读取（可复用缓存），打包、生成或有未保存修改的在当前进程中用副本缩放
+        disk_images = [image for image in images_to_process if can_resize_from_disk(image)]
+        local_images = [image for image in images_to_process if image not in disk_images]
+        total_resized, total_saved, failed = self.pyramid_from_disk(disk_images, sizes, props.resize_filter, cache)
+        local_images.extend(failed)
+        cache.save()
+
+        for image in local_images:
+            resized, saved, skipped = self.pyramid_in_blender(image, sizes, errors)
+            total_resized += resized
+            total_saved += saved
+            total_skipped += skipped
+
+        size_text = "/".join(str(size) for size in sizes)
+        if total_resized > 0 or cache.hits > 0:
+            success_msg = f"成功为 {total_resized} 个纹理生成 {size_text} 分辨率，共保存 {total_saved} 个文件到Small_<尺寸>文件夹。"
+            success_msg += f"{cache.summary()}。"
+            if total_skipped > 0:
+                success_msg += f"跳过 {total_skipped} 个没有图像数据的纹理。"
+            show_message_box(success_msg, "调整完成", 'INFO')
+        elif total_skipped > 0:
+            show_message_box(f"没有纹理被调整，跳过了 {total_skipped} 个没有图像数据的纹理。", "警告", 'WARNING')
+        else:
+            show_message_box("没有找到需要调整的纹理", "提示", 'INFO')
+
+        if errors:
+            error_msg = "\n".join(errors)
+            show_message_box(f"错误信息：\n{error_msg}", "处理错误", 'ERROR')
+
+        return {'FINISHED'}
+
+    def resize_in_blender(self, image, target_size, errors):
+        """在当前进程中缩放并保存，返回(已缩放, 已保存, 已跳过)"""
+        if is_missing_file(image):
+            return 0, 0, 1
+        try:
+            # 检查图像是否有数据
+            if not image.has_data:
+                # 尝试重新加载图像
+                try:
+                    # 先卸载图像再重新加载
+                    image.reload()
+                except:
+                    pass
+                
+                # 再次检查图像是否有数据
+                if not image.has_data:
+                    return 0, 0, 1
+            
+            # 调整图像分辨率
+            image.scale(target_size, target_size)
+            
+            # 自动保存到Small文件夹
+            try:
+                save_path = get_small_path(image)
+                if save_path:
+                    # 创建Small文件夹（如果不存在）
+                    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                    
+                    # 保存图像
+                    image.filepath_raw = save_path
+                    image.save()
+                    return 1, 1, 0
+            except Exception as e:
+                errors.append(f"保存失败：{image.name}\n错误信息：{str(e)}")
+            return 1, 0, 0
+            
+        except Exception as e:
+            # 提供更详细的错误信息
+            error_msg = str(e)
+            if "does not have any image data" in error_msg:
+                errors.append(f"处理失败：{image.name}\n错误信息：图像没有数据，请确保图像已正确加载。尝试在Blender中打开图像编辑器并手动加载该图像。")
+            else:
+                errors.append(f"处理失败：{image.name}\n错误信息：{error_msg}")
+            return 0, 0, 0
+
     def execute(self, context):
         props = context.scene.poptools_props.retex_settings
         selected_objects = bpy.context.selected_objects
@@ -507,91 +815,41 @@ class RT_OT_ResizeTextures(Operator):
         # 获取目标分辨率
         target_size = int(props.resolution_preset)
 
-        # 处理的图像列表，用于避免重复处理同一图像
-        processed_images = set()
-
-        # 收集所有需要处理的图像
-        images_to_process = []
-        for obj in selected_objects:
-            if obj.material_slots:
-                material_slot = obj.material_slots[0]
-                material = material_slot.material
-                if material and material.node_tree:
-                    for node in material.node_tree.nodes:
-                        if node.type == 'TEX_IMAGE':
-                            image = node.image
-                            if image and image.name not in processed_images:
-                                # 记录已处理的图像
-                                processed_images.add(image.name)
-                                # 添加到待处理列表
-                                images_to_process.append(image)
+        # 从纹理索引收集所有需要处理的图像（所有材质槽和节点组，不重复）
+        images_to_process = texture_index.get_index().images_of_objects(selected_objects)
         
         # 如果没有找到任何图像，提前返回
         if not images_to_process:
             show_message_box("未找到任何可处理的纹理！请确保选中的对象包含有效的纹理。", "警告", 'WARNING')
             return {'CANCELLED'}
         
-        # 处理每个图像
-        for image in images_to_process:
-            try:
-                # 检查图像是否有数据
-                if not image.has_data:
-                    # 尝试重新加载图像
-                    try:
-                        # 先卸载图像再重新加载
-                        image.reload()
-                    except:
-                        pass
-                    
-                    # 再次检查图像是否有数据
-                    if not image.has_data:
-                        total_skipped += 1
-                        continue
-                
-                # 调整图像分辨率
-                image.scale(target_size, target_size)
-                total_resized += 1
-                
-                # 自动保存到Small文件夹
-                try:
-                    # 获取原始图像路径
-                    original_path = bpy.path.abspath(image.filepath)
-                    if original_path:
-                        # 获取文件名和扩展名
-                        filename = os.path.basename(original_path)
-                        directory = os.path.dirname(original_path)
-                        
-                        # 获取根目录
-                        root_dir = directory
+        if props.resize_pyramid:
+            return self.execute_pyramid(props, images_to_process)
+        
+        # 磁盘上的纹理从文件读取缩放（纹理较多时在后台进程中并行，可复用缓存），
+        # 其余（打包、生成、未保存修改的）在当前进程中用image.scale()处理
+        cache = ResizeCache(force=props.resize_force)
+        disk_images = [image for image in images_to_process if can_resize_from_disk(image)]
+        local_images = [image for image in images_to_process if image not in disk_images]
+        resized, failed = self.resize_from_disk(disk_images, target_size, props.resize_filter, cache)
+        total_resized += resized
+        total_saved += resized
+        local_images.extend(failed)
+        cache.save()
 
-                        # 创建Small文件夹（如果不存在）
-                        small_dir = os.path.join(root_dir, "Small")
-                        if not os.path.exists(small_dir):
-                            os.makedirs(small_dir)
-                        
-                        # 构建新的保存路径
-                        save_path = os.path.join(small_dir, filename)
-                        
-                        # 保存图像
-                        image.filepath_raw = save_path
-                        image.save()
-                        total_saved += 1
-                except Exception as e:
-                    errors.append(f"保存失败：{image.name}\n错误信息：{str(e)}")
-                
-            except Exception as e:
-                # 提供更详细的错误信息
-                error_msg = str(e)
-                if "does not have any image data" in error_msg:
-                    errors.append(f"处理失败：{image.name}\n错误信息：图像没有数据，请确保图像已正确加载。尝试在Blender中打开图像编辑器并手动加载该图像。")
-                else:
-                    errors.append(f"处理失败：{image.name}\n错误信息：{error_msg}")
+        # 处理每个图像
+        for image in local_images:
+            resized, saved, skipped = self.resize_in_blender(image, target_size, errors)
+            total_resized += resized
+            total_saved += saved
+            total_skipped += skipped
 
         # 操作完成后显示结果
-        if total_resized > 0:
+        if total_resized > 0 or cache.hits > 0:
             success_msg = f"成功调整 {total_resized} 个纹理的分辨率到 {target_size}x{target_size}！"
             if total_saved > 0:
                 success_msg += f"并保存 {total_saved} 个纹理到Small文件夹。"
+            success_msg += f"{cache.summary()}。"
             if total_skipped > 0:
                 success_msg += f"跳过 {total_skipped} 个没有图像数据的纹理。"
             show_message_box(success_msg, "调整完成", 'INFO')
@@ -606,6 +864,22 @@ class RT_OT_ResizeTextures(Operator):
 
         return {'FINISHED'}
 
+class RT_OT_TextureBudget(Operator):
+    """统计纹理显存 / Texture Budget"""
+    bl_idname = "rt.texture_budget"
+    bl_label = "统计纹理显存"
+    bl_description = "只读取纹理文件头（不加载像素），估算场景中每个对象和材质的纹理显存占用"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        report = texture_probe.build_inventory(context.scene.objects)
+        texture_probe.LAST_REPORT.clear()
+        texture_probe.LAST_REPORT.update(report)
+        self.report({'INFO'}, f"纹理显存估算：{format_bytes(report['total'])}，"
+                              f"{len(report['images'])} 张纹理，{len(report['unknown'])} 张无法读取")
+        return {'FINISHED'}
+
+
 class RT_OT_AddCustomBodyType(Operator):
     """添加自定义体型 / Add Custom Body Type"""
     bl_idname = "rt.add_custom_body_type"
@@ -657,75 +931,72 @@ class RT_OT_SetTexnameOfObject(Operator):
         errors = []
         props = context.scene.poptools_props.retex_settings
         
+        index = texture_index.get_index()
         for obj in selected_objects:
-            if obj.material_slots:
-                material_slot = obj.material_slots[0]
-                material = material_slot.material
-                if material and material.node_tree:
-                    for node in material.node_tree.nodes:
-                        if node.type == 'TEX_IMAGE':
-                            image = node.image
-                            if image:
-                                try:
-                                    # 获取图片文件路径
-                                    filepath = bpy.path.abspath(image.filepath)
-                                    if not filepath:
-                                        continue
-                                        
-                                    # 获取目录和扩展名
-                                    directory = os.path.dirname(filepath)
-                                    extension = os.path.splitext(filepath)[1]
-                                    
-                                    # 构建新的文件名
-                                    new_name = obj.name
-                                    
-                                    # 添加后缀（如果有的话）
-                                    if hasattr(props, 'texture_suffix') and props.texture_suffix:
-                                        new_name = f"{new_name}_{props.texture_suffix}"
-                                    
-                                    if props.replace_prefix:
-                                        # 检查是否已有前缀，如果有则替换为tex_，否则添加tex_前缀
-                                        prefix_match = re.match(r'^([a-zA-Z]+)_(.+)$', new_name)
-                                        if prefix_match:
-                                            # 替换现有前缀
-                                            new_name = "tex_" + prefix_match.group(2)
-                                        else:
-                                            # 添加前缀
-                                            new_name = "tex_" + new_name
-                                        
-                                    new_filepath = os.path.join(directory, new_name + extension)
-                                    
-                                    # 如果新文件名已存在，添加数字后缀
-                                    counter = 1
-                                    while os.path.exists(new_filepath) and new_filepath != filepath:
-                                        base_name = obj.name
-                                        new_name = f"{base_name}_{counter}"
-                                        
-                                        # 添加后缀（如果有的话）
-                                        if hasattr(props, 'texture_suffix') and props.texture_suffix:
-                                            new_name = f"{new_name}_{props.texture_suffix}"
-                                        
-                                        if props.replace_prefix:
-                                            # 检查是否已有前缀，如果有则替换为tex_，否则添加tex_前缀
-                                            prefix_match = re.match(r'^([a-zA-Z]+)_(.+)$', new_name)
-                                            if prefix_match:
-                                                # 替换现有前缀
-                                                new_name = "tex_" + prefix_match.group(2)
-                                            else:
-                                                # 添加前缀
-                                                new_name = "tex_" + new_name
-                                        new_filepath = os.path.join(directory, new_name + extension)
-                                        counter += 1
-                                    
-                                    # 重命名文件
-                                    if filepath != new_filepath:
-                                        os.rename(filepath, new_filepath)
-                                        image.filepath = new_filepath
-                                        image.name = new_name
-                                        total_renamed += 1
-                                        
-                                except Exception as e:
-                                    errors.append(f"重命名失败：{image.name}\n错误信息：{str(e)}")
+            # 从纹理索引查询对象所有材质槽（含节点组）使用的图像
+            for image in index.images_of_object(obj):
+                try:
+                    # 获取图片文件路径
+                    filepath = bpy.path.abspath(image.filepath)
+                    if not filepath:
+                        continue
+                    
+                    # 获取目录和扩展名
+                    directory = os.path.dirname(filepath)
+                    extension = os.path.splitext(filepath)[1]
+                
+                    # 构建新的文件名
+                    new_name = obj.name
+                
+                    # 添加后缀（如果有的话）
+                    if hasattr(props, 'texture_suffix') and props.texture_suffix:
+                        new_name = f"{new_name}_{props.texture_suffix}"
+                
+                    if props.replace_prefix:
+                        # 检查是否已有前缀，如果有则替换为tex_，否则添加tex_前缀
+                        prefix_match = re.match(r'^([a-zA-Z]+)_(.+)$', new_name)
+                        if prefix_match:
+                            # 替换现有前缀
+                            new_name = "tex_" + prefix_match.group(2)
+                        else:
+                            # 添加前缀
+                            new_name = "tex_" + new_name
+                    
+                    new_filepath = os.path.join(directory, new_name + extension)
+                
+                    # 如果新文件名已存在，添加数字后缀
+                    counter = 1
+                    while os.path.exists(new_filepath) and new_filepath != filepath:
+                        base_name = obj.name
+                        new_name = f"{base_name}_{counter}"
+                    
+                        # 添加后缀（如果有的话）
+                        if hasattr(props, 'texture_suffix') and props.texture_suffix:
+                            new_name = f"{new_name}_{props.texture_suffix}"
+                    
+                        if props.replace_prefix:
+                            # 检查是否已有前缀，如果有则替换为tex_，否则添加tex_前缀
+                            prefix_match = re.match(r'^([a-zA-Z]+)_(.+)$', new_name)
+                            if prefix_match:
+                                # 替换现有前缀
+                                new_name = "tex_" + prefix_match.group(2)
+                            else:
+                                # 添加前缀
+                                new_name = "tex_" + new_name
+                        new_filepath = os.path.join(directory, new_name + extension)
+                        counter += 1
+                
+                    # 重命名文件
+                    if filepath != new_filepath:
+                        os.rename(filepath, new_filepath)
+                        image.filepath = new_filepath
+                        image.name = new_name
+                        total_renamed += 1
+                    
+                except Exception as e:
+                    errors.append(f"重命名失败：{image.name}\n错误信息：{str(e)}")
+        
+        texture_index.invalidate()
         
         # 操作完成后显示结果
         if total_renamed > 0:
@@ -1722,6 +1993,7 @@ classes = [
     RT_OT_SmartRenameObjects,
     RT_OT_RenameTextures,
     RT_OT_ResizeTextures,
+    RT_OT_TextureBudget,
     RT_OT_AddCustomBodyType,
     RT_OT_SetTexnameOfObject,
     RT_OT_UnpackTextures,
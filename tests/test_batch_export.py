@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+batch_export.run_jobs: 后台进程和当前进程两种执行方式返回相同格式的结果
+（不需要Blender：后台进程由一个模拟工作进程协议的脚本代替）
+"""
+
+import importlib.util
+import os
+import stat
+import sys
+
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    "poptools_batch_export", os.path.join(PACKAGE_DIR, "batch_export.py"))
+batch_export = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(batch_export)
+
+# 模拟的Blender工作进程：忽略命令行参数，按协议回复每个任务
+FAKE_WORKER = '''#!{python}
+import json, sys
+MARKER = {marker!r}
+def send(message):
+    sys.stdout.write(MARKER + json.dumps(message) + "\\n")
+    sys.stdout.flush()
+send({{"type": "ready"}})
+for line in sys.stdin:
+    message = json.loads(line)
+    if message.get("type") == "quit":
+        break
+    job = message["job"]
+    if job.get("fail"):
+        send({{"type": "result", "id": message["id"], "ok": False, "error": "RuntimeError: failed",
+               "timings": {{}}}})
+    else:
+        send({{"type": "result", "id": message["id"], "ok": True, "result": {{"target": job["target"]}},
+               "timings": {{}}}})
+'''
+
+
+def make_jobs(count):
+    return [{"type": "resize_image", "label": f"tex_{i}", "source": f"src_{i}.png", "target": f"Small/tex_{i}.png",
+             "width": 256, "height": 256, "filter": "AREA"} for i in range(count)]
+
+
+def check_results(jobs, results):
+    assert len(results) == len(jobs)
+    for job, result in zip(jobs, results):
+        assert set(result) == {"job", "ok", "error", "result", "timings"}
+        assert result["job"] == job
+        assert result["ok"]
+        assert result["error"] is None
+        assert result["result"]["target"] == job["target"]
+
+
+@pytest.fixture
+def fake_blender(tmp_path):
+    if os.name == 'nt':
+        pytest.skip("shebang scripts are not executable on Windows")
+    path = tmp_path / "blender"
+    path.write_text(FAKE_WORKER.format(python=sys.executable, marker=batch_export.PROTOCOL_MARKER))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@pytest.fixture
+def inline_handler(monkeypatch):
+    def handler(job, package, timings):
+        if job.get("fail"):
+            raise RuntimeError("failed")
+        return {"target": job["target"]}
+
+    monkeypatch.setitem(batch_export.JOB_HANDLERS, "resize_image", handler)
+
+
+def test_run_jobs_parallel(fake_blender):
+    jobs = make_jobs(4)
+    results = batch_export.run_jobs(jobs, None, fake_blender, workers=2, min_parallel=4, timeout=30)
+    check_results(jobs, results)
+
+
+def test_run_jobs_inline(inline_handler):
+    jobs = make_jobs(3)
+    results = batch_export.run_jobs(jobs, None, "unused", workers=2, min_parallel=4)
+    check_results(jobs, results)
+
+
+def test_run_jobs_failures_have_same_shape(fake_blender, inline_handler):
+    jobs = make_jobs(4)
+    jobs[1]["fail"] = True
+
+    parallel = batch_export.run_jobs(jobs, None, fake_blender, workers=2, min_parallel=1, timeout=30)
+    inline = batch_export.run_jobs(jobs, None, fake_blender, workers=2, min_parallel=5)
+
+    for results in (parallel, inline):
+        assert [result["ok"] for result in results] == [True, False, True, True]
+        assert results[1]["job"] is jobs[1]
+        assert results[1]["error"] == "RuntimeError: failed"
+
+
+def test_run_jobs_empty():
+    assert batch_export.run_jobs([], None, "unused") == []
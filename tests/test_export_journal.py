@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+export_journal: 断点续传日志的读写和原子替换（纯Python，不需要Blender）
+"""
+
+import importlib.util
+import json
+import os
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    "poptools_export_journal", os.path.join(PACKAGE_DIR, "export_journal.py"))
+export_journal = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(export_journal)
+
+
+def export_file(filepath, data):
+    """与写入器一致：先写临时文件，完成后原子替换"""
+    temp_path = filepath + export_journal.TEMP_SUFFIX
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    export_journal.replace_atomic(temp_path, filepath)
+
+
+def test_replace_atomic_leaves_only_final_file(tmp_path):
+    filepath = str(tmp_path / "crate.obj")
+    export_file(filepath, b"old")
+    export_file(filepath, b"new")
+
+    assert sorted(os.listdir(tmp_path)) == ["crate.obj"]
+    with open(filepath, "rb") as f:
+        assert f.read() == b"new"
+
+
+def test_resume_round_trip(tmp_path):
+    journal = export_journal.ExportJournal(str(tmp_path))
+    for name in ("crate", "barrel"):
+        filepath = str(tmp_path / f"{name}.obj")
+        export_file(filepath, name.encode())
+        journal.record(name, filepath)
+
+    resumed = export_journal.ExportJournal(str(tmp_path), resume=True)
+    assert resumed.check("crate", str(tmp_path / "crate.obj"))
+    assert resumed.check("barrel", str(tmp_path / "barrel.obj"))
+    assert not resumed.check("lamp", str(tmp_path / "lamp.obj"))
+    assert resumed.resumed == ["crate", "barrel"]
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    journal = export_journal.ExportJournal(str(tmp_path))
+    for name in ("crate", "barrel"):
+        filepath = str(tmp_path / f"{name}.obj")
+        export_file(filepath, name.encode())
+        journal.record(name, filepath)
+
+    # 崩溃时最后一行只写了一半
+    journal_path = tmp_path / export_journal.JOURNAL_NAME
+    lines = journal_path.read_text(encoding="utf-8").splitlines()
+    journal_path.write_text(lines[0] + "\n" + lines[1][:len(lines[1]) // 2], encoding="utf-8")
+
+    resumed = export_journal.ExportJournal(str(tmp_path), resume=True)
+    assert list(resumed.entries) == ["crate"]
+    assert resumed.check("crate", str(tmp_path / "crate.obj"))
+    assert not resumed.check("barrel", str(tmp_path / "barrel.obj"))
+
+    # 续传后追加的记录在下一次读取时仍然有效
+    resumed.record("barrel", str(tmp_path / "barrel.obj"))
+    assert set(export_journal.ExportJournal(str(tmp_path), resume=True).entries) == {"crate", "barrel"}
+
+
+def test_changed_output_is_not_complete(tmp_path):
+    filepath = str(tmp_path / "crate.obj")
+    journal = export_journal.ExportJournal(str(tmp_path))
+    export_file(filepath, b"crate")
+    journal.record("crate", filepath)
+
+    # 大小相同但内容不同：哈希不一致
+    export_file(filepath, b"CRATE")
+    assert not export_journal.ExportJournal(str(tmp_path), resume=True).check("crate", filepath)
+    # 记录的文件名与当前输出不一致
+    assert not journal.is_complete("crate", str(tmp_path / "other.obj"))
+
+
+def test_new_batch_discards_journal(tmp_path):
+    filepath = str(tmp_path / "crate.obj")
+    export_file(filepath, b"crate")
+    export_journal.ExportJournal(str(tmp_path)).record("crate", filepath)
+
+    journal = export_journal.ExportJournal(str(tmp_path))
+    assert journal.entries == {}
+    assert not (tmp_path / export_journal.JOURNAL_NAME).exists()
+
+    journal.record("crate", filepath)
+    with open(tmp_path / export_journal.JOURNAL_NAME, encoding="utf-8") as f:
+        assert json.loads(f.readline())["object"] == "crate"
+    journal.remove()
+    assert not (tmp_path / export_journal.JOURNAL_NAME).exists()
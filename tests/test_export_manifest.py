@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+export_manifest: 增量导出清单的命中/未命中判断（纯Python，不需要Blender）
+"""
+
+import importlib.util
+import json
+import os
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    "poptools_export_manifest", os.path.join(PACKAGE_DIR, "export_manifest.py"))
+export_manifest = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(export_manifest)
+
+
+def export_file(path, data=b"fbx"):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def first_run(directory, filepath, fingerprint="fp-1"):
+    cache = export_manifest.ExportCache(directory)
+    assert not cache.check(filepath, fingerprint)
+    export_file(filepath)
+    cache.record(filepath, fingerprint)
+    cache.save()
+
+
+def test_unchanged_fingerprint_hits(tmp_path):
+    filepath = str(tmp_path / "crate.fbx")
+    first_run(str(tmp_path), filepath)
+
+    cache = export_manifest.ExportCache(str(tmp_path))
+    assert cache.check(filepath, "fp-1")
+    assert (cache.hits, cache.misses) == (["crate.fbx"], [])
+
+
+def test_changed_fingerprint_misses(tmp_path):
+    filepath = str(tmp_path / "crate.fbx")
+    first_run(str(tmp_path), filepath)
+
+    cache = export_manifest.ExportCache(str(tmp_path))
+    assert not cache.check(filepath, "fp-2")
+    assert not cache.check(str(tmp_path / "barrel.fbx"), "fp-1")
+    assert (cache.hits, cache.misses) == ([], ["crate.fbx", "barrel.fbx"])
+
+
+def test_force_always_misses(tmp_path):
+    filepath = str(tmp_path / "crate.fbx")
+    first_run(str(tmp_path), filepath)
+
+    cache = export_manifest.ExportCache(str(tmp_path), force=True)
+    assert not cache.check(filepath, "fp-1")
+
+
+def test_externally_modified_output_misses(tmp_path):
+    filepath = str(tmp_path / "crate.fbx")
+    first_run(str(tmp_path), filepath)
+
+    export_file(filepath, b"edited by hand")
+    cache = export_manifest.ExportCache(str(tmp_path))
+    assert not cache.check(filepath, "fp-1")
+
+    os.remove(filepath)
+    assert not cache.check(filepath, "fp-1")
+
+
+def test_other_manifest_version_is_ignored(tmp_path):
+    filepath = str(tmp_path / "crate.fbx")
+    first_run(str(tmp_path), filepath)
+
+    manifest_path = tmp_path / export_manifest.MANIFEST_NAME
+    data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    data["version"] = export_manifest.MANIFEST_VERSION - 1
+    manifest_path.write_text(json.dumps(data), encoding="utf-8")
+
+    cache = export_manifest.ExportCache(str(tmp_path))
+    assert cache.entries == {}
+    assert not cache.check(filepath, "fp-1")
+
+
+def test_save_without_records_writes_nothing(tmp_path):
+    cache = export_manifest.ExportCache(str(tmp_path))
+    cache.check(str(tmp_path / "crate.fbx"), "fp-1")
+    cache.save()
+    assert not (tmp_path / export_manifest.MANIFEST_NAME).exists()
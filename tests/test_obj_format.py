@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+obj_format: OBJ/MTL的格式化输出（纯NumPy，不需要Blender）
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 只注册包路径，不执行__init__.py（它需要bpy），相对导入从插件目录加载
+package = types.ModuleType("poptools")
+package.__path__ = [PACKAGE_DIR]
+sys.modules.setdefault("poptools", package)
+
+spec = importlib.util.spec_from_file_location(
+    "poptools.obj_format", os.path.join(PACKAGE_DIR, "obj_format.py"))
+obj_format = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(obj_format)
+
+
+def make_mesh(with_uv=True):
+    """一个四边形（材质0，平滑）和一个三角形（材质1，不平滑）"""
+    data = obj_format.ObjMeshData()
+    data.name = "Crate"
+    data.positions = np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0)], dtype=np.float64)
+    data.normals = np.array([(0, 0, 1)], dtype=np.float64)
+    data.loop_vertex = np.array([0, 1, 2, 3, 1, 4, 2])
+    data.loop_normal = np.zeros(7, dtype=np.int64)
+    if with_uv:
+        data.uvs = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=np.float64)
+        data.loop_uv = np.array([0, 1, 2, 3, 0, 1, 2])
+    data.loop_start = np.array([0, 4])
+    data.loop_total = np.array([4, 3])
+    data.face_material = np.array([0, 1])
+    data.face_smooth = np.array([True, False])
+    data.material_names = ["Wood", None]
+    return data
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_write_obj_formats_vertices_and_faces(tmp_path):
+    path = str(tmp_path / "crate.obj")
+    obj_format.write_obj(path, make_mesh(), "crate.mtl")
+
+    assert read_lines(path) == [
+        "# PopTools OBJ writer",
+        "mtllib crate.mtl",
+        "o Crate",
+        "v 0.000000 0.000000 0.000000",
+        "v 1.000000 0.000000 0.000000",
+        "v 1.000000 1.000000 0.000000",
+        "v 0.000000 1.000000 0.000000",
+        "v 2.000000 0.000000 0.000000",
+        "vt 0.000000 0.000000",
+        "vt 1.000000 0.000000",
+        "vt 1.000000 1.000000",
+        "vt 0.000000 1.000000",
+        "vn 0.0000 0.0000 1.0000",
+        "usemtl Wood",
+        "s 1",
+        "f 1/1/1 2/2/1 3/3/1 4/4/1",
+        "usemtl None",
+        "s off",
+        "f 2/1/1 5/2/1 3/3/1",
+    ]
+    assert not os.path.exists(path + obj_format.TEMP_SUFFIX)
+
+
+def test_write_obj_without_uvs(tmp_path):
+    path = str(tmp_path / "crate.obj")
+    obj_format.write_obj(path, make_mesh(with_uv=False))
+
+    lines = read_lines(path)
+    assert not any(line.startswith(("mtllib", "vt ")) for line in lines)
+    assert "f 1//1 2//1 3//1 4//1" in lines
+    assert "f 2//1 5//1 3//1" in lines
+
+
+def test_write_obj_groups_faces_by_material_and_smoothing(tmp_path):
+    data = make_mesh()
+    # 同一材质的面分散在不同位置时仍只切换一次材质
+    data.loop_start = np.array([0, 4, 0])
+    data.loop_total = np.array([4, 3, 4])
+    data.face_material = np.array([0, 1, 0])
+    data.face_smooth = np.array([True, False, True])
+    path = str(tmp_path / "crate.obj")
+    obj_format.write_obj(path, data)
+
+    lines = read_lines(path)
+    assert lines.count("usemtl Wood") == 1
+    assert lines.count("f 1/1/1 2/2/1 3/3/1 4/4/1") == 2
+
+
+def test_write_mtl_only_references_existing_textures(tmp_path):
+    texture = tmp_path / "source" / "wood.png"
+    texture.parent.mkdir()
+    texture.write_bytes(b"png")
+    data = make_mesh()
+    data.materials = [("Wood", (0.5, 0.25, 1.0), str(texture)),
+                      ("Missing", (1.0, 1.0, 1.0), str(tmp_path / "missing.png"))]
+    path = str(tmp_path / "crate.mtl")
+    obj_format.write_mtl(path, data)
+
+    lines = read_lines(path)
+    assert "newmtl Wood" in lines
+    assert "Kd 0.500000 0.250000 1.000000" in lines
+    assert lines.count("map_Kd wood.png") == 1
+    assert "newmtl Missing" in lines
+    # 贴图由TextureCopyCache复制，写入器不复制
+    assert not (tmp_path / "wood.png").exists()
+
+
+def test_write_obj_files_writes_mtl_only_with_materials(tmp_path):
+    data = make_mesh()
+    path = str(tmp_path / "crate.obj")
+    obj_format.write_obj_files(path, data)
+    assert not (tmp_path / "crate.mtl").exists()
+    assert "mtllib crate.mtl" not in read_lines(path)
+
+    data.materials = [("Wood", (1.0, 1.0, 1.0), None)]
+    obj_format.write_obj_files(path, data)
+    assert (tmp_path / "crate.mtl").exists()
+    assert read_lines(path)[1] == "mtllib crate.mtl"
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+resize_cache: 缩放清单的命中判断和Small文件夹路径映射（纯Python，不需要Blender）
+"""
+
+import importlib.util
+import os
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    "poptools_resize_cache", os.path.join(PACKAGE_DIR, "resize_cache.py"))
+resize_cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(resize_cache)
+
+
+def write_file(path, data=b"pixels"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_original_texture_path_maps_output_folders(tmp_path):
+    source = str(tmp_path / "textures" / "wood.png")
+    assert resize_cache.original_texture_path(source) == os.path.normpath(source)
+    for folder in ("Small", "Small_512", "Small_2048"):
+        resized = str(tmp_path / "textures" / folder / "wood.png")
+        assert resize_cache.original_texture_path(resized) == os.path.normpath(source)
+    # 只匹配完整的输出文件夹名称
+    other = str(tmp_path / "textures" / "Smaller" / "wood.png")
+    assert resize_cache.original_texture_path(other) == os.path.normpath(other)
+
+
+def test_output_path_is_never_nested(tmp_path):
+    source = str(tmp_path / "textures" / "wood.png")
+    small = resize_cache.output_path(source, "Small")
+    assert small == os.path.join(str(tmp_path / "textures"), "Small", "wood.png")
+    assert resize_cache.output_path(small, "Small") == small
+    assert resize_cache.output_path(small, "Small_256") == os.path.join(
+        str(tmp_path / "textures"), "Small_256", "wood.png")
+
+
+def test_rerun_after_relink_hits_cache(tmp_path):
+    source = str(tmp_path / "textures" / "wood.png")
+    write_file(source)
+
+    # 第一次运行：缩放到Small并记录，图像随后重新链接到Small中的文件
+    target = resize_cache.output_path(source, "Small")
+    cache = resize_cache.ResizeCache()
+    assert not cache.check(source, target, 512, 512, "AREA")
+    write_file(target, b"small")
+    cache.record(source, target, 512, 512, "AREA")
+    cache.save()
+
+    # 第二次运行：图像路径是Small/wood.png，仍映射回原始纹理和同一个输出
+    relinked = target
+    rerun_source = resize_cache.original_texture_path(relinked)
+    rerun_target = resize_cache.output_path(relinked, "Small")
+    assert (rerun_source, rerun_target) == (os.path.normpath(source), target)
+
+    cache = resize_cache.ResizeCache()
+    assert cache.check(rerun_source, rerun_target, 512, 512, "AREA")
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert not os.path.exists(os.path.join(os.path.dirname(target), "Small"))
+
+
+def resize_once(source, target, cache=None):
+    cache = cache or resize_cache.ResizeCache()
+    cache.check(source, target, 512, 512, "AREA")
+    write_file(target, b"small")
+    cache.record(source, target, 512, 512, "AREA")
+    cache.save()
+
+
+def test_unchanged_source_hits(tmp_path):
+    source = str(tmp_path / "wood.png")
+    target = resize_cache.output_path(source, "Small")
+    write_file(source)
+    resize_once(source, target)
+
+    cache = resize_cache.ResizeCache()
+    assert cache.check(source, target, 512, 512, "AREA")
+    assert (cache.hits, cache.misses, cache.bytes_saved) == (1, 0, len(b"small"))
+
+
+def test_changed_input_misses(tmp_path):
+    source = str(tmp_path / "wood.png")
+    target = resize_cache.output_path(source, "Small")
+    write_file(source)
+    resize_once(source, target)
+
+    cache = resize_cache.ResizeCache()
+    # 不同的尺寸或过滤方式
+    assert not cache.check(source, target, 256, 256, "AREA")
+    assert not cache.check(source, target, 512, 512, "BOX")
+    # 源文件被修改
+    write_file(source, b"new pixels")
+    assert not cache.check(source, target, 512, 512, "AREA")
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_modified_or_missing_output_misses(tmp_path):
+    source = str(tmp_path / "wood.png")
+    target = resize_cache.output_path(source, "Small")
+    write_file(source)
+    resize_once(source, target)
+
+    write_file(target, b"edited by hand")
+    assert not resize_cache.ResizeCache().check(source, target, 512, 512, "AREA")
+    os.remove(target)
+    assert not resize_cache.ResizeCache().check(source, target, 512, 512, "AREA")
+
+
+def test_force_always_misses(tmp_path):
+    source = str(tmp_path / "wood.png")
+    target = resize_cache.output_path(source, "Small")
+    write_file(source)
+    resize_once(source, target)
+
+    cache = resize_cache.ResizeCache(force=True)
+    assert not cache.check(source, target, 512, 512, "AREA")
+    # 强制重新缩放后仍会记录，下次不强制时命中
+    resize_once(source, target, cache)
+    assert resize_cache.ResizeCache().check(source, target, 512, 512, "AREA")
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+texture_headers: 从PNG/JPEG/TGA/EXR文件头读取尺寸、通道数和位深（纯Python，不需要Blender）
+"""
+
+import importlib.util
+import io
+import os
+import struct
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    "poptools_texture_headers", os.path.join(PACKAGE_DIR, "texture_headers.py"))
+texture_headers = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(texture_headers)
+
+
+def png_header(width, height, bit_depth, color_type):
+    ihdr = struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0)
+    return texture_headers.PNG_SIGNATURE + struct.pack('>I', len(ihdr)) + b'IHDR' + ihdr + b'\0' * 4
+
+
+def jpeg_header(width, height, components):
+    app0 = b'JFIF\0' + b'\x01\x01\0\0\x01\0\x01\0\0'
+    sof0 = struct.pack('>BHHB', 8, height, width, components) + b'\0' * 3 * components
+    return (b'\xff\xd8'
+            + b'\xff\xe0' + struct.pack('>H', len(app0) + 2) + app0
+            + b'\xff\xc4' + struct.pack('>H', 5) + b'\0\0\0'
+            + b'\xff\xc0' + struct.pack('>H', len(sof0) + 2) + sof0
+            + b'\xff\xda')
+
+
+def tga_header(width, height, image_type, pixel_depth, descriptor=0, colormap_depth=0):
+    return struct.pack('<BBBHHBHHHHBB', 0, 1 if colormap_depth else 0, image_type, 0, 0, colormap_depth,
+                       0, 0, width, height, pixel_depth, descriptor)
+
+
+def exr_attribute(name, attr_type, data):
+    return name.encode() + b'\0' + attr_type.encode() + b'\0' + struct.pack('<i', len(data)) + data
+
+
+def exr_header(width, height, channels):
+    chlist = b''.join(name.encode() + b'\0' + struct.pack('<iB3xii', pixel_type, 0, 1, 1)
+                      for name, pixel_type in channels) + b'\0'
+    return (texture_headers.EXR_MAGIC + struct.pack('<I', 2)
+            + exr_attribute('compression', 'compression', b'\x03')
+            + exr_attribute('channels', 'chlist', chlist)
+            + exr_attribute('dataWindow', 'box2i', struct.pack('<iiii', 0, 0, width - 1, height - 1))
+            + b'\0')
+
+
+def probe(data, extension):
+    return texture_headers.probe_stream(io.BytesIO(data), extension)
+
+
+def summary(info):
+    return (info['width'], info['height'], info['channels'], info['bit_depth'], info['format'])
+
+
+def test_png():
+    assert summary(probe(png_header(1024, 512, 8, 6), '.png')) == (1024, 512, 4, 8, 'PNG')
+    assert summary(probe(png_header(64, 32, 16, 2), '.png')) == (64, 32, 3, 16, 'PNG')
+    # 调色板图像按8位RGB计算
+    assert summary(probe(png_header(16, 16, 4, 3), '.png')) == (16, 16, 3, 8, 'PNG')
+
+
+def test_jpeg_skips_segments_before_frame_header():
+    assert summary(probe(jpeg_header(800, 600, 3), '.jpg')) == (800, 600, 3, 8, 'JPEG')
+    assert summary(probe(jpeg_header(256, 128, 1), '.jpeg')) == (256, 128, 1, 8, 'JPEG')
+
+
+def test_tga():
+    assert summary(probe(tga_header(256, 128, 2, 32, 8), '.tga')) == (256, 128, 4, 8, 'TARGA')
+    assert summary(probe(tga_header(256, 128, 10, 24), '.tga')) == (256, 128, 3, 8, 'TARGA')
+    assert summary(probe(tga_header(64, 64, 3, 8), '.tga')) == (64, 64, 1, 8, 'TARGA')
+    assert summary(probe(tga_header(64, 64, 1, 8, colormap_depth=32), '.tga')) == (64, 64, 4, 8, 'TARGA')
+
+
+def test_exr_uses_widest_channel_type():
+    half_rgba = [('A', 1), ('B', 1), ('G', 1), ('R', 1)]
+    assert summary(probe(exr_header(2048, 1024, half_rgba), '.exr')) == (2048, 1024, 4, 16, 'OPEN_EXR')
+    mixed = [('Y', 1), ('Z', 2)]
+    assert summary(probe(exr_header(32, 16, mixed), '.exr')) == (32, 16, 2, 32, 'OPEN_EXR')
+
+
+def test_unknown_extension_tries_magic_numbers():
+    assert probe(png_header(8, 8, 8, 0), '')['format'] == 'PNG'
+    assert probe(jpeg_header(8, 8, 3), '.jfif')['format'] == 'JPEG'
+    assert probe(exr_header(8, 8, [('R', 2)]), '')['format'] == 'OPEN_EXR'
+
+
+def test_truncated_or_invalid_headers_return_none():
+    assert probe(png_header(8, 8, 8, 6)[:20], '.png') is None
+    assert probe(jpeg_header(8, 8, 3)[:30], '.jpg') is None
+    assert probe(b'\0' * 10, '.tga') is None
+    assert probe(tga_header(0, 0, 2, 24), '.tga') is None
+    assert probe(exr_header(8, 8, [('R', 1)])[:40], '.exr') is None
+    assert probe(b'not an image', '.png') is None
+
+
+def test_probe_file_caches_by_mtime_and_size(tmp_path):
+    path = tmp_path / "wood.png"
+    path.write_bytes(png_header(128, 128, 8, 6))
+    assert texture_headers.probe_file(str(path))['width'] == 128
+
+    path.write_bytes(png_header(64, 64, 8, 6) + b'\0')
+    assert texture_headers.probe_file(str(path))['width'] == 64
+    assert texture_headers.probe_file(str(tmp_path / "missing.png")) is None
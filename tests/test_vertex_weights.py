@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+vertex_weights: 稀疏顶点权重和量化，每个顶点的权重和恰好为1（纯NumPy，不需要Blender）
+"""
+
+import importlib.util
+import os
+
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    "poptools_vertex_weights", os.path.join(PACKAGE_DIR, "vertex_weights.py"))
+vertex_weights = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(vertex_weights)
+
+
+def test_quantize_levels_rounds_to_divisor_of_one():
+    assert vertex_weights.quantize_levels(0.01) == 100
+    assert vertex_weights.quantize_levels(0.3) == 3
+    assert vertex_weights.quantize_levels(2.0) == 1
+
+
+def test_quantize_weights_rows_sum_to_levels():
+    weights = np.array([
+        [0.5, 0.5, 0.0],
+        [1 / 3, 1 / 3, 1 / 3],
+        [0.7, 0.2, 0.1],
+        [1.0, 0.0, 0.0],
+    ])
+    for levels in (3, 7, 100):
+        buckets = vertex_weights.quantize_weights(weights, levels)
+        assert buckets.dtype == np.int32
+        assert (buckets.sum(axis=1) == levels).all()
+        # 最大余数法：每个桶与精确值相差不到一级
+        assert (np.abs(buckets - weights * levels) < 1).all()
+
+    # 直接四舍五入时0.5/0.5在3级下都是2，和为4
+    assert sorted(vertex_weights.quantize_weights(weights[:1], 3)[0]) == [0, 1, 2]
+
+
+def test_compute_sparse_weights_rows_sum_to_one():
+    rng = np.random.default_rng(7)
+    verts = rng.uniform(-5, 5, (500, 3))
+    empties = rng.uniform(-5, 5, (9, 3))
+    precision = 0.01
+    levels = vertex_weights.quantize_levels(precision)
+
+    group_indices, buckets = vertex_weights.compute_sparse_weights(verts, empties, 4, precision)
+
+    assert group_indices.shape == buckets.shape == (500, 4)
+    assert (buckets.sum(axis=1) == levels).all()
+    assert ((group_indices >= 0) & (group_indices < 9)).all()
+    # 每个顶点的影响来自不同的空物体，最近的空物体始终保留
+    assert all(len(set(row)) == 4 for row in group_indices)
+    nearest = np.linalg.norm(verts[:, None] - empties[None], axis=2).argmin(axis=1)
+    strongest = group_indices[np.arange(500), buckets.argmax(axis=1)]
+    assert (strongest == nearest).all()
+
+
+def test_compute_sparse_weights_chunks_match_single_block(monkeypatch):
+    rng = np.random.default_rng(3)
+    verts = rng.uniform(-1, 1, (300, 3))
+    empties = rng.uniform(-1, 1, (5, 3))
+    expected = vertex_weights.compute_sparse_weights(verts, empties, 3, 0.05)
+
+    # 每块只有几行时结果不变
+    monkeypatch.setattr(vertex_weights, "WEIGHT_CHUNK_BYTES", 5 * 8 * 4 * 7)
+    chunked = vertex_weights.compute_sparse_weights(verts, empties, 3, 0.05)
+    for a, b in zip(expected, chunked):
+        assert (a == b).all()
+
+
+def test_fewer_empties_than_influences():
+    verts = np.array([[0.0, 0.0, 0.0], [1000.0, 0.0, 0.0]])
+    empties = np.array([[0.0, 0.0, 0.0], [1000.0, 0.0, 0.0]])
+    group_indices, buckets = vertex_weights.compute_sparse_weights(verts, empties, 4, 0.01)
+
+    assert buckets.shape == (2, 2)
+    assert (buckets.sum(axis=1) == 100).all()
+    # 远处的影响归一化后低于精度被丢弃，只剩最近的空物体
+    assert buckets[0, list(group_indices[0]).index(0)] == 100
+    assert buckets[1, list(group_indices[1]).index(1)] == 100
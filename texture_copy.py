@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Texture Copy Cache
+批量导出的贴图复制缓存：同一批次中每张贴图只复制一次，
+目标目录中已有相同副本时跳过，复制在后台线程池中与网格导出并行进行
+"""
+
+import bpy
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .export_journal import TEMP_SUFFIX
+
+COPY_THREADS = 2
+
+
+def get_node_tree_images(node_tree, images, visited):
+    """把节点树（含节点组）中所有有文件路径的图像加入images"""
+    if node_tree is None or node_tree.name in visited:
+        return
+    visited.add(node_tree.name)
+    for node in node_tree.nodes:
+        if node.type == 'TEX_IMAGE' and node.image is not None and node.image.source == 'FILE':
+            images.append(node.image)
+        elif node.type == 'GROUP':
+            get_node_tree_images(node.node_tree, images, visited)
+
+
+def get_material_images(obj):
+    """对象材质节点树（含节点组）中所有有文件路径的图像"""
+    images = []
+    visited = set()
+    for slot in obj.material_slots:
+        material = slot.material
+        if material is not None and material.use_nodes:
+            get_node_tree_images(material.node_tree, images, visited)
+    return images
+
+
+def get_image_path(image):
+    return os.path.normpath(bpy.path.abspath(image.filepath, library=image.library))
+
+
+class TextureCopyCache:
+    """按(源路径, mtime, 大小)去重的贴图复制"""
+
+    def __init__(self, directory, threads=COPY_THREADS):
+        self.directory = directory
+        self.requested = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="poptools_texture_copy")
+        self.futures = []
+
+        self.copied = 0
+        self.copied_bytes = 0
+        self.existing = 0
+        self.duplicates = 0
+        self.errors = []
+
+    def request(self, source):
+        """请求复制一张贴图，返回目标文件名；源文件不存在时返回None"""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            self.errors.append(f"{source}: 文件不存在")
+            return None
+
+        key = (source, stat.st_mtime_ns, stat.st_size)
+        name = os.path.basename(source)
+        if key in self.requested:
+            self.duplicates += 1
+            return name
+        self.requested[key] = name
+
+        target = os.path.join(self.directory, name)
+        if self.is_identical(target, stat):
+            self.existing += 1
+            return name
+
+        self.futures.append(self.executor.submit(self.copy, source, target, stat.st_size))
+        return name
+
+    def request_object(self, obj):
+        """请求复制对象材质使用的所有贴图"""
+        for image in get_material_images(obj):
+            self.request(get_image_path(image))
+
+    @staticmethod
+    def is_identical(target, source_stat):
+        """目标文件大小和修改时间相同（copy2会保留修改时间）"""
+        try:
+            stat = os.stat(target)
+        except OSError:
+            return False
+        return stat.st_size == source_stat.st_size and stat.st_mtime_ns == source_stat.st_mtime_ns
+
+    def copy(self, source, target, size):
+        temp_path = target + TEMP_SUFFIX
+        try:
+            shutil.copy2(source, temp_path)
+            os.replace(temp_path, target)
+        except OSError as e:
+            with self.lock:
+                self.errors.append(f"{source}: {e}")
+            return
+        with self.lock:
+            self.copied += 1
+            self.copied_bytes += size
+
+    def finish(self):
+        """等待所有复制完成"""
+        for future in self.futures:
+            future.result()
+        self.futures = []
+        self.executor.shutdown()
+
+    def summary(self):
+        return (f"贴图复制: 复制 {self.copied} 张 ({self.copied_bytes / (1024 * 1024):.1f} MB), "
+                f"已存在 {self.existing} 张, 重复引用 {self.duplicates} 次 / "
+                f"Textures: {self.copied} copied, {self.existing} up to date, {self.duplicates} shared")
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Texture Headers
+PNG/JPG/TGA/EXR文件头解析：不加载像素获取尺寸、通道数和位深（不依赖Blender）
+"""
+
+import os
+import struct
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+EXR_MAGIC = b'\x76\x2f\x31\x01'
+
+# PNG颜色类型 -> 通道数（调色板图像按RGB计算）
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+# JPEG中表示帧头（SOF）的标记，C4/C8/CC是其他用途
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# EXR像素类型 -> 位深（UINT, HALF, FLOAT）
+EXR_BIT_DEPTHS = {0: 32, 1: 16, 2: 32}
+
+# (路径, mtime, 大小) -> 文件头信息
+PROBE_CACHE = {}
+
+
+# ==================== 文件头解析 / Header Parsing ====================
+
+def texture_info(width, height, channels, bit_depth, file_format):
+    return {
+        'width': width,
+        'height': height,
+        'channels': channels,
+        'bit_depth': bit_depth,
+        'format': file_format,
+    }
+
+
+def probe_png(f):
+    header = f.read(33)
+    if len(header) < 33 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        return None
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', header[16:26])
+    if color_type == 3:
+        # 调色板索引的位深不是颜色位深
+        bit_depth = 8
+    return texture_info(width, height, PNG_CHANNELS.get(color_type, 4), bit_depth, 'PNG')
+
+
+def probe_jpeg(f):
+    if f.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':
+            marker = f.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        # 没有长度字段的标记
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            continue
+        # 图像结束或扫描开始之前都没有帧头
+        if marker in (0xD9, 0xDA):
+            return None
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(6)
+            if len(frame) < 6:
+                return None
+            precision, height, width, components = struct.unpack('>BHHB', frame)
+            return texture_info(width, height, components, precision, 'JPEG')
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def probe_tga(f):
+    header = f.read(18)
+    if len(header) < 18:
+        return None
+    image_type = header[2]
+    width, height = struct.unpack('<HH', header[12:16])
+    pixel_depth = header[16]
+    alpha_bits = header[17] & 0x0F
+    if image_type in (3, 11):
+        channels = 1
+    elif image_type in (1, 9):
+        # 调色板图像：通道数由调色板条目位深决定
+        channels = 4 if header[7] == 32 else 3
+    elif image_type in (2, 10):
+        channels = 4 if pixel_depth == 32 or alpha_bits else 3
+    else:
+        return None
+    if not width or not height:
+        return None
+    return texture_info(width, height, channels, 8, 'TARGA')
+
+
+def read_cstring(f, limit=256):
+    """读取以\\0结尾的字符串"""
+    chars = bytearray()
+    while len(chars) < limit:
+        byte = f.read(1)
+        if not byte or byte == b'\0':
+            break
+        chars += byte
+    return chars.decode('latin-1')
+
+
+def parse_exr_channels(data):
+    """chlist属性 -> [(通道名, 像素类型)]"""
+    channels = []
+    offset = 0
+    while offset < len(data) and data[offset] != 0:
+        end = data.index(b'\0', offset)
+        name = data[offset:end].decode('latin-1')
+        pixel_type = struct.unpack('<i', data[end + 1:end + 5])[0]
+        channels.append((name, pixel_type))
+        # 像素类型(4) + pLinear(1) + 保留(3) + x/y采样(8)
+        offset = end + 1 + 16
+    return channels
+
+
+def probe_exr(f):
+    if f.read(4) != EXR_MAGIC:
+        return None
+    f.read(4)  # 版本和标志
+
+    channels = None
+    data_window = None
+    while channels is None or data_window is None:
+        name = read_cstring(f)
+        if not name:
+            break
+        read_cstring(f)  # 属性类型
+        size_bytes = f.read(4)
+        if len(size_bytes) < 4:
+            return None
+        size = struct.unpack('<i', size_bytes)[0]
+        if name == 'channels':
+            channels = parse_exr_channels(f.read(size))
+        elif name == 'dataWindow':
+            data_window = struct.unpack('<iiii', f.read(16))
+        else:
+            f.seek(size, os.SEEK_CUR)
+
+    if not channels or data_window is None:
+        return None
+    xmin, ymin, xmax, ymax = data_window
+    bit_depth = max(EXR_BIT_DEPTHS.get(pixel_type, 32) for _, pixel_type in channels)
+    return texture_info(xmax - xmin + 1, ymax - ymin + 1, len(channels), bit_depth, 'OPEN_EXR')
+
+
+# 文件扩展名 -> 解析函数
+PROBE_FUNCTIONS = {
+    '.png': probe_png,
+    '.jpg': probe_jpeg,
+    '.jpeg': probe_jpeg,
+    '.tga': probe_tga,
+    '.exr': probe_exr,
+}
+
+
+def probe_stream(f, extension):
+    """按扩展名解析文件头，扩展名未知时依次尝试有魔数的格式"""
+    probe = PROBE_FUNCTIONS.get(extension)
+    if probe is not None:
+        try:
+            return probe(f)
+        except (struct.error, ValueError):
+            return None
+    for probe in (probe_png, probe_jpeg, probe_exr):
+        f.seek(0)
+        try:
+            info = probe(f)
+        except (struct.error, ValueError):
+            info = None
+        if info is not None:
+            return info
+    return None
+
+
+def probe_file(filepath):
+    """读取磁盘文件的文件头（按路径、修改时间和大小缓存），无法识别时返回None"""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    key = (filepath, stat.st_mtime_ns, stat.st_size)
+    if key in PROBE_CACHE:
+        return PROBE_CACHE[key]
+
+    try:
+        with open(filepath, 'rb') as f:
+            info = probe_stream(f, os.path.splitext(filepath)[1].lower())
+    except OSError:
+        info = None
+    PROBE_CACHE[key] = info
+    return info
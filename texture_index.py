@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Texture Index
+纹理使用索引：图像 -> 材质 -> 对象的双向映射，递归遍历节点组（每个节点组只遍历一次），
+第一次使用时构建，数据变化（depsgraph更新、重命名、撤销、加载文件）时失效，
+纹理相关的操作符和面板用字典查询代替逐个对象遍历材质节点
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+
+# 当前索引，None表示需要重新构建
+_INDEX = None
+
+# msgbus订阅的所有者
+_MSGBUS_OWNER = object()
+
+# 这些类型的数据变化会影响索引
+INDEXED_ID_TYPES = (bpy.types.Material, bpy.types.NodeTree, bpy.types.Image)
+
+
+class TextureUsageIndex:
+    """按名称保存的映射，查询时再从bpy.data取数据块（避免持有失效的引用）"""
+
+    def __init__(self):
+        self.group_images = {}
+        self.material_images = {}
+        self.image_materials = {}
+        self.object_materials = {}
+        self.material_objects = {}
+        self.build()
+
+    def walk_node_tree(self, node_tree, images, stack):
+        for node in node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image is not None:
+                images.append(node.image.name)
+            elif node.type == 'GROUP' and node.node_tree is not None:
+                images.extend(self.get_group_images(node.node_tree, stack))
+
+    def get_group_images(self, group, stack):
+        """节点组中的图像（结果缓存，多个材质共用的节点组只遍历一次）"""
+        images = self.group_images.get(group.name)
+        if images is not None:
+            return images
+        if group.name in stack:
+            return []
+        stack.add(group.name)
+        images = []
+        self.walk_node_tree(group, images, stack)
+        stack.discard(group.name)
+        self.group_images[group.name] = images
+        return images
+
+    def build(self):
+        for material in bpy.data.materials:
+            images = []
+            if material.use_nodes and material.node_tree is not None:
+                self.walk_node_tree(material.node_tree, images, set())
+            # 去重并保持节点顺序
+            images = list(dict.fromkeys(images))
+            self.material_images[material.name] = images
+            for name in images:
+                self.image_materials.setdefault(name, []).append(material.name)
+
+        for obj in bpy.data.objects:
+            materials = []
+            for slot in obj.material_slots:
+                if slot.material is not None and slot.material.name not in materials:
+                    materials.append(slot.material.name)
+            if not materials:
+                continue
+            self.object_materials[obj.name] = materials
+            for name in materials:
+                self.material_objects.setdefault(name, []).append(obj.name)
+
+    # ==================== 查询 / Queries ====================
+
+    def images_of_material(self, material):
+        images = bpy.data.images
+        return [images[name] for name in self.material_images.get(material.name, ()) if name in images]
+
+    def images_of_object(self, obj):
+        """对象所有材质槽（含节点组）使用的图像，不重复"""
+        names = []
+        for material_name in self.object_materials.get(obj.name, ()):
+            names.extend(self.material_images.get(material_name, ()))
+        images = bpy.data.images
+        return [images[name] for name in dict.fromkeys(names) if name in images]
+
+    def images_of_objects(self, objects):
+        """多个对象使用的图像，不重复"""
+        seen = {}
+        for obj in objects:
+            for image in self.images_of_object(obj):
+                seen.setdefault(image.name, image)
+        return list(seen.values())
+
+    def materials_of_image(self, image):
+        materials = bpy.data.materials
+        return [materials[name] for name in self.image_materials.get(image.name, ()) if name in materials]
+
+    def objects_of_image(self, image):
+        names = []
+        for material_name in self.image_materials.get(image.name, ()):
+            names.extend(self.material_objects.get(material_name, ()))
+        objects = bpy.data.objects
+        return [objects[name] for name in dict.fromkeys(names) if name in objects]
+
+
+def get_index():
+    """返回当前索引，失效后第一次调用时重新构建"""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = TextureUsageIndex()
+    return _INDEX
+
+
+@persistent
+def invalidate(*args):
+    global _INDEX
+    _INDEX = None
+
+
+# ==================== 失效 / Invalidation ====================
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    if _INDEX is None:
+        return
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, INDEXED_ID_TYPES):
+            invalidate()
+            return
+        # 只移动对象不会改变材质分配
+        if isinstance(id_data, (bpy.types.Object, bpy.types.Mesh)) and (
+                update.is_updated_geometry or update.is_updated_shading or not update.is_updated_transform):
+            invalidate()
+            return
+
+
+def subscribe_renames():
+    """重命名不会触发depsgraph更新，通过msgbus订阅名称变化"""
+    for id_type in (bpy.types.Image, bpy.types.Material, bpy.types.Object, bpy.types.NodeTree):
+        bpy.msgbus.subscribe_rna(
+            key=(id_type, "name"),
+            owner=_MSGBUS_OWNER,
+            args=(),
+            notify=invalidate,
+        )
+
+
+@persistent
+def on_load_post(*args):
+    # 加载文件会清除msgbus订阅
+    invalidate()
+    subscribe_renames()
+
+
+HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+    (bpy.app.handlers.load_post, on_load_post),
+    (bpy.app.handlers.undo_post, invalidate),
+    (bpy.app.handlers.redo_post, invalidate),
+)
+
+
+def register():
+    for handlers, handler in HANDLERS:
+        if handler not in handlers:
+            handlers.append(handler)
+    subscribe_renames()
+
+
+def unregister():
+    bpy.msgbus.clear_by_owner(_MSGBUS_OWNER)
+    for handlers, handler in HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
+    invalidate()
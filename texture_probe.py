@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Texture Probe
+纹理清单：只读取PNG/JPG/TGA/EXR文件头（texture_headers）获取尺寸、通道数和位深，
+不加载像素，估算每个对象、材质和整个场景的显存占用
+"""
+
+import io
+import os
+from .texture_copy import get_image_path
+from .texture_headers import probe_stream, probe_file
+from . import texture_index
+
+# 带mipmap时的显存系数（1 + 1/4 + 1/16 + ... ≈ 4/3）
+MIPMAP_FACTOR = 4.0 / 3.0
+
+# 最近一次统计结果，供面板显示
+LAST_REPORT = {}
+
+
+def probe_image(image):
+    """不加载像素获取图像信息：文件读文件头，打包数据解析内存中的文件头"""
+    if image.source != 'FILE':
+        return None
+    if image.packed_file is not None:
+        extension = os.path.splitext(image.filepath)[1].lower()
+        return probe_stream(io.BytesIO(image.packed_file.data), extension)
+    return probe_file(get_image_path(image))
+
+
+# ==================== 显存估算 / GPU Memory Estimate ====================
+
+def estimate_gpu_bytes(info):
+    """Blender按RGBA上传纹理：8位为每通道1字节，高位深（浮点）为半精度每通道2字节，含mipmap"""
+    bytes_per_channel = 1 if info['bit_depth'] <= 8 else 2
+    return int(info['width'] * info['height'] * 4 * bytes_per_channel * MIPMAP_FACTOR)
+
+
+def build_inventory(objects):
+    """统计对象使用的纹理显存，每张图像在每个统计范围内只计算一次
+
+    返回 {'images': {图像名: 信息}, 'materials': {材质名: 字节}, 'objects': {对象名: 字节},
+          'total': 字节, 'unknown': [无法读取的图像名]}
+    """
+    index = texture_index.get_index()
+    images = {}
+    unknown = []
+    materials = {}
+    material_images = {}
+    object_totals = {}
+    scene_images = set()
+
+    def image_bytes(image):
+        if image.name not in images:
+            info = probe_image(image)
+            if info is None:
+                unknown.append(image.name)
+                images[image.name] = None
+            else:
+                info = dict(info, gpu_bytes=estimate_gpu_bytes(info), users=0)
+                images[image.name] = info
+        info = images[image.name]
+        return 0 if info is None else info['gpu_bytes']
+
+    for obj in objects:
+        object_images = set()
+        for slot in obj.material_slots:
+            material = slot.material
+            if material is None:
+                continue
+            if material.name not in material_images:
+                used = {image.name: image for image in index.images_of_material(material)
+                        if image.source == 'FILE'}
+                material_images[material.name] = set(used)
+                materials[material.name] = sum(image_bytes(image) for image in used.values())
+            object_images.update(material_images[material.name])
+
+        for name in object_images:
+            info = images.get(name)
+            if info is not None:
+                info['users'] += 1
+        object_totals[obj.name] = sum(images[name]['gpu_bytes'] for name in object_images if images.get(name))
+        scene_images.update(object_images)
+
+    total = sum(images[name]['gpu_bytes'] for name in scene_images if images.get(name))
+    return {
+        'images': images,
+        'materials': materials,
+        'objects': object_totals,
+        'total': total,
+        'unknown': unknown,
+    }
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+PopTools Texture Resize
+纹理缩放：NumPy可分离重采样（区域平均/Lanczos），在batch_export的后台Blender进程中
+直接从磁盘读取源文件、缩放并按原格式写入Small文件夹
+
+像素按存储编码处理（8位图像不做色彩空间转换，与image.scale()一致），
+因此缩放后的亮度与原图一致（见3.1.5的变暗修复）。
+"""
+
+import os
+import numpy as np
+
+LANCZOS_LOBES = 3
+
+# 临时文件名标记，保存完成后重命名为最终文件
+TEMP_MARKER = ".partial"
+
+
+# ==================== 重采样 / Resampling (pure NumPy) ====================
+
+def area_weights(in_size, out_size):
+    """区域平均：每个输出像素覆盖的输入区间按重叠长度加权"""
+    scale = in_size / out_size
+    starts = np.arange(out_size) * scale
+    ends = starts + scale
+    edges = np.arange(in_size + 1, dtype=np.float64)
+    # (out, in) 重叠长度
+    overlap = np.minimum(ends[:, None], edges[None, 1:]) - np.maximum(starts[:, None], edges[None, :-1])
+    weights = np.clip(overlap, 0.0, None)
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def lanczos_weights(in_size, out_size, lobes=LANCZOS_LOBES):
+    """Lanczos：缩小时按比例放宽核，避免混叠"""
+    scale = in_size / out_size
+    support = max(scale, 1.0)
+    centers = (np.arange(out_size) + 0.5) * scale
+    x = (np.arange(in_size) + 0.5)[None, :] - centers[:, None]
+    x /= support
+    weights = np.sinc(x) * np.sinc(x / lobes)
+    weights[np.abs(x) >= lobes] = 0.0
+    totals = weights.sum(axis=1, keepdims=True)
+    totals[totals == 0.0] = 1.0
+    return weights / totals
+
+
+WEIGHT_FUNCTIONS = {
+    'AREA': area_weights,
+    'LANCZOS': lanczos_weights,
+}
+
+
+def resample(pixels, width, height, filter_type='AREA'):
+    """把(H, W, C)数组重采样为(height, width, C)，先垂直后水平"""
+    weight_function = WEIGHT_FUNCTIONS.get(filter_type, area_weights)
+    in_height, in_width, channels = pixels.shape
+    data = pixels.astype(np.float32, copy=False)
+
+    if in_height != height:
+        weights_y = weight_function(in_height, height).astype(np.float32)
+        data = (weights_y @ data.reshape(in_height, -1)).reshape(height, in_width, channels)
+    if in_width != width:
+        weights_x = weight_function(in_width, width).astype(np.float32)
+        data = np.einsum('ow,hwc->hoc', weights_x, data)
+    return data
+
+
+# ==================== 文件处理 / File Processing (Blender worker) ====================
+
+def save_pixels(source_image, pixels, target):
+    """按源图像的格式、位深和色彩空间把(H, W, 4)像素写入target"""
+    import bpy
+
+    height, width = pixels.shape[:2]
+    if not source_image.is_float:
+        pixels = np.clip(pixels, 0.0, 1.0)
+
+    result = bpy.data.images.new(
+        os.path.basename(target), width, height, alpha=True, float_buffer=source_image.is_float)
+    try:
+        result.colorspace_settings.name = source_image.colorspace_settings.name
+        result.alpha_mode = source_image.alpha_mode
+        result.file_format = source_image.file_format
+        result.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+
+        # 先保存到临时文件，完成后重命名，避免半成品被当作缩放结果
+        root, ext = os.path.splitext(target)
+        temp_path = root + TEMP_MARKER + ext
+        result.filepath_raw = temp_path
+        result.save()
+        os.replace(temp_path, target)
+    finally:
+        bpy.data.images.remove(result)
+
+
+def resize_image_pyramid(source, targets, filter_type='AREA'):
+    """源文件只解码一次，按尺寸从大到小依次缩放，每一级以上一级的结果为输入
+
+    targets: [(width, height, 目标路径)]
+    """
+    import bpy
+
+    image = bpy.data.images.load(source, check_existing=False)
+    try:
+        in_width, in_height = image.size
+        if not in_width or not in_height:
+            raise RuntimeError("Image has no pixel data")
+
+        # 8位图像的pixels是存储值/255，不经过色彩空间转换
+        pixels = np.empty(in_width * in_height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        level = pixels.reshape(in_height, in_width, 4)
+
+        written = []
+        for width, height, target in sorted(targets, key=lambda item: item[0] * item[1], reverse=True):
+            level = resample(level, width, height, filter_type)
+            save_pixels(image, level, target)
+            written.append({"size": [width, height], "target": target})
+
+        return {"source_size": [in_width, in_height], "written": written}
+    finally:
+        bpy.data.images.remove(image)
+
+
+def resize_image_file(source, target, width, height, filter_type='AREA'):
+    """读取源文件，缩放后按原文件格式、位深和色彩空间写入target，返回结果信息"""
+    result = resize_image_pyramid(source, [(width, height, target)], filter_type)
+    return {"source_size": result["source_size"], "size": [width, height], "target": target}
@@ -10,9 +10,16 @@ import sys
 import subprocess
 import bmesh
 import re
+import numpy as np
 from datetime import datetime
 from mathutils import Vector
 
+# 模态操作符运行期间放行的事件（仅视图导航），其余输入被拦截以免在导出中途编辑场景
+MODAL_PASS_THROUGH_EVENTS = {
+    'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE', 'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE',
+    'TRACKPADPAN', 'TRACKPADZOOM', 'NDOF_MOTION', 'WINDOW_DEACTIVATE', 'TIMER_REPORT',
+}
+
 def show_message_box(message="", title="Message", icon='INFO'):
     """显示消息框"""
     def draw(self, context):
@@ -54,6 +61,33 @@ def prefilter_export_name(name):
     result = re.sub("[#%&{}<>\\\*?/'\":`|]", "_", name)
     return result
 
+def get_physical_core_count():
+    """获取物理CPU核心数（无法判断时返回逻辑核心数）"""
+    logical = os.cpu_count() or 1
+    try:
+        if sys.platform.startswith('linux'):
+            cores = set()
+            physical_id = None
+            with open('/proc/cpuinfo', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('physical id'):
+                        physical_id = line.split(':')[1].strip()
+                    elif line.startswith('core id'):
+                        cores.add((physical_id, line.split(':')[1].strip()))
+            if cores:
+                return len(cores)
+        elif sys.platform == 'darwin':
+            return int(subprocess.check_output(['sysctl', '-n', 'hw.physicalcpu'], text=True).strip())
+        elif sys.platform.startswith('win'):
+            output = subprocess.check_output(
+                ['powershell', '-NoProfile', '-Command',
+                 '(Get-CimInstance Win32_Processor | Measure-Object -Property NumberOfCores -Sum).Sum'],
+                text=True, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+            return int(output.strip())
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        pass
+    return logical
+
 def print_execution_time(operation_name, start_time):
     """打印操作执行时间"""
     end_time = datetime.now()
@@ -68,8 +102,8 @@ def get_all_mesh_objects():
     """获取场景中所有网格对象"""
     return [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
 
-def export_model(path, name):
-    """导出模型到指定路径"""
+def get_export_model_args(path, name):
+    """根据导出设置解析导出操作符及其参数，返回(操作符名, 参数字典)"""
     act = bpy.context.scene.poptools_props.export_tools_settings
 
     if act.export_custom_options:
@@ -108,7 +142,7 @@ def export_model(path, name):
 
         if act.export_format == 'FBX':
             if act.export_target_engine == 'UNITY':
-                bpy.ops.export_scene.fbx(
+                return 'export_scene.fbx', dict(
                     filepath=str(path + name + '.fbx'), use_selection=True,
                     apply_scale_options=apply_scale_options_value,
                     use_mesh_modifiers=True, mesh_smooth_type=act.export_smoothing,
@@ -119,7 +153,7 @@ def export_model(path, name):
                     global_scale=global_scale_value, axis_forward=forward_axis, axis_up=up_axis,
                     use_space_transform=use_transform)
             elif act.export_target_engine == 'UNREAL':
-                bpy.ops.export_scene.fbx(
+                return 'export_scene.fbx', dict(
                     filepath=str(path + name + '.fbx'), use_selection=True,
                     apply_scale_options=apply_scale_options_value,
                     use_mesh_modifiers=True, mesh_smooth_type=act.export_smoothing,
@@ -130,7 +164,7 @@ def export_model(path, name):
                     global_scale=global_scale_value, axis_forward=forward_axis, axis_up=up_axis,
                     use_space_transform=use_transform)
             elif act.export_target_engine == 'UNITY2023':
-                bpy.ops.export_scene.fbx(
+                return 'export_scene.fbx', dict(
                     filepath=str(path + name + '.fbx'), use_selection=True,
                     apply_scale_options=apply_scale_options_value,
                     use_mesh_modifiers=True, mesh_smooth_type=act.export_smoothing,
@@ -141,7 +175,7 @@ def export_model(path, name):
                     colors_type=act.export_vc_color_space, use_custom_props=act.export_custom_props,
                     use_space_transform=use_transform)
             elif act.export_target_engine == '3DCOAT':
-                bpy.ops.export_scene.fbx(
+                return 'export_scene.fbx', dict(
                     filepath=str(path + name + '.fbx'), use_selection=True,
                     apply_scale_options=apply_scale_options_value,
                     use_mesh_modifiers=True, mesh_smooth_type=act.export_smoothing,
@@ -153,7 +187,7 @@ def export_model(path, name):
                     use_space_transform=use_transform)
 
         if act.export_format == 'OBJ':
-            bpy.ops.wm.obj_export(
+            return 'wm.obj_export', dict(
                 filepath=str(path + name + '.obj'), export_selected_objects=True, apply_modifiers=True,
                 export_smooth_groups=act.obj_export_smooth_groups, export_normals=True, export_uv=True,
                 export_materials=True, export_triangulated_mesh=act.triangulate_before_export,
@@ -161,7 +195,7 @@ def export_model(path, name):
                 global_scale=global_scale_value, path_mode='AUTO', forward_axis=forward_axis, up_axis=up_axis)
 
         if act.export_format == 'GLTF':
-            bpy.ops.export_scene.gltf(
+            return 'export_scene.gltf', dict(
                 filepath=str(path + name + '.glb'), check_existing=False,
                 export_image_format=act.gltf_export_image_format,
                 export_tangents=act.gltf_export_tangents, export_attributes=act.gltf_export_attributes,
@@ -170,29 +204,29 @@ def export_model(path, name):
     else:
         if act.export_format == 'FBX':
             if act.export_target_engine == 'UNITY':
-                bpy.ops.export_scene.fbx(
+                return 'export_scene.fbx', dict(
                     filepath=str(path + name + '.fbx'), use_selection=True,
                     apply_scale_options='FBX_SCALE_ALL', add_leaf_bones=False, colors_type='LINEAR',
                     use_custom_props=True)
             elif act.export_target_engine == 'UNREAL':
-                bpy.ops.export_scene.fbx(
+                return 'export_scene.fbx', dict(
                     filepath=str(path + name + '.fbx'), use_selection=True,
                     apply_scale_options='FBX_SCALE_NONE', mesh_smooth_type='FACE', use_tspace=True,
                     add_leaf_bones=False, colors_type='LINEAR', use_custom_props=True)
             elif act.export_target_engine == 'UNITY2023':
-                bpy.ops.export_scene.fbx(
+                return 'export_scene.fbx', dict(
                     filepath=str(path + name + '.fbx'), use_selection=True, apply_scale_options='FBX_SCALE_NONE',
                     global_scale=0.01, colors_type='LINEAR', axis_forward='-Y', axis_up='Z',
                     add_leaf_bones=False,
                     use_custom_props=True, use_space_transform=False)
             elif act.export_target_engine == '3DCOAT':
-                bpy.ops.export_scene.fbx(
+                return 'export_scene.fbx', dict(
                     filepath=str(path + name + '.fbx'), use_selection=True,
                     apply_scale_options='FBX_SCALE_ALL', add_leaf_bones=False, colors_type='LINEAR',
                     use_custom_props=True)
 
         if act.export_format == 'OBJ':
-            bpy.ops.wm.obj_export(
+            return 'wm.obj_export', dict(
                 filepath=str(path + name + '.obj'), export_selected_objects=True, apply_modifiers=True,
                 export_smooth_groups=True, export_normals=True, export_uv=True,
                 export_materials=True, export_triangulated_mesh=act.triangulate_before_export,
@@ -200,12 +234,25 @@ def export_model(path, name):
                 global_scale=1, path_mode='AUTO', forward_axis='NEGATIVE_Z', up_axis='Y')
 
         if act.export_format == 'GLTF':
-            bpy.ops.export_scene.gltf(
+            return 'export_scene.gltf', dict(
                 filepath=str(path + name + '.glb'), check_existing=False, export_image_format='AUTO',
                 export_tangents=False, export_attributes=False,
                 use_selection=True, export_extras=False,
                 export_def_bones=False)
 
+    return None, {}
+
+def run_export_operator(op_name, kwargs):
+    """调用get_export_model_args解析出的导出操作符"""
+    category, op = op_name.split('.')
+    return getattr(getattr(bpy.ops, category), op)(**kwargs)
+
+def export_model(path, name):
+    """导出模型到指定路径"""
+    op_name, kwargs = get_export_model_args(path, name)
+    if op_name is not None:
+        run_export_operator(op_name, kwargs)
+
 def duplicate_object(obj, name_suffix="_copy"):
     """复制对象"""
     # 复制对象数据
@@ -367,6 +414,109 @@ def log_export_info(obj_name, export_path, export_format, duration=None):
     
     print(f"PopTools: {message}")
 
+def property_group_to_dict(group):
+    """把PropertyGroup的属性保存为可JSON序列化的字典（跳过指针和集合属性）"""
+    data = {}
+    for prop in group.bl_rna.properties:
+        if prop.identifier == 'rna_type' or prop.type in {'POINTER', 'COLLECTION'}:
+            continue
+        value = getattr(group, prop.identifier)
+        if prop.type == 'ENUM' and prop.is_enum_flag:
+            value = sorted(value)
+        elif getattr(prop, 'is_array', False):
+            value = list(value)
+        data[prop.identifier] = value
+    return data
+
+def scene_settings_to_dict(scene):
+    """导出器使用的场景设置（单位、帧范围、帧率），用于在没有该场景的进程中重现导出结果"""
+    return {
+        "unit_settings": property_group_to_dict(scene.unit_settings),
+        "frame_start": scene.frame_start,
+        "frame_end": scene.frame_end,
+        "frame_step": scene.frame_step,
+        "fps": scene.render.fps,
+        "fps_base": scene.render.fps_base,
+    }
+
+def apply_scene_settings(scene, data):
+    """把scene_settings_to_dict的结果应用到场景"""
+    dict_to_property_group(scene.unit_settings, data.get("unit_settings", {}))
+    for key in ("frame_start", "frame_end", "frame_step"):
+        if key in data:
+            setattr(scene, key, data[key])
+    for key in ("fps", "fps_base"):
+        if key in data:
+            setattr(scene.render, key, data[key])
+
+def dict_to_property_group(group, data):
+    """把property_group_to_dict的结果写回PropertyGroup，返回无法设置的属性名"""
+    skipped = []
+    for key, value in data.items():
+        prop = group.bl_rna.properties.get(key)
+        if prop is None or prop.is_readonly:
+            skipped.append(key)
+            continue
+        if prop.type == 'ENUM' and prop.is_enum_flag:
+            value = set(value)
+        try:
+            setattr(group, key, value)
+        except (TypeError, ValueError) as e:
+            print(f"PopTools: Could not set {key}: {e}")
+            skipped.append(key)
+    return skipped
+
+# 三角化方法（OBJ导出设置中的单一方法） -> bmesh.ops.triangulate的(quad_method, ngon_method)
+TRIANGULATE_METHODS = {
+    'BEAUTY': ('BEAUTY', 'BEAUTY'),
+    'CLIP': ('BEAUTY', 'EAR_CLIP'),
+    'QUAD': ('SHORT_EDGE', 'BEAUTY'),
+    'FIXED': ('FIXED', 'EAR_CLIP'),
+    'FIXED_ALTERNATE': ('ALTERNATE', 'EAR_CLIP'),
+}
+
+# 三角化时临时保存角法线的属性名
+CORNER_NORMAL_ATTRIBUTE = "_poptools_corner_normal"
+
+def get_corner_normals(mesh):
+    """读取每个角的法线，返回(L, 3)数组"""
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    if hasattr(mesh, 'corner_normals'):
+        mesh.corner_normals.foreach_get('vector', normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get('normal', normals)
+    return normals.reshape(-1, 3)
+
+def triangulate_mesh_data(mesh, quad_method='BEAUTY', ngon_method='BEAUTY', keep_normals=True):
+    """直接在网格数据上三角化（BMesh，不进入编辑模式）
+
+    keep_normals时自定义法线先存入角属性，三角化后新面的角沿用原来的值，再写回自定义法线。
+    """
+    keep_custom_normals = keep_normals and mesh.has_custom_normals
+    if keep_custom_normals:
+        attribute = mesh.attributes.new(CORNER_NORMAL_ATTRIBUTE, 'FLOAT_VECTOR', 'CORNER')
+        attribute.data.foreach_set('vector', get_corner_normals(mesh).ravel())
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    faces = [face for face in bm.faces if len(face.verts) > 3]
+    if faces:
+        bmesh.ops.triangulate(bm, faces=faces, quad_method=quad_method, ngon_method=ngon_method)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    if keep_custom_normals:
+        attribute = mesh.attributes[CORNER_NORMAL_ATTRIBUTE]
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        attribute.data.foreach_get('vector', normals)
+        mesh.attributes.remove(attribute)
+        if hasattr(mesh, 'use_auto_smooth'):
+            mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set(normals.reshape(-1, 3))
+
+    mesh.update()
+
 # Registration (utils通常不需要注册类)
 def register():
     pass
@@ -9,12 +9,175 @@ Provides vertex to bone binding and baking functionality.
 
 import bpy
 import bmesh
-from mathutils import Vector
+import os
+import json
+import struct
+import zlib
+import numpy as np
+from mathutils import Vector, kdtree
 from bpy.types import Operator, Panel
 from bpy.props import PointerProperty
 
 # 导入工具函数
 from .utils import show_message_box, get_addon_preferences
+from .vertex_weights import compute_sparse_weights, quantize_levels
+
+# ============================================================================
+# 辅助函数 / Helper Functions
+# ============================================================================
+
+def get_world_vertex_coords(obj):
+    """获取网格顶点的世界坐标 / Get world-space vertex coordinates
+
+    使用foreach_get一次性读取顶点坐标，并用矩阵运算转换到世界空间。
+
+    Args:
+        obj (bpy.types.Object): 网格对象
+
+    Returns:
+        numpy.ndarray: 形状为(V, 3)的世界坐标数组
+    """
+    # 编辑模式下的修改需要先同步到网格数据
+    if obj.mode == 'EDIT':
+        obj.update_from_editmode()
+
+    vertices = obj.data.vertices
+    coords = np.empty(len(vertices) * 3, dtype=np.float64)
+    vertices.foreach_get("co", coords)
+    coords.shape = (-1, 3)
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+# 绑定完成后报告绑定距离最大的空物体数量，便于检查错误绑定
+BIND_REPORT_WORST = 3
+
+def write_sparse_weights(vertex_groups, group_indices, buckets, precision):
+    """按量化权重桶写入顶点组 / Write weights with one add() per weight bucket
+
+    Args:
+        vertex_groups (list): 与空物体一一对应的顶点组（可以为None）
+        group_indices (numpy.ndarray): compute_sparse_weights返回的组索引
+        buckets (numpy.ndarray): compute_sparse_weights返回的权重桶
+        precision (float): 量化步长（与compute_sparse_weights相同）
+
+    Returns:
+        int: 调用add()的次数
+    """
+    vert_count = group_indices.shape[0]
+    all_verts = list(range(vert_count))
+
+    # 清除上一次烘焙遗留的权重，未入选的顶点不应保留影响
+    for vertex_group in vertex_groups:
+        if vertex_group:
+            vertex_group.remove(all_verts)
+
+    verts = np.repeat(np.arange(vert_count, dtype=np.int32), group_indices.shape[1])
+    groups = group_indices.ravel()
+    values = buckets.ravel()
+    valid = values > 0
+    verts, groups, values = verts[valid], groups[valid], values[valid]
+
+    # 按(组, 权重桶)排序后切分，每段只需一次add()调用
+    order = np.lexsort((values, groups))
+    verts, groups, values = verts[order], groups[order], values[order]
+    boundaries = np.flatnonzero((np.diff(groups) != 0) | (np.diff(values) != 0)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(verts)]))
+
+    levels = quantize_levels(precision)
+    add_calls = 0
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if start == end:
+            continue
+        vertex_group = vertex_groups[groups[start]]
+        if vertex_group:
+            weight = min(1.0, float(values[start]) / levels)
+            vertex_group.add(verts[start:end].tolist(), weight, 'REPLACE')
+            add_calls += 1
+
+    return add_calls
+
+class StreamingPNGWriter:
+    """逐行流式写入16位RGBA PNG / Stream 16-bit RGBA PNG rows to disk
+
+    行数据通过zlib.compressobj增量压缩并作为IDAT块写出，内存占用与图像高度无关。
+    """
+
+    def __init__(self, filepath, width, height):
+        # PNG不允许宽度或高度为0
+        if width <= 0 or height <= 0:
+            raise ValueError(f"无效的PNG尺寸 {width}x{height}")
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.file = open(filepath, 'wb')
+        self.compressor = zlib.compressobj(6)
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+        # 位深16，颜色类型6(RGBA)
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 16, 6, 0, 0, 0))
+
+    def _write_chunk(self, chunk_type, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(chunk_type)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+    def write_rows(self, rows):
+        """写入若干行，rows为形状(N, width, 4)、取值0-1的数组"""
+        pixels = np.clip(np.rint(rows * 65535.0), 0, 65535).astype('>u2')
+        pixels = pixels.reshape(len(rows), -1).view(np.uint8)
+        # 每行前加一个过滤类型字节（0 = None）
+        scanlines = np.zeros((len(rows), pixels.shape[1] + 1), dtype=np.uint8)
+        scanlines[:, 1:] = pixels
+        data = self.compressor.compress(scanlines.tobytes())
+        if data:
+            self._write_chunk(b'IDAT', data)
+        self.rows_written += len(rows)
+
+    def close(self):
+        data = self.compressor.flush()
+        if data:
+            self._write_chunk(b'IDAT', data)
+        self._write_chunk(b'IEND', b'')
+        self.file.close()
+
+def encode_vat_texture(raw_path, png_path, vert_count, frame_count, value_min, value_max, chunk_frames):
+    """将原始float32帧数据分块编码为VAT纹理 / Encode raw frame data into a VAT texture
+
+    纹理的每一行是一帧，每一列是一个顶点，RGB = (值 - 最小值) / 范围，A = 1。
+    """
+    value_min = np.asarray(value_min, dtype=np.float32)
+    value_range = np.asarray(value_max, dtype=np.float32) - value_min
+    value_range[value_range == 0.0] = 1.0
+
+    writer = StreamingPNGWriter(png_path, vert_count, frame_count)
+    rows = np.ones((chunk_frames, vert_count, 4), dtype=np.float32)
+    try:
+        with open(raw_path, 'rb') as raw_file:
+            while writer.rows_written < frame_count:
+                count = min(chunk_frames, frame_count - writer.rows_written)
+                values = np.fromfile(raw_file, dtype=np.float32, count=count * vert_count * 3)
+                values = values.reshape(count, vert_count, 3)
+                rows[:count, :, :3] = (values - value_min) / value_range
+                writer.write_rows(rows[:count])
+    finally:
+        writer.close()
+
+def build_vertex_kdtree(world_coords):
+    """为世界坐标构建KD树 / Build a KD-tree over world-space coordinates
+
+    Args:
+        world_coords (numpy.ndarray): 形状为(V, 3)的坐标数组
+
+    Returns:
+        mathutils.kdtree.KDTree: 已平衡的KD树，索引为顶点索引
+    """
+    tree = kdtree.KDTree(len(world_coords))
+    for index, co in enumerate(world_coords.tolist()):
+        tree.insert(co, index)
+    tree.balance()
+    return tree
 
 # ============================================================================
 # 操作符定义 / Operator Definitions
@@ -111,42 +274,32 @@ class VTBB_OT_BindEmptiesToVertices(Operator):
             show_message_box("未找到空物体，请先创建空物体", "错误", 'ERROR')
             return {'CANCELLED'}
         
-        # 进入编辑模式获取网格顶点
-        bpy.context.view_layer.objects.active = target_mesh
-        bpy.ops.object.mode_set(mode='EDIT')
-        
-        # 创建bmesh实例
-        bm = bmesh.from_mesh(target_mesh.data)
-        bm.verts.ensure_lookup_table()
+        if not target_mesh.data.vertices:
+            show_message_box("目标网格没有顶点", "错误", 'ERROR')
+            return {'CANCELLED'}
         
-        # 退出编辑模式
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # 每次绑定只构建一次世界空间KD树，每个空物体只需一次最近点查询
+        tree = build_vertex_kdtree(get_world_vertex_coords(target_mesh))
         
         bound_count = 0
+        bind_distances = []
         
         # 为每个空物体找到最近的顶点
         for empty in empties:
-            empty_location = empty.location
-            closest_vert = None
-            min_distance = float('inf')
-            
-            # 遍历所有顶点找到最近的
-            for vert in bm.verts:
-                vert_world = target_mesh.matrix_world @ vert.co
-                distance = (empty_location - vert_world).length
-                
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_vert = vert
+            vert_world_pos, vert_index, distance = tree.find(empty.location)
             
-            if closest_vert:
+            if vert_index is not None:
                 # 将空物体位置设置为最近顶点的位置
-                vert_world_pos = target_mesh.matrix_world @ closest_vert.co
                 empty.location = vert_world_pos
+                bind_distances.append((distance, empty.name, vert_index))
                 bound_count += 1
         
-        # 清理bmesh
-        bm.free()
+        if bind_distances:
+            # 只汇总平均距离和最差的几个绑定，便于检查错误绑定
+            avg_distance = sum(d for d, _, _ in bind_distances) / len(bind_distances)
+            worst = sorted(bind_distances, reverse=True)[:BIND_REPORT_WORST]
+            worst_text = "，".join(f"{name} -> 顶点 {index} ({distance:.4f})" for distance, name, index in worst)
+            self.report({'INFO'}, f"平均绑定距离 {avg_distance:.4f}，最大绑定距离: {worst_text}")
         
         show_message_box(f"成功绑定 {bound_count} 个空物体到顶点", "绑定完成", 'INFO')
         return {'FINISHED'}
@@ -184,6 +337,48 @@ class VTBB_OT_BakeVertexWeights(Operator):
             if group_name not in target_mesh.vertex_groups:
                 target_mesh.vertex_groups.new(name=group_name)
         
+        if props.bake_engine == 'NUMPY':
+            baked_count = self.bake_numpy(target_mesh, empties, props)
+        else:
+            baked_count = self.bake_legacy(target_mesh, empties)
+        
+        show_message_box(f"成功烘焙 {baked_count} 个顶点组的权重", "烘焙完成", 'INFO')
+        return {'FINISHED'}
+    
+    def bake_numpy(self, target_mesh, empties, props):
+        """NumPy稀疏烘焙：分块计算距离，每顶点只保留前k个影响"""
+        if not target_mesh.data.vertices:
+            return 0
+        
+        vert_coords = get_world_vertex_coords(target_mesh)
+        empty_coords = np.array([tuple(empty.location) for empty in empties], dtype=np.float64)
+        vertex_groups = [
+            target_mesh.vertex_groups.get(empty.name.replace("empty_", ""))
+            for empty in empties
+        ]
+        
+        group_indices, buckets = compute_sparse_weights(
+            vert_coords, empty_coords, props.max_influences, props.bake_precision
+        )
+        
+        # 编辑模式下vertex_group.remove/add会报错，临时切换到物体模式
+        previous_active = bpy.context.view_layer.objects.active
+        was_edit_mode = target_mesh.mode == 'EDIT'
+        if was_edit_mode:
+            bpy.context.view_layer.objects.active = target_mesh
+            bpy.ops.object.mode_set(mode='OBJECT')
+        try:
+            add_calls = write_sparse_weights(vertex_groups, group_indices, buckets, props.bake_precision)
+        finally:
+            if was_edit_mode:
+                bpy.ops.object.mode_set(mode='EDIT')
+                bpy.context.view_layer.objects.active = previous_active
+        
+        self.report({'INFO'}, f"每顶点最多 {group_indices.shape[1]} 个影响，共 {add_calls} 次权重写入")
+        return sum(1 for vertex_group in vertex_groups if vertex_group)
+    
+    def bake_legacy(self, target_mesh, empties):
+        """逐顶点烘焙：每个顶点对每个空物体写入一次权重"""
         # 进入编辑模式
         bpy.context.view_layer.objects.active = target_mesh
         bpy.ops.object.mode_set(mode='EDIT')
@@ -227,8 +422,7 @@ class VTBB_OT_BakeVertexWeights(Operator):
         # 清理bmesh
         bm.free()
         
-        show_message_box(f"成功烘焙 {baked_count} 个顶点组的权重", "烘焙完成", 'INFO')
-        return {'FINISHED'}
+        return baked_count
 
 class VTBB_OT_ClearEmpties(Operator):
     """清理空物体 / Clear Empties"""
@@ -260,6 +454,166 @@ class VTBB_OT_ClearEmpties(Operator):
         show_message_box(f"成功删除 {len(empties)} 个空物体", "清理完成", 'INFO')
         return {'FINISHED'}
 
+class VTBB_OT_BakeVAT(Operator):
+    """烘焙顶点动画纹理 / Bake Vertex Animation Texture"""
+    bl_idname = "vtbb.bake_vat"
+    bl_label = "烘焙顶点动画纹理"
+    bl_description = "逐帧采样目标网格的顶点位置和法线，输出VAT纹理和JSON元数据"
+    bl_options = {'REGISTER'}
+    
+    def execute(self, context):
+        props = context.scene.poptools_props.vertex_baker_settings
+        target_mesh = props.target_mesh
+        scene = context.scene
+        
+        if not target_mesh or target_mesh.type != 'MESH':
+            show_message_box("请先选择一个目标网格对象", "错误", 'ERROR')
+            return {'CANCELLED'}
+        
+        if props.vat_use_scene_range:
+            frame_start, frame_end = scene.frame_start, scene.frame_end
+        else:
+            frame_start, frame_end = props.vat_frame_start, props.vat_frame_end
+        
+        if frame_end < frame_start:
+            show_message_box("结束帧不能小于起始帧", "错误", 'ERROR')
+            return {'CANCELLED'}
+        
+        output_dir = bpy.path.abspath(props.vat_output_path)
+        if not output_dir:
+            show_message_box("请先设置VAT输出路径", "错误", 'ERROR')
+            return {'CANCELLED'}
+        os.makedirs(output_dir, exist_ok=True)
+        
+        base_name = bpy.path.clean_name(target_mesh.name)
+        pos_raw = os.path.join(output_dir, f"{base_name}_pos.raw.tmp")
+        nrm_raw = os.path.join(output_dir, f"{base_name}_nrm.raw.tmp")
+        frame_count = frame_end - frame_start + 1
+        chunk_frames = max(1, min(props.vat_chunk_frames, frame_count))
+        export_normals = props.vat_export_normals
+        original_frame = scene.frame_current
+        
+        # 顶点数取自起始帧评估后的网格（生成类修改器会改变顶点数）
+        vert_count = self.evaluated_vertex_count(context, target_mesh, frame_start)
+        if vert_count == 0:
+            scene.frame_set(original_frame)
+            self.report({'ERROR'}, f"{target_mesh.name} 在第 {frame_start} 帧没有顶点，无法烘焙VAT")
+            return {'CANCELLED'}
+        
+        wm = context.window_manager
+        wm.progress_begin(0, frame_count)
+        try:
+            bounds_min, bounds_max = self.sample_frames(
+                context, target_mesh, vert_count, frame_start, frame_end, chunk_frames,
+                pos_raw, nrm_raw if export_normals else None
+            )
+            
+            # 第二遍：从临时文件分块读取并编码为纹理
+            pos_png = f"{base_name}_pos.png"
+            encode_vat_texture(pos_raw, os.path.join(output_dir, pos_png),
+                               vert_count, frame_count, bounds_min, bounds_max, chunk_frames)
+            nrm_png = None
+            if export_normals:
+                nrm_png = f"{base_name}_nrm.png"
+                encode_vat_texture(nrm_raw, os.path.join(output_dir, nrm_png),
+                                   vert_count, frame_count, (-1.0, -1.0, -1.0), (1.0, 1.0, 1.0), chunk_frames)
+        except RuntimeError as e:
+            show_message_box(str(e), "烘焙失败", 'ERROR')
+            return {'CANCELLED'}
+        finally:
+            wm.progress_end()
+            scene.frame_set(original_frame)
+            for raw_path in (pos_raw, nrm_raw):
+                if os.path.exists(raw_path):
+                    os.remove(raw_path)
+        
+        metadata = {
+            "object": target_mesh.name,
+            "vertex_count": vert_count,
+            "frame_start": frame_start,
+            "frame_end": frame_end,
+            "frame_count": frame_count,
+            "fps": scene.render.fps / scene.render.fps_base,
+            "space": "OBJECT",
+            "layout": "x = vertex index, y = frame (row 0 = frame_start, top of image)",
+            "format": "PNG RGBA 16-bit",
+            "bounds_min": [float(v) for v in bounds_min],
+            "bounds_max": [float(v) for v in bounds_max],
+            "position_texture": pos_png,
+            "position_decode": "position = bounds_min + rgb * (bounds_max - bounds_min)",
+            "normal_texture": nrm_png,
+            "normal_decode": "normal = rgb * 2 - 1",
+        }
+        with open(os.path.join(output_dir, f"{base_name}_vat.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        
+        if vert_count > 16384:
+            self.report({'WARNING'}, f"顶点数 {vert_count} 超过常见的纹理宽度上限16384")
+        
+        show_message_box(f"成功烘焙 {frame_count} 帧、{vert_count} 个顶点的VAT纹理", "烘焙完成", 'INFO')
+        return {'FINISHED'}
+    
+    def evaluated_vertex_count(self, context, target_mesh, frame):
+        """评估后网格在指定帧的顶点数"""
+        context.scene.frame_set(frame)
+        obj_eval = target_mesh.evaluated_get(context.evaluated_depsgraph_get())
+        mesh = obj_eval.to_mesh()
+        try:
+            return len(mesh.vertices)
+        finally:
+            obj_eval.to_mesh_clear()
+    
+    def sample_frames(self, context, target_mesh, vert_count, frame_start, frame_end, chunk_frames, pos_raw, nrm_raw):
+        """逐帧采样评估后的顶点数据，按块追加写入临时文件
+        
+        Returns:
+            tuple: (位置最小值, 位置最大值)
+        """
+        scene = context.scene
+        wm = context.window_manager
+        
+        # 预分配分块缓冲区，逐帧复用，不随帧数增长
+        pos_chunk = np.empty((chunk_frames, vert_count * 3), dtype=np.float32)
+        nrm_chunk = np.empty((chunk_frames, vert_count * 3), dtype=np.float32) if nrm_raw else None
+        bounds_min = np.full(3, np.inf, dtype=np.float32)
+        bounds_max = np.full(3, -np.inf, dtype=np.float32)
+        
+        pos_file = open(pos_raw, 'wb')
+        nrm_file = open(nrm_raw, 'wb') if nrm_raw else None
+        try:
+            row = 0
+            for frame in range(frame_start, frame_end + 1):
+                scene.frame_set(frame)
+                depsgraph = context.evaluated_depsgraph_get()
+                obj_eval = target_mesh.evaluated_get(depsgraph)
+                mesh = obj_eval.to_mesh()
+                try:
+                    if len(mesh.vertices) != vert_count:
+                        raise RuntimeError(f"第 {frame} 帧的顶点数发生变化，无法烘焙VAT")
+                    mesh.vertices.foreach_get("co", pos_chunk[row])
+                    if nrm_chunk is not None:
+                        mesh.vertices.foreach_get("normal", nrm_chunk[row])
+                finally:
+                    obj_eval.to_mesh_clear()
+                
+                row += 1
+                if row == chunk_frames or frame == frame_end:
+                    coords = pos_chunk[:row].reshape(-1, 3)
+                    np.minimum(bounds_min, coords.min(axis=0), out=bounds_min)
+                    np.maximum(bounds_max, coords.max(axis=0), out=bounds_max)
+                    pos_chunk[:row].tofile(pos_file)
+                    if nrm_file:
+                        nrm_chunk[:row].tofile(nrm_file)
+                    row = 0
+                
+                wm.progress_update(frame - frame_start + 1)
+        finally:
+            pos_file.close()
+            if nrm_file:
+                nrm_file.close()
+        
+        return bounds_min, bounds_max
+
 # ============================================================================
 # 面板定义 / Panel Definitions
 # ============================================================================
@@ -288,6 +642,15 @@ class VTBB_PT_MainPanel(Panel):
         box.label(text="目标设置：")
         box.prop(props, "target_mesh", text="目标网格")
         
+        # 烘焙设置
+        box = layout.box()
+        box.label(text="烘焙设置：")
+        box.prop(props, "bake_engine", text="烘焙引擎")
+        if props.bake_engine == 'NUMPY':
+            col = box.column(align=True)
+            col.prop(props, "max_influences", text="最大影响数")
+            col.prop(props, "bake_precision", text="精度")
+        
         # 分隔线
         layout.separator()
         
@@ -318,6 +681,40 @@ class VTBB_PT_MainPanel(Panel):
         col.label(text="4. 点击'绑定到顶点'")
         col.label(text="5. 点击'烘焙权重'")
 
+class VTBB_PT_VATPanel(Panel):
+    """顶点动画纹理面板 / Vertex Animation Texture Panel"""
+    bl_label = "顶点动画纹理 (VAT)"
+    bl_idname = "VTBB_PT_VATPanel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'PopTools'
+    bl_parent_id = "VTBB_PT_MainPanel"
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    @classmethod
+    def poll(cls, context):
+        prefs = get_addon_preferences()
+        return prefs and prefs.enable_vertex_baker_tools
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.poptools_props.vertex_baker_settings
+        
+        box = layout.box()
+        box.label(text="VAT设置：")
+        box.prop(props, "vat_output_path", text="输出路径")
+        box.prop(props, "vat_use_scene_range", text="使用场景帧范围")
+        if not props.vat_use_scene_range:
+            row = box.row(align=True)
+            row.prop(props, "vat_frame_start", text="起始帧")
+            row.prop(props, "vat_frame_end", text="结束帧")
+        box.prop(props, "vat_export_normals", text="导出法线纹理")
+        box.prop(props, "vat_chunk_frames", text="每块帧数")
+        
+        row = layout.row()
+        row.scale_y = 1.2
+        row.operator("vtbb.bake_vat", text="烘焙VAT", icon='RENDER_ANIMATION')
+
 # ============================================================================
 # 注册和注销 / Registration and Unregistration
 # ============================================================================
@@ -327,7 +724,9 @@ classes = [
     VTBB_OT_BindEmptiesToVertices,
     VTBB_OT_BakeVertexWeights,
     VTBB_OT_ClearEmpties,
+    VTBB_OT_BakeVAT,
     VTBB_PT_MainPanel,
+    VTBB_PT_VATPanel,
 ]
 
 def register():
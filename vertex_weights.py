@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+顶点权重计算 / Vertex weight computation
+
+vertex_baker_tools烘焙顶点权重时使用的纯NumPy部分：稀疏权重和量化，
+不访问bpy，写入顶点组在vertex_baker_tools中进行。
+"""
+
+import numpy as np
+
+# 距离矩阵分块计算时每块允许使用的最大内存（字节）
+WEIGHT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def compute_sparse_weights(vert_coords, empty_coords, max_influences=4, precision=0.01):
+    """计算稀疏的顶点权重 / Compute sparse per-vertex weights
+
+    按块计算顶点到空物体的距离矩阵，权重为1/(1+距离)。每个顶点只保留
+    权重最大的max_influences个影响，归一化后丢弃低于precision的影响并
+    再次归一化，最后量化为1/quantize_levels(precision)的整数倍，
+    量化后每个顶点的权重和仍为1。
+
+    Args:
+        vert_coords (numpy.ndarray): 形状为(V, 3)的顶点世界坐标
+        empty_coords (numpy.ndarray): 形状为(E, 3)的空物体世界坐标
+        max_influences (int): 每个顶点的最大影响数
+        precision (float): 权重截断阈值和量化步长
+
+    Returns:
+        tuple: (group_indices, buckets)，形状均为(V, k)。buckets为量化后的
+            权重桶编号，实际权重为bucket / quantize_levels(precision)，0表示无影响
+    """
+    vert_count = len(vert_coords)
+    empty_count = len(empty_coords)
+    k = max(1, min(max_influences, empty_count))
+
+    group_indices = np.empty((vert_count, k), dtype=np.int32)
+    buckets = np.empty((vert_count, k), dtype=np.int32)
+
+    empty_sq = (empty_coords * empty_coords).sum(axis=1)
+    # 每行距离矩阵约占用 E * 8 字节，附带若干临时数组
+    chunk_rows = max(1, WEIGHT_CHUNK_BYTES // (empty_count * 8 * 4))
+    levels = quantize_levels(precision)
+
+    for start in range(0, vert_count, chunk_rows):
+        block = vert_coords[start:start + chunk_rows]
+
+        # |a-b|^2 = |a|^2 + |b|^2 - 2ab，避免生成(c, E, 3)的中间数组
+        dist_sq = (block * block).sum(axis=1)[:, None] + empty_sq[None, :]
+        dist_sq -= 2.0 * (block @ empty_coords.T)
+        np.maximum(dist_sq, 0.0, out=dist_sq)
+        weights = 1.0 / (1.0 + np.sqrt(dist_sq))
+
+        # 只保留权重最大的k个影响
+        if k < empty_count:
+            top = np.argpartition(-weights, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(empty_count), (len(block), empty_count))
+        top_weights = np.take_along_axis(weights, top, axis=1)
+
+        # 归一化后丢弃低于阈值的影响，最大的影响始终保留
+        top_weights /= top_weights.sum(axis=1, keepdims=True)
+        keep = top_weights >= precision
+        keep[np.arange(len(block)), top_weights.argmax(axis=1)] = True
+        top_weights *= keep
+        top_weights /= top_weights.sum(axis=1, keepdims=True)
+
+        group_indices[start:start + len(block)] = top
+        buckets[start:start + len(block)] = quantize_weights(top_weights, levels)
+
+    return group_indices, buckets
+
+
+def quantize_levels(precision):
+    """把1等分的份数：精度不能整除1时（例如0.3），取最接近的能整除1的步长"""
+    return max(1, int(round(1.0 / precision)))
+
+
+def quantize_weights(weights, levels):
+    """把每行和为1的权重量化为整数桶，每行桶数之和等于levels
+
+    先向下取整，剩余的桶分给小数部分最大的影响（最大余数法），
+    直接四舍五入会使权重和偏离1（例如0.5/0.5在3级时都舍入为2）。
+    """
+    scaled = weights * levels
+    result = np.floor(scaled)
+    remainder = np.rint(levels - result.sum(axis=1)).astype(np.int64)
+    # 每行小数部分从大到小的名次
+    rank = np.argsort(np.argsort(result - scaled, axis=1, kind='stable'), axis=1)
+    result += rank < remainder[:, None]
+    return result.astype(np.int32)